@@ -2,8 +2,11 @@
 Django settings for Pilatesreserva project.
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-!7j*@b!3h6e&d@(zu@6+d8ac@+4tr1h#agatv1zv(ar+*&3s9g'
@@ -30,11 +33,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero, para medir también sesión y usuario (administrador.metricas)
+    'administrador.middleware.MetricasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # request.user desde la caché, sin leer login.User (login.sesion)
+    'login.middleware.UsuarioEnCacheMiddleware',
+    # ?_perfil=1 / X-Perfil de un administrador (administrador.perfilado)
+    'administrador.middleware.PerfiladoMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -59,8 +68,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'Pilatesreserva.wsgi.application'
 
-DATABASES = {
-    'default': {
+# Perfil de base de datos, elegido con la variable de entorno PILATES_DB:
+#   atlas        djongo sobre el cluster de MongoDB Atlas (por defecto)
+#   mongo_local  djongo sobre un Mongo local (MONGO_URI, MONGO_DB)
+#   sqlite       archivo local, sin servicios externos (SQLITE_PATH)
+#   postgres     PostgreSQL o compatible (POSTGRES_DB/USER/PASSWORD/HOST/PORT)
+# Permite probar y medir sin conexión: `PILATES_DB=sqlite python manage.py test`.
+# Comparativa entre perfiles: `python manage.py benchmark_backends`.
+PERFIL_DB = os.environ.get('PILATES_DB', 'atlas').strip().lower()
+
+PERFILES_DB = {
+    'atlas': {
         'ENGINE': 'djongo',
         'NAME': 'pilatesreserva',
         'ENFORCE_SCHEMA': False,
@@ -71,8 +89,152 @@ DATABASES = {
                 '?retryWrites=true&w=majority&appName=Cluster0'
             ),
         }
+    },
+    'mongo_local': {
+        'ENGINE': 'djongo',
+        'NAME': os.environ.get('MONGO_DB', 'pilatesreserva'),
+        'ENFORCE_SCHEMA': False,
+        'CLIENT': {
+            'host': os.environ.get('MONGO_URI', 'mongodb://localhost:27017'),
+        }
+    },
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', str(BASE_DIR / 'db.sqlite3')),
+    },
+    'postgres': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'pilatesreserva'),
+        'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': 60,
+    },
+}
+
+if PERFIL_DB not in PERFILES_DB:
+    raise ImproperlyConfigured(
+        f"PILATES_DB='{PERFIL_DB}' no es válido; opciones: {', '.join(PERFILES_DB)}"
+    )
+
+DATABASES = {'default': PERFILES_DB[PERFIL_DB]}
+
+# Caché local (sin servicios externos). Para compartirla entre workers se
+# puede usar 'django.core.cache.backends.filebased.FileBasedCache'.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pilatesreserva',
+    }
+}
+
+# Backends de caché que viven dentro de cada proceso: con varios workers de
+# gunicorn ninguno ve lo que otro borra o invalida
+CACHES_POR_PROCESO = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Caché compartida entre workers (opcional): PILATES_CACHE_DIR=/ruta/escribible
+if os.environ.get('PILATES_CACHE_DIR'):
+    CACHES['compartida'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['PILATES_CACHE_DIR'],
     }
+
+
+def _cache_compartida(alias):
+    return alias in CACHES and CACHES[alias]['BACKEND'] not in CACHES_POR_PROCESO
+
+
+# Sesiones por perfil (PILATES_SESIONES):
+#   db        -> solo la BD (lo de Django; por defecto)
+#   cached_db -> caché y, si no está, la BD. Exige que SESSION_CACHE_ALIAS
+#                (PILATES_CACHE_SESIONES) sea una caché compartida: con
+#                locmem un logout solo borra la sesión del worker que lo
+#                atendió y los demás la siguen sirviendo
+#   cookies   -> firmadas en la propia cookie, sin BD ni caché
+PERFIL_SESIONES = os.environ.get('PILATES_SESIONES', 'db').strip().lower()
+PERFILES_SESIONES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
 }
+if PERFIL_SESIONES not in PERFILES_SESIONES:
+    raise ImproperlyConfigured(
+        f"PILATES_SESIONES='{PERFIL_SESIONES}' no es válido; "
+        f"opciones: {', '.join(PERFILES_SESIONES)}"
+    )
+SESSION_ENGINE = PERFILES_SESIONES[PERFIL_SESIONES]
+SESSION_CACHE_ALIAS = os.environ.get(
+    'PILATES_CACHE_SESIONES', 'compartida' if 'compartida' in CACHES else 'default')
+if PERFIL_SESIONES == 'cached_db' and not _cache_compartida(SESSION_CACHE_ALIAS):
+    raise ImproperlyConfigured(
+        f"PILATES_SESIONES=cached_db necesita una caché compartida entre workers "
+        f"(FileBasedCache, DatabaseCache...); '{SESSION_CACHE_ALIAS}' no lo es. "
+        f"Define PILATES_CACHE_DIR o usa PILATES_SESIONES=db."
+    )
+
+# Usuario memorizado por sesión (login.sesion): solo con una caché compartida,
+# por la misma razón que cached_db. None lo desactiva (request.user sale de
+# la BD como en Django).
+USUARIO_CACHE = SESSION_CACHE_ALIAS if _cache_compartida(SESSION_CACHE_ALIAS) else None
+USUARIO_CACHE_TTL = 60
+
+# Alias de caché usado por index.disponibilidad (cupos por clase)
+DISPONIBILIDAD_CACHE = 'default'
+
+# Caché de página completa del landing para anónimos (index.paginas). Tras
+# cada deploy: `python manage.py calentar_paginas`.
+PAGINAS_CACHE_ACTIVA = True
+PAGINAS_CACHE = 'default'
+PAGINAS_TTL = 60 * 60
+PAGINAS_MAX_AGE = 60
+
+# Trabajos en segundo plano (administrador.trabajos). En True se ejecutan en
+# la misma petición (útil en desarrollo sin `manage.py procesar_trabajos`).
+TRABAJOS_SINCRONICOS = False
+# Segundos sin avance tras los cuales un trabajo 'en_curso' se da por colgado
+# (worker caído o reiniciado) y vuelve a 'pendiente'. None lo desactiva.
+TRABAJOS_TIEMPO_MAXIMO = 30 * 60
+
+# Importación masiva de usuarios (administrador.importacion): procesos para
+# calcular los hashes de contraseña (None = núcleos de la máquina) y tamaño
+# máximo del archivo subido desde el panel.
+IMPORTACION_PROCESOS = None
+IMPORTACION_MAX_MB = 10
+
+# Lecturas calientes (catálogo, KPIs, "Mis reservas") directo con pymongo en
+# vez de pasar por la traducción SQL de djongo. Ver index/nativo.py.
+LECTURAS_NATIVAS = False
+
+# Métricas por vista en /administrador/metrics (administrador.metricas):
+# peticiones recientes por vista para los cuantiles y consultas lentas a
+# conservar. Memoria acotada, por proceso.
+METRICAS_ACTIVAS = True
+METRICAS_VENTANA = 1000
+METRICAS_TOP_CONSULTAS = 20
+
+# Límite de intentos de login y contacto (login.limites). 'memoria' es por
+# worker; 'cache' usa el alias LIMITE_CACHE (FileBasedCache o DatabaseCache
+# para compartirlo entre workers). LIMITES_INTENTOS sobrescribe
+# {ámbito: (capacidad, recarga por minuto)}. Detrás del proxy de Render
+# (que define RENDER en el entorno) REMOTE_ADDR es el proxy y la IP real es
+# la entrada de X-Forwarded-For que agregó el proxy: LIMITE_PROXIES cuenta
+# los proxies confiables desde la derecha (PILATES_PROXIES en el entorno).
+LIMITE_BACKEND = 'memoria'
+LIMITE_CACHE = 'default'
+LIMITE_IP_CABECERA = 'HTTP_X_FORWARDED_FOR' if os.environ.get('RENDER') else None
+LIMITE_PROXIES = int(os.environ.get('PILATES_PROXIES', '1'))
+
+# Perfilado a pedido (administrador.perfilado): máximo por minuto y proceso
+PERFILADO_ACTIVO = True
+PERFILADO_POR_MINUTO = 6
+
+# Consultas parseadas que djongo guarda en su caché LRU (index/traduccion.py).
+# 0 la desactiva.
+DJONGO_CACHE_CONSULTAS = 512
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -97,9 +259,11 @@ AUTH_USER_MODEL = 'login.User'
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
 # Backends: permite login por email o usuario
+# Solo este backend: hereda de ModelBackend (permisos incluidos) y resuelve el
+# login con una búsqueda exacta; repetir ModelBackend duplicaría búsqueda y
+# hash en cada intento fallido
 AUTHENTICATION_BACKENDS = [
     'login.backends.EmailOrUsernameModelBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
 # ¡IMPORTANTE! usar el namespace correcto
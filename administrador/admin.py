@@ -1,7 +1,18 @@
 from django.contrib import admin
 from .models import PerfilUsuario, ClasePilates, ReservaClase, Contacto
 
-admin.site.register(PerfilUsuario)
+
+# __str__ de estos modelos recorre sus FK: se traen en la misma consulta
+# del listado para no hacer una consulta por fila
+@admin.register(PerfilUsuario)
+class PerfilUsuarioAdmin(admin.ModelAdmin):
+    list_select_related = ("usuario",)
+
+
+@admin.register(ReservaClase)
+class ReservaClaseAdmin(admin.ModelAdmin):
+    list_select_related = ("cliente", "clase")
+
+
 admin.site.register(ClasePilates)
-admin.site.register(ReservaClase)
 admin.site.register(Contacto)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AdministradorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'administrador'
+
+    def ready(self):
+        from . import capacidades
+        from . import signals  # noqa: F401  (registra receptores de KPI)
+
+        capacidades.resolver()
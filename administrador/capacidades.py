@@ -0,0 +1,105 @@
+# administrador/capacidades.py
+"""
+Registro de capacidades de los modelos, resuelto UNA vez al arrancar
+(AdministradorConfig.ready) en vez de inspeccionar ``_meta`` en cada petición.
+
+Para cada modelo guarda qué campo cumple cada rol:
+
+  - estado:           campo de estado de una reserva ("estado", "status", ...)
+  - cliente:          FK al usuario que reserva ("user", "cliente", ...)
+  - fecha:            campo de fecha principal
+  - estado_contacto:  estado de un mensaje de contacto ("estado_mensaje", ...)
+
+Uso:
+    cap = capacidades.de(Reserva)
+    if cap.estado:
+        qs = qs.filter(**{f"{cap.estado}__iexact": "confirmada"})
+"""
+from django.apps import apps
+from django.db import models
+
+APPS_DEL_PROYECTO = ("administrador", "index", "usuarios", "login")
+
+CANDIDATOS_ESTADO = ("estado", "estado_reserva", "status", "situacion")
+CANDIDATOS_CLIENTE = ("user", "cliente", "usuario")
+CANDIDATOS_FECHA = ("fecha", "fecha_reserva")
+CANDIDATOS_ESTADO_CONTACTO = ("estado_mensaje", "estado_contacto", "estado")
+
+
+class Capacidades:
+    """Roles detectados en un modelo (None si el modelo no tiene el rol)."""
+
+    __slots__ = ("modelo", "campos", "estado", "cliente", "fecha", "estado_contacto")
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        opts = modelo._meta
+        self.campos = {f.name: f for f in opts.get_fields()}
+        self.estado = self._detectar_estado()
+        self.cliente = self._primero(
+            CANDIDATOS_CLIENTE, lambda f: isinstance(f, models.ForeignKey))
+        self.fecha = self._primero(
+            CANDIDATOS_FECHA, lambda f: isinstance(f, models.DateField))
+        self.estado_contacto = self._primero(
+            CANDIDATOS_ESTADO_CONTACTO, lambda f: isinstance(f, models.Field))
+
+    def tiene(self, nombre: str) -> bool:
+        return nombre in self.campos
+
+    def campo(self, nombre: str):
+        return self.campos.get(nombre)
+
+    def opciones(self, nombre: str) -> list:
+        """choices del campo (lista vacía si no tiene o no existe)."""
+        return list(getattr(self.campos.get(nombre), "choices", None) or [])
+
+    def _primero(self, candidatos, es_valido):
+        for nombre in candidatos:
+            campo = self.campos.get(nombre)
+            if campo is not None and es_valido(campo):
+                return nombre
+        return None
+
+    def _detectar_estado(self):
+        # 1) por nombre conocido
+        nombre = self._primero(
+            CANDIDATOS_ESTADO, lambda f: isinstance(f, models.Field))
+        if nombre:
+            return nombre
+        # 2) primer campo con choices, 3) primer CharField editable
+        tipos = (models.CharField, models.IntegerField, models.SmallIntegerField)
+        for campo in self.campos.values():
+            if isinstance(campo, tipos) and getattr(campo, "choices", None):
+                return campo.name
+        for campo in self.campos.values():
+            if isinstance(campo, models.CharField) and campo.editable:
+                return campo.name
+        return None
+
+
+_REGISTRO = {}
+
+
+def de(modelo) -> Capacidades:
+    """Capacidades de `modelo` (se resuelven una sola vez y quedan en memoria)."""
+    cap = _REGISTRO.get(modelo)
+    if cap is None:
+        cap = _REGISTRO[modelo] = Capacidades(modelo)
+    return cap
+
+
+def modelo_reserva():
+    """Reserva real (app index) o el fallback local ReservaClase."""
+    if apps.is_installed("index"):
+        return apps.get_model("index", "Reserva")
+    return apps.get_model("administrador", "ReservaClase")
+
+
+def resolver() -> None:
+    """Precalcula el registro para los modelos del proyecto (AppConfig.ready)."""
+    _REGISTRO.clear()
+    for etiqueta in APPS_DEL_PROYECTO:
+        if not apps.is_installed(etiqueta):
+            continue
+        for modelo in apps.get_app_config(etiqueta).get_models():
+            de(modelo)
@@ -0,0 +1,353 @@
+# administrador/carga.py
+"""
+Prueba de carga HTTP con tráfico mixto (comando ``carga_http``).
+
+Levanta la aplicación en un servidor WSGI local con hilos (el de
+``runserver``) y la recorre con "usuarios virtuales": cada hilo es un
+navegador con sus propias cookies que elige un escenario según los pesos
+de la mezcla hasta que se acaba el tiempo:
+
+  - landing:  páginas públicas, anónimo;
+  - catalogo: catálogo con filtros (texto y rango de fechas), anónimo y con
+              sesión de cliente;
+  - login:    formulario + POST con usuario o correo (pasa por
+              EmailOrUsernameModelBackend y el hash de la contraseña);
+  - admin:    listados del panel con búsqueda;
+  - ataque:   relleno de credenciales (claves erróneas) desde unas pocas IP;
+              por defecto con peso 0. Con él se ve si el login legítimo
+              mantiene su rendimiento mientras login.limites frena al resto.
+
+Cada usuario virtual tiene su propia IP (X-Forwarded-For, con
+LIMITE_IP_CABECERA apuntando a ella) para que el límite por IP se comporte
+como con clientes reales.
+
+Después, la ráfaga: cientos de clientes distintos piden ``reservar_clase``
+de la MISMA clase a la vez (arrancan juntos en una barrera). La sobreventa
+son las reservas activas por encima de ``capacidad_maxima``; debe ser 0.
+
+Solo usa la biblioteca estándar (http.client) para no depender de nada más.
+"""
+import http.client
+import random
+import re
+import threading
+import time
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.models import Count, F, Q
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from index.models import Reserva
+
+from . import datos_sinteticos
+from .models import ClasePilates
+
+MEZCLA = {"landing": 4, "catalogo": 3, "login": 1, "admin": 2, "ataque": 0}
+IPS_ATAQUE = 4
+CUANTILES = (0.5, 0.95, 0.99)
+ESTADO_CANCELADA = "Cancelada"
+_CSRF = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+# ----------------------- Servidor -----------------------
+class _ManejadorSilencioso(WSGIRequestHandler):
+    def log_message(self, formato, *args):
+        pass
+
+
+class _Servidor(ThreadedWSGIServer):
+    # Una ráfaga abre cientos de conexiones a la vez
+    request_queue_size = 1024
+
+    def process_request_thread(self, request, client_address):
+        # Un hilo por petición: sin esto cada hilo deja su conexión a la BD
+        # abierta (con CONN_MAX_AGE > 0)
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            connections.close_all()
+
+
+class Servidor:
+    """``with Servidor() as s:`` sirve la aplicación en 127.0.0.1:s.puerto."""
+
+    def __init__(self, puerto: int = 0):
+        self.puerto = puerto
+        self._httpd = None
+        self._hilo = None
+
+    def __enter__(self):
+        self._httpd = _Servidor(("127.0.0.1", self.puerto), _ManejadorSilencioso)
+        self._httpd.set_app(get_wsgi_application())
+        self.puerto = self._httpd.server_address[1]
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._hilo.join()
+
+
+# ----------------------- Cliente -----------------------
+class Navegador:
+    """Cliente HTTP mínimo que conserva cookies (sesión y CSRF)."""
+
+    def __init__(self, puerto: int, cookies=None, ip=None):
+        self.puerto = puerto
+        self.cookies = dict(cookies or {})
+        self.ip = ip
+
+    def pedir(self, metodo, ruta, datos=None):
+        """(estado, cuerpo) de la petición; una conexión por petición."""
+        cabeceras = {"Host": "localhost", "Connection": "close"}
+        if self.ip:
+            cabeceras["X-Forwarded-For"] = self.ip
+        if self.cookies:
+            cabeceras["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        cuerpo = None
+        if datos is not None:
+            cuerpo = urlencode(datos)
+            cabeceras["Content-Type"] = "application/x-www-form-urlencoded"
+        conexion = http.client.HTTPConnection("127.0.0.1", self.puerto, timeout=60)
+        try:
+            conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+            respuesta = conexion.getresponse()
+            contenido = respuesta.read()
+            for valor in respuesta.headers.get_all("Set-Cookie") or ():
+                for nombre, morsel in SimpleCookie(valor).items():
+                    self.cookies[nombre] = morsel.value
+            return respuesta.status, contenido
+        finally:
+            conexion.close()
+
+    def get(self, ruta, **parametros):
+        if parametros:
+            ruta = f"{ruta}?{urlencode(parametros)}"
+        return self.pedir("GET", ruta)
+
+
+def cookies_de_sesion(usuario) -> dict:
+    """Cookies de una sesión ya iniciada (sin pasar por el hash de la clave)."""
+    cliente = Client()
+    cliente.force_login(usuario)
+    return {nombre: morsel.value for nombre, morsel in cliente.cookies.items()}
+
+
+# ----------------------- Registro de tiempos -----------------------
+def _percentil(ordenados, q):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, max(0, round(q * len(ordenados)) - 1))]
+
+
+class Registro:
+    """Latencias y errores por escenario (compartido entre hilos)."""
+
+    def __init__(self):
+        self._tiempos = {}
+        self._errores = {}
+        self._lock = threading.Lock()
+
+    def anotar(self, escenario, segundos, ok):
+        with self._lock:
+            self._tiempos.setdefault(escenario, []).append(segundos)
+            if not ok:
+                self._errores[escenario] = self._errores.get(escenario, 0) + 1
+
+    def resumen(self, duracion) -> dict:
+        with self._lock:
+            tiempos = {e: sorted(t) for e, t in self._tiempos.items()}
+            errores = dict(self._errores)
+        escenarios = {}
+        for escenario, t in sorted(tiempos.items()):
+            escenarios[escenario] = {
+                "operaciones": len(t),
+                "errores": errores.get(escenario, 0),
+                "por_segundo": round(len(t) / duracion, 1) if duracion else 0.0,
+                **{f"p{int(q * 100)}_ms": round(_percentil(t, q) * 1000, 1) for q in CUANTILES},
+            }
+        todas = sorted(x for t in tiempos.values() for x in t)
+        total = {
+            "operaciones": len(todas),
+            "errores": sum(errores.values()),
+            "por_segundo": round(len(todas) / duracion, 1) if duracion else 0.0,
+            **{f"p{int(q * 100)}_ms": round(_percentil(todas, q) * 1000, 1) for q in CUANTILES},
+        }
+        return {"duracion_s": round(duracion, 2), "escenarios": escenarios, "total": total}
+
+
+# ----------------------- Escenarios -----------------------
+class Escenarios:
+    """
+    Datos que necesitan los escenarios. `clientes` son (username, email) de
+    clientes activos con la clave de datos_sinteticos; `sesion_cliente` y
+    `sesion_admin` son cookies de sesiones ya iniciadas.
+    """
+
+    def __init__(self, puerto, clientes, sesion_cliente, sesion_admin, hoy=None):
+        self.puerto = puerto
+        self.clientes = clientes
+        self.sesion_cliente = sesion_cliente
+        self.sesion_admin = sesion_admin
+        self.hoy = hoy or timezone.localdate()
+        self.landing = [reverse(n) for n in (
+            "index", "clases", "clase_reformer", "clase_mat", "clase_grupal",
+            "contacto_publico",
+        )]
+        self.admin = [reverse(n) for n in (
+            "administrador:reservas_list", "administrador:listar_clases",
+            "administrador:usuarios_list", "administrador:listar_contactos",
+        )]
+
+    def _filtros(self, rnd):
+        filtros = {}
+        if rnd.random() < 0.5:
+            filtros["q"] = rnd.choice(datos_sinteticos.NOMBRES_CLASE)
+        if rnd.random() < 0.5:
+            desde = self.hoy + timedelta(days=rnd.randint(-7, 14))
+            filtros["desde"] = desde.isoformat()
+            filtros["hasta"] = (desde + timedelta(days=rnd.randint(0, 14))).isoformat()
+        return filtros
+
+    def ejecutar(self, escenario, rnd, ip=None) -> bool:
+        """Corre una operación del escenario; True si respondió lo esperado."""
+        return getattr(self, f"_{escenario}")(rnd, ip)
+
+    def _landing(self, rnd, ip):
+        estado, _ = Navegador(self.puerto, ip=ip).get(rnd.choice(self.landing))
+        return estado == 200
+
+    def _catalogo(self, rnd, ip):
+        if rnd.random() < 0.5:
+            navegador, ruta = Navegador(self.puerto, ip=ip), reverse("clases_grid")
+        else:
+            navegador = Navegador(self.puerto, self.sesion_cliente, ip)
+            ruta = reverse("usuarios:clases_disponibles")
+        estado, _ = navegador.get(ruta, **self._filtros(rnd))
+        return estado == 200
+
+    def _intentar_login(self, ip, identificador, clave):
+        """Formulario + POST; estado HTTP del POST (None si no hubo token)."""
+        navegador = Navegador(self.puerto, ip=ip)
+        ruta = reverse("login:login")
+        estado, cuerpo = navegador.get(ruta)
+        token = _CSRF.search(cuerpo.decode("utf-8", "replace"))
+        if estado != 200 or token is None:
+            return None
+        estado, _ = navegador.pedir("POST", ruta, {
+            "csrfmiddlewaretoken": token.group(1),
+            "username": identificador,
+            "password": clave,
+        })
+        return estado
+
+    def _login(self, rnd, ip):
+        username, email = rnd.choice(self.clientes)
+        # La mitad entra con el correo en mayúsculas: búsqueda case-insensitive
+        identificador = email.upper() if rnd.random() < 0.5 else username
+        return self._intentar_login(ip, identificador, datos_sinteticos.CLAVE_POR_DEFECTO) == 302
+
+    def _ataque(self, rnd, ip):
+        # Pocas IP atacantes contra usuarios reales: se espera el formulario
+        # con error (200) o el rechazo del límite (429), nunca una sesión
+        username, _ = rnd.choice(self.clientes)
+        estado = self._intentar_login(
+            f"10.66.0.{rnd.randrange(IPS_ATAQUE)}", username, f"clave-{rnd.random()}")
+        return estado in (200, 429)
+
+    def _admin(self, rnd, ip):
+        parametros = {"q": rnd.choice(datos_sinteticos.NOMBRES)} if rnd.random() < 0.3 else {}
+        estado, _ = Navegador(self.puerto, self.sesion_admin, ip).get(
+            rnd.choice(self.admin), **parametros)
+        return estado == 200
+
+
+def mezcla(escenarios: Escenarios, usuarios_virtuales: int, duracion: float,
+           pesos=None, semilla: int = 1) -> dict:
+    """Tráfico mixto durante `duracion` segundos con N hilos."""
+    pesos = pesos or MEZCLA
+    nombres = [n for n, p in pesos.items() if p > 0]
+    valores = [pesos[n] for n in nombres]
+    registro = Registro()
+    fin = time.perf_counter() + duracion
+
+    def usuario(numero):
+        rnd = random.Random(f"{semilla}:{numero}")
+        ip = f"10.1.{numero // 250}.{numero % 250 + 1}"
+        while time.perf_counter() < fin:
+            escenario = rnd.choices(nombres, valores)[0]
+            inicio = time.perf_counter()
+            try:
+                ok = escenarios.ejecutar(escenario, rnd, ip)
+            except OSError:
+                ok = False
+            registro.anotar(escenario, time.perf_counter() - inicio, ok)
+
+    inicio = time.perf_counter()
+    _en_hilos(usuario, usuarios_virtuales)
+    return registro.resumen(time.perf_counter() - inicio)
+
+
+def rafaga(puerto: int, clase: ClasePilates, sesiones) -> dict:
+    """
+    Cada sesión pide reservar `clase` a la vez. Devuelve tiempos, reservas
+    creadas, contador de cupos y sobreventa de la clase.
+    """
+    ruta = reverse("usuarios:reservar_clase", args=[clase.pk])
+    barrera = threading.Barrier(len(sesiones))
+    registro = Registro()
+
+    def cliente(numero):
+        navegador = Navegador(puerto, sesiones[numero])
+        barrera.wait()
+        inicio = time.perf_counter()
+        try:
+            estado, _ = navegador.get(ruta)
+            ok = estado == 302
+        except OSError:
+            ok = False
+        registro.anotar("reservar_clase", time.perf_counter() - inicio, ok)
+
+    inicio = time.perf_counter()
+    _en_hilos(cliente, len(sesiones))
+    resultado = registro.resumen(time.perf_counter() - inicio)
+
+    activas = Reserva.objects.filter(clase=clase).exclude(estado=ESTADO_CANCELADA).count()
+    clase.refresh_from_db(fields=["cupos_ocupados"])
+    resultado.update({
+        "clientes": len(sesiones),
+        "capacidad": clase.capacidad_maxima,
+        "reservas_activas": activas,
+        "cupos_ocupados": clase.cupos_ocupados,
+        "sobreventa": max(0, activas - clase.capacidad_maxima),
+    })
+    return resultado
+
+
+def sobreventa_total() -> int:
+    """Reservas activas por encima de la capacidad, sumando todas las clases."""
+    clases = (
+        ClasePilates.objects
+        .annotate(activas=Count("reservas_index",
+                                filter=~Q(reservas_index__estado=ESTADO_CANCELADA)))
+        .filter(activas__gt=F("capacidad_maxima"))
+        .values_list("activas", "capacidad_maxima")
+    )
+    return sum(activas - capacidad for activas, capacidad in clases)
+
+
+def _en_hilos(funcion, n):
+    hilos = [threading.Thread(target=funcion, args=(i,), daemon=True) for i in range(n)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
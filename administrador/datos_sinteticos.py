@@ -0,0 +1,353 @@
+# administrador/datos_sinteticos.py
+"""
+Datos sintéticos reproducibles para medir rendimiento.
+
+``sembrar()`` arma la historia de un estudio a partir de una semilla:
+clientes, bloques horarios, clases de lunes a sábado (pasadas y futuras) con
+sus reservas y mensajes de contacto. Todo se inserta con ``bulk_create`` por
+lotes; con ``procesos > 1`` los lotes se reparten entre procesos.
+
+Cada lote usa su propio generador aleatorio derivado de (semilla, tabla,
+número de lote), así que el resultado no depende de cuántos procesos se usen
+ni del orden en que terminen: misma semilla y mismos tamaños, mismos datos
+en cualquier backend (ver ``benchmark_backends``).
+
+Las reservas respetan la capacidad (las activas nunca la superan) y el
+estado depende de la fecha: en el pasado "Completada" o "Cancelada", en el
+futuro "Confirmada", "Pendiente" o "Cancelada". ClasePilates.cupos_ocupados
+y los KPI quedan consistentes al terminar.
+
+Comando: ``python manage.py generar_datos``.
+"""
+import multiprocessing
+import random
+from datetime import date, time, timedelta
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.db import connections
+from django.utils import timezone
+
+from index.models import Contacto, Reserva
+
+from . import kpis
+from .models import ClasePilates, HorarioBloque
+
+TAMANO_LOTE = 1000
+# Filas por tarea repartida a un proceso (varias inserciones de TAMANO_LOTE)
+TAMANO_TAREA = 5000
+CLAVE_POR_DEFECTO = "pilates123"
+
+TASA_CANCELACION = 0.12           # clases pasadas
+TASA_CANCELACION_FUTURA = 0.08
+TASA_PENDIENTE = 0.05
+TASA_INACTIVOS = 0.03
+
+NOMBRES_CLASE = ("Reformer", "Mat", "Grupal")
+PESOS_CLASE = (5, 3, 2)
+INSTRUCTORES = ("Camila", "Javiera", "Tomás", "Ignacia", "Diego", "Valentina")
+CAPACIDADES = (10, 12, 15, 20, 25, 30)
+HORARIOS = tuple(time(h, 0) for h in (8, 9, 10, 11, 17, 18, 19, 20))
+# Demanda relativa por horario: mañana temprano y después del trabajo llenan más
+DEMANDA_HORARIO = (1.3, 1.0, 0.8, 0.7, 0.9, 1.2, 1.4, 1.1)
+NOMBRES = ("Ana", "Benjamín", "Carla", "Daniel", "Elena", "Felipe", "Gabriela",
+           "Hugo", "Isidora", "Joaquín", "Karen", "Luis", "María", "Nicolás")
+APELLIDOS = ("González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras",
+             "Silva", "Martínez", "Sepúlveda", "Morales", "Rodríguez")
+ESTADOS_CONTACTO = ("pendiente", "revisado", "respondido")
+PESOS_CONTACTO = (2, 3, 5)
+
+
+# ----------------------- Utilidades -----------------------
+def _rng(semilla, tabla: str, lote: int) -> random.Random:
+    # Semilla de texto: estable entre procesos (no depende de PYTHONHASHSEED)
+    return random.Random(f"{semilla}:{tabla}:{lote}")
+
+
+def _tramos(total: int, tamano: int):
+    """[(lote, inicio, fin), ...] que cubren range(total)."""
+    return [(n, i, min(i + tamano, total)) for n, i in enumerate(range(0, total, tamano))]
+
+
+def _lotes(objetos, tamano):
+    for i in range(0, len(objetos), tamano):
+        yield objetos[i:i + tamano]
+
+
+def _insertar(modelo, objetos, tamano_lote):
+    for lote in _lotes(objetos, tamano_lote):
+        modelo.objects.bulk_create(lote)
+
+
+def _tipo(nombre_clase: str) -> str:
+    return nombre_clase.lower() if nombre_clase.lower() in ("reformer", "mat") else "grupal"
+
+
+def dias_estudio(hoy: date, dias_pasados: int, dias_futuros: int) -> list:
+    """Días de lunes a sábado entre hoy-dias_pasados y hoy+dias_futuros."""
+    inicio = hoy - timedelta(days=dias_pasados)
+    todos = (inicio + timedelta(days=i) for i in range(dias_pasados + dias_futuros + 1))
+    return [d for d in todos if d.weekday() <= 5]
+
+
+# ----------------------- Trabajo de cada proceso -----------------------
+_user_ids = []
+
+
+def _inicializar(user_ids=None):
+    """Inicializador de cada proceso (también se usa sin pool)."""
+    global _user_ids
+    if not apps.ready:  # arranque "spawn" (macOS/Windows)
+        django.setup()
+    _user_ids = user_ids or []
+
+
+def _lote_usuarios(tarea) -> int:
+    (lote, inicio, fin), p = tarea
+    rnd = _rng(p["semilla"], "usuarios", lote)
+    User = get_user_model()
+    usuarios = [
+        User(
+            username=f"{p['prefijo']}_cliente_{i}",
+            email=f"{p['prefijo']}_cliente_{i}@example.com",
+            first_name=rnd.choice(NOMBRES),
+            last_name=rnd.choice(APELLIDOS),
+            password=p["clave"],
+            rol="cliente",
+            is_active=rnd.random() >= TASA_INACTIVOS,
+        )
+        for i in range(inicio, fin)
+    ]
+    # bulk_create no pasa por User.save()
+    for u in usuarios:
+        u.normalizar_credenciales()
+    _insertar(User, usuarios, p["tamano_lote"])
+    return fin - inicio
+
+
+def _planificar(rnd, fecha, hoy, capacidad, demanda, n_usuarios):
+    """[(ordinal_usuario, estado), ...] de una clase, sin sobrepasar la capacidad."""
+    n = max(0, min(round(rnd.gauss(demanda, demanda * 0.3)), n_usuarios))
+    activas, plan = 0, []
+    for ordinal in rnd.sample(range(n_usuarios), n):
+        if fecha < hoy:
+            cancelada = rnd.random() < TASA_CANCELACION
+            estado = "Completada"
+        else:
+            cancelada = rnd.random() < TASA_CANCELACION_FUTURA
+            estado = "Pendiente" if rnd.random() < TASA_PENDIENTE else "Confirmada"
+        # Clase llena: el resto de la demanda quedó cancelada
+        if cancelada or activas >= capacidad:
+            estado = "Cancelada"
+        else:
+            activas += 1
+        plan.append((ordinal, estado))
+    return plan, activas
+
+
+def _leer_ids(clases, prefijo) -> None:
+    """
+    Completa el pk de `clases` cuando el backend no lo devuelve en bulk_create
+    (djongo). Las clases de un tramo ocupan días consecutivos: se leen por
+    rango de fecha (clase_fecha_horario_idx) y se reconocen por la marca
+    "(<prefijo> #<i>)" de la descripción, única por clase porque sembrar()
+    no acepta un prefijo ya usado.
+    """
+    filas = (
+        ClasePilates.objects
+        .filter(fecha__gte=clases[0].fecha, fecha__lte=clases[-1].fecha,
+                descripcion__contains=f"({prefijo} #")
+        .values_list("descripcion", "id")
+    )
+    ids = dict(filas)
+    for c in clases:
+        c.pk = ids[c.descripcion]
+
+
+def _lote_clases(tarea) -> int:
+    """Inserta las clases [inicio, fin) y sus reservas. Devuelve reservas creadas."""
+    (lote, inicio, fin), p = tarea
+    rnd = _rng(p["semilla"], "clases", lote)
+    hoy = date.fromisoformat(p["hoy"])
+    dias = dias_estudio(hoy, p["dias_pasados"], p["dias_futuros"])
+    media = p["reservas"] / p["clases"]
+
+    clases, planes = [], []
+    for i in range(inicio, fin):
+        nombre = rnd.choices(NOMBRES_CLASE, PESOS_CLASE)[0]
+        franja = rnd.randrange(len(HORARIOS))
+        capacidad = rnd.choice(CAPACIDADES)
+        fecha = dias[i * len(dias) // p["clases"]]
+        plan, activas = _planificar(
+            rnd, fecha, hoy, capacidad, media * DEMANDA_HORARIO[franja], len(_user_ids)
+        )
+        clases.append(ClasePilates(
+            nombre_clase=nombre,
+            fecha=fecha,
+            horario=HORARIOS[franja],
+            capacidad_maxima=capacidad,
+            nombre_instructor=rnd.choice(INSTRUCTORES),
+            descripcion=f"Clase de {nombre.lower()} ({p['prefijo']} #{i})",
+            cupos_ocupados=activas,
+        ))
+        planes.append(plan)
+
+    _insertar(ClasePilates, clases, p["tamano_lote"])
+    if any(c.pk is None for c in clases):
+        _leer_ids(clases, p["prefijo"])
+
+    reservas = [
+        Reserva(
+            user_id=_user_ids[ordinal],
+            clase_id=c.pk,
+            tipo=_tipo(c.nombre_clase),
+            fecha=c.fecha,
+            inicio=c.horario,
+            estado=estado,
+        )
+        for c, plan in zip(clases, planes)
+        for ordinal, estado in plan
+    ]
+    _insertar(Reserva, reservas, p["tamano_lote"])
+    return len(reservas)
+
+
+def _lote_contactos(tarea) -> int:
+    (lote, inicio, fin), p = tarea
+    rnd = _rng(p["semilla"], "contactos", lote)
+    _insertar(Contacto, [
+        Contacto(
+            nombre=f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}",
+            correo=f"{p['prefijo']}_contacto_{i}@example.com",
+            telefono=f"+569{rnd.randrange(10**7, 10**8)}",
+            mensaje="Quisiera información sobre horarios y planes.",
+            estado_mensaje=rnd.choices(ESTADOS_CONTACTO, PESOS_CONTACTO)[0],
+        )
+        for i in range(inicio, fin)
+    ], p["tamano_lote"])
+    return fin - inicio
+
+
+def _repartir(tabla, funcion, tramos, p, procesos, al_avanzar, user_ids=None) -> int:
+    """Ejecuta `funcion` por tramo, en este proceso o en un pool. Suma resultados."""
+    tareas = [(t, p) for t in tramos]
+    pool = None
+    if procesos <= 1 or len(tareas) <= 1:
+        _inicializar(user_ids)
+        resultados = map(funcion, tareas)
+    else:
+        # Cada proceso abre su propia conexión; no se heredan sockets abiertos
+        connections.close_all()
+        pool = multiprocessing.get_context().Pool(
+            procesos, initializer=_inicializar, initargs=(user_ids,)
+        )
+        resultados = pool.imap_unordered(funcion, tareas)
+
+    hechos = 0
+    try:
+        for n in resultados:
+            hechos += n
+            if al_avanzar:
+                al_avanzar(tabla, hechos)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return hechos
+
+
+# ----------------------- API -----------------------
+def crear_bloques() -> int:
+    """Bloques horarios de lunes a sábado en todos los HORARIOS (los que falten)."""
+    existentes = set(HorarioBloque.objects.values_list("dia_semana", "hora_inicio"))
+    nuevos = [
+        HorarioBloque(
+            dia_semana=dia,
+            hora_inicio=h,
+            hora_fin=time(h.hour + 1, 0),
+            instructor=INSTRUCTORES[(dia + n) % len(INSTRUCTORES)],
+            capacidad=CAPACIDADES[n % len(CAPACIDADES)],
+        )
+        for dia in range(6)
+        for n, h in enumerate(HORARIOS)
+        if (dia, h) not in existentes
+    ]
+    HorarioBloque.objects.bulk_create(nuevos)
+    return len(nuevos)
+
+
+def sembrar(
+    usuarios: int = 200,
+    clases: int = 300,
+    reservas: int = 1800,
+    contactos: int = 50,
+    dias_pasados: int = 60,
+    dias_futuros: int = 30,
+    semilla: int = 1,
+    prefijo: str = "sint",
+    procesos: int = 1,
+    tamano_lote: int = TAMANO_LOTE,
+    hoy=None,
+    al_avanzar=None,
+) -> dict:
+    """
+    Inserta el conjunto de datos y devuelve cuántas filas se crearon por
+    tabla. `reservas` es la demanda total buscada: lo que no cabe en la
+    capacidad de cada clase queda como "Cancelada". `prefijo` separa los
+    usernames y las clases de distintas siembras y no se puede repetir
+    (ValueError). `al_avanzar(tabla, hechos)` se llama tras cada tarea
+    terminada.
+    """
+    User = get_user_model()
+    if (User.objects.filter(username__startswith=f"{prefijo}_cliente_").exists()
+            or ClasePilates.objects.filter(descripcion__contains=f"({prefijo} #").exists()):
+        raise ValueError(f"Ya hay datos sintéticos con el prefijo '{prefijo}'.")
+
+    hoy = hoy or timezone.localdate()
+    p = {
+        "semilla": semilla,
+        "prefijo": prefijo,
+        "hoy": hoy.isoformat(),
+        "dias_pasados": dias_pasados,
+        "dias_futuros": dias_futuros,
+        "clases": clases,
+        "reservas": reservas,
+        "tamano_lote": tamano_lote,
+        # Un solo hash para todos: hashear miles de claves no es lo que se mide
+        "clave": make_password(CLAVE_POR_DEFECTO),
+    }
+
+    filas = {"bloques": crear_bloques()}
+    filas["usuarios"] = _repartir(
+        "usuarios", _lote_usuarios, _tramos(usuarios, TAMANO_TAREA), p, procesos, al_avanzar
+    )
+
+    # ordinal -> id (el orden de los ids depende de qué proceso insertó primero)
+    user_ids = [0] * usuarios
+    largo_prefijo = len(f"{prefijo}_cliente_")
+    for username, pk in User.objects.filter(
+        username__startswith=f"{prefijo}_cliente_"
+    ).values_list("username", "id").iterator(chunk_size=TAMANO_LOTE):
+        ordinal = int(username[largo_prefijo:])
+        if ordinal < usuarios:
+            user_ids[ordinal] = pk
+
+    # Cada tarea de clases arrastra sus reservas: se ajusta para ~TAMANO_TAREA filas
+    por_clase = max(1, round(reservas / clases)) if clases else 1
+    filas["clases"] = clases
+    filas["reservas"] = _repartir(
+        "clases", _lote_clases, _tramos(clases, max(1, TAMANO_TAREA // por_clase)), p,
+        procesos, al_avanzar, user_ids,
+    )
+    filas["contactos"] = _repartir(
+        "contactos", _lote_contactos, _tramos(contactos, TAMANO_TAREA), p, procesos, al_avanzar
+    )
+
+    # bulk_create no dispara señales: contadores y cachés se rehacen aquí
+    kpis.recalcular()
+    caches[getattr(settings, "DISPONIBILIDAD_CACHE", "default")].clear()
+    return filas
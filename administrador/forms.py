@@ -1,6 +1,6 @@
 # administrador/forms.py
 from django import forms
-from django.db import models
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Q  # opcional
 
@@ -11,6 +11,9 @@ try:
 except Exception:
     from .models import Contacto as ContactoModel
 
+from login.credenciales import normalizar
+
+from . import capacidades, importacion
 from .models import ClasePilates, HorarioBloque, PerfilUsuario
 
 User = get_user_model()
@@ -19,12 +22,8 @@ User = get_user_model()
 #  Clases / Contacto / Reservas
 # =======================
 
-try:
-    # Si existe la app index con reservas reales, úsala
-    from index.models import Reserva as ReservaModel
-except Exception:
-    # Fallback local
-    from .models import ReservaClase as ReservaModel
+# Reserva real (app index) o el fallback local ReservaClase
+ReservaModel = capacidades.modelo_reserva()
 
 
 class ClasePilatesForm(forms.ModelForm):
@@ -50,20 +49,11 @@ class ClasePilatesForm(forms.ModelForm):
         }
 
 
-def _has_field(model, name: str) -> bool:
-    try:
-        model._meta.get_field(name)
-        return True
-    except Exception:
-        return False
-
-
 # >>> Calculamos a NIVEL DE MÓDULO los campos editables del Contacto:
-CONTACTO_EDIT_FIELDS: list[str] = []
-if _has_field(ContactoModel, "estado_mensaje"):
-    CONTACTO_EDIT_FIELDS.append("estado_mensaje")
-if _has_field(ContactoModel, "comentario"):
-    CONTACTO_EDIT_FIELDS.append("comentario")
+CONTACTO_EDIT_FIELDS: list[str] = [
+    nombre for nombre in ("estado_mensaje", "comentario")
+    if capacidades.de(ContactoModel).tiene(nombre)
+]
 
 
 class ContactoAdminForm(forms.ModelForm):
@@ -95,13 +85,10 @@ class ContactoAdminForm(forms.ModelForm):
 
         # Asegurar <select> con opciones para 'estado_mensaje'
         if "estado_mensaje" in self.fields:
-            try:
-                meta_field = ContactoModel._meta.get_field("estado_mensaje")
-                model_choices = list(getattr(meta_field, "choices", [])) or []
-            except Exception:
-                model_choices = []
-
-            choices = model_choices or self.ESTADO_FALLBACK
+            choices = (
+                capacidades.de(ContactoModel).opciones("estado_mensaje")
+                or self.ESTADO_FALLBACK
+            )
 
             # reconstruimos el campo como ChoiceField para garantizar <select>
             self.fields["estado_mensaje"] = forms.ChoiceField(
@@ -138,38 +125,10 @@ class ReservaEstadoForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        opts = self._meta.model._meta
-        candidates = ["estado", "estado_reserva", "status", "situacion"]
-
-        def _by_name():
-            for name in candidates:
-                try:
-                    return name, opts.get_field(name)
-                except Exception:
-                    pass
-            return None, None
-
-        def _first_with_choices():
-            for f in opts.get_fields():
-                if isinstance(f, models.Field) and getattr(f, "choices", None):
-                    if isinstance(
-                        f, (models.CharField, models.IntegerField,
-                            models.SmallIntegerField)
-                    ):
-                        return f.name, f
-            return None, None
-
-        def _safe_char():
-            for f in opts.get_fields():
-                if isinstance(f, models.CharField) and getattr(f, "editable", True):
-                    return f.name, f
-            return None, None
-
-        name, field = _by_name()
-        if not name:
-            name, field = _first_with_choices()
-        if not name:
-            name, field = _safe_char()
+        # Detectado una sola vez al arrancar (administrador.capacidades)
+        cap = capacidades.de(self._meta.model)
+        name = cap.estado
+        field = cap.campo(name) if name else None
 
         if not name or not field:
             self.fields["__estado__"] = forms.CharField(
@@ -196,6 +155,14 @@ class ReservaEstadoForm(forms.ModelForm):
 #  Admin de Usuarios
 # =======================
 
+def _credencial_repetida(campo: str, valor, instancia) -> bool:
+    """True si otro usuario ya usa `valor` (sin distinguir mayúsculas)."""
+    qs = User.objects.filter(**{f"{campo}_norm": normalizar(valor)})
+    if instancia.pk:
+        qs = qs.exclude(pk=instancia.pk)
+    return qs.exists()
+
+
 class UsuarioAdminForm(forms.ModelForm):
     rol = forms.CharField(required=False, label="Rol",
                           help_text="Ej: administrador / cliente")
@@ -221,6 +188,12 @@ class UsuarioAdminForm(forms.ModelForm):
         else:
             self.fields.pop("rol")
 
+    def clean_email(self):
+        email = self.cleaned_data.get("email")
+        if email and _credencial_repetida("email", email, self.instance):
+            raise forms.ValidationError("El correo ya está registrado.")
+        return email
+
     def save(self, commit=True):
         user = super().save(commit=False)
         if "rol" in self.cleaned_data and hasattr(user, "rol"):
@@ -257,6 +230,18 @@ class UsuarioCrearForm(forms.ModelForm):
             "email": forms.EmailInput(attrs={"class": "form-control"}),
         }
 
+    def clean_username(self):
+        username = self.cleaned_data.get("username")
+        if _credencial_repetida("username", username, self.instance):
+            raise forms.ValidationError("El nombre de usuario ya está registrado.")
+        return username
+
+    def clean_email(self):
+        email = self.cleaned_data.get("email")
+        if email and _credencial_repetida("email", email, self.instance):
+            raise forms.ValidationError("El correo ya está registrado.")
+        return email
+
     def clean(self):
         cleaned = super().clean()
         p1 = cleaned.get("password1") or ""
@@ -282,6 +267,28 @@ class UsuarioCrearForm(forms.ModelForm):
         return user
 
 
+class ImportarUsuariosForm(forms.Form):
+    """Archivo CSV o JSONL para administrador.importacion."""
+
+    archivo = forms.FileField(
+        label="Archivo (.csv o .jsonl)",
+        widget=forms.ClearableFileInput(
+            attrs={"class": "form-control", "accept": ".csv,.jsonl,.ndjson,.json"}),
+    )
+
+    def clean_archivo(self):
+        archivo = self.cleaned_data["archivo"]
+        maximo = getattr(settings, "IMPORTACION_MAX_MB", 10)
+        if archivo.size > maximo * 1024 * 1024:
+            raise forms.ValidationError(f"El archivo supera los {maximo} MB.")
+        try:
+            self.cleaned_data["contenido"] = archivo.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise forms.ValidationError("El archivo debe estar en UTF-8.")
+        self.cleaned_data["formato"] = importacion.formato_de(archivo.name)
+        return archivo
+
+
 # =======================
 #  Gestión de Horarios
 # =======================
@@ -335,6 +342,12 @@ class GenerarClasesForm(forms.Form):
         label="No crear si ya existe una clase en el mismo día/hora/instructor",
         widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
     )
+    vista_previa = forms.BooleanField(
+        required=False,
+        initial=False,
+        label="Solo vista previa (no guarda nada)",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
 
     def clean(self):
         cleaned = super().clean()
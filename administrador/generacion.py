@@ -0,0 +1,120 @@
+# administrador/generacion.py
+"""
+Motor de generación de clases a partir de bloques horarios.
+
+Hace todo el trabajo con un número fijo de consultas, sin importar el largo
+del rango:
+  1) carga los bloques una vez (agrupados por día de semana),
+  2) carga en UNA consulta las claves (fecha, horario, instructor) ya
+     existentes en el rango,
+  3) arma las clases nuevas en memoria y
+  4) las inserta con bulk_create por lotes dentro de una transacción.
+
+planificar() no escribe nada: sirve para la vista previa (dry-run).
+"""
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from . import kpis
+from .models import ClasePilates, HorarioBloque
+
+TAMANO_LOTE = 500
+
+
+class PlanGeneracion:
+    """Resultado de planificar(): clases a crear y claves saltadas."""
+
+    def __init__(self):
+        self.a_crear = []   # list[ClasePilates] (sin guardar)
+        self.saltadas = []  # list[(fecha, horario, instructor)]
+
+    @property
+    def total_crear(self) -> int:
+        return len(self.a_crear)
+
+    @property
+    def total_saltadas(self) -> int:
+        return len(self.saltadas)
+
+
+def _descripcion_por_defecto(bloque: HorarioBloque) -> str:
+    return f"Generada automáticamente desde bloque (instructor: {bloque.instructor or 'N/A'})."
+
+
+def planificar(desde: date, hasta: date, solo_activos: bool = True,
+               nombre_clase: str = "Clase de Pilates", descripcion: str = "") -> PlanGeneracion:
+    nombre_clase = (nombre_clase or "Clase de Pilates").strip()
+    descripcion = (descripcion or "").strip()
+
+    bloques = HorarioBloque.objects.all()
+    if solo_activos:
+        bloques = bloques.filter(activo=True)
+    por_dia = defaultdict(list)
+    for b in bloques.order_by("dia_semana", "hora_inicio"):
+        por_dia[b.dia_semana].append(b)
+
+    existentes = set(
+        ClasePilates.objects.filter(fecha__range=(desde, hasta))
+        .order_by()
+        .values_list("fecha", "horario", "nombre_instructor")
+    )
+
+    plan = PlanGeneracion()
+    cur = desde
+    while cur <= hasta:
+        for b in por_dia.get(cur.weekday(), ()):
+            instructor = (b.instructor or "").strip()
+            clave = (cur, b.hora_inicio, instructor)
+            if clave in existentes:
+                plan.saltadas.append(clave)
+                continue
+            # Dos bloques iguales el mismo día generan una sola clase
+            existentes.add(clave)
+            plan.a_crear.append(
+                ClasePilates(
+                    nombre_clase=nombre_clase,
+                    fecha=cur,
+                    horario=b.hora_inicio,
+                    capacidad_maxima=b.capacidad,
+                    nombre_instructor=instructor,
+                    descripcion=descripcion or _descripcion_por_defecto(b),
+                )
+            )
+        cur += timedelta(days=1)
+    return plan
+
+
+def ejecutar(plan: PlanGeneracion, tamano_lote: int = TAMANO_LOTE,
+             al_avanzar=None, transaccion_por_lote: bool = False) -> int:
+    """
+    Inserta las clases del plan en lotes, por defecto en una sola transacción.
+    `al_avanzar(hechas, total)` se llama tras cada lote (para reportar progreso).
+
+    Con `transaccion_por_lote=True` cada lote se confirma por separado, así el
+    avance es visible desde otras conexiones (trabajos en segundo plano). Si
+    algo falla a mitad, reintentar es seguro: las clases ya creadas se saltan.
+    Devuelve cuántas clases se crearon.
+    """
+    total = plan.total_crear
+    hechas = 0
+    externa = nullcontext() if transaccion_por_lote else transaction.atomic()
+    with externa:
+        for i in range(0, total, tamano_lote):
+            lote = plan.a_crear[i:i + tamano_lote]
+            with transaction.atomic() if transaccion_por_lote else nullcontext():
+                ClasePilates.objects.bulk_create(lote, batch_size=tamano_lote)
+                # bulk_create no dispara post_save: ajustamos los KPI a mano
+                kpis.clases_creadas(lote)
+            hechas += len(lote)
+            if al_avanzar:
+                al_avanzar(hechas, total)
+    return hechas
+
+
+def generar_clases(desde: date, hasta: date, **opciones):
+    """Planifica y ejecuta. Devuelve (creadas, saltadas)."""
+    plan = planificar(desde, hasta, **opciones)
+    return ejecutar(plan), plan.total_saltadas
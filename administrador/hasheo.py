@@ -0,0 +1,27 @@
+# administrador/hasheo.py
+"""
+Código que corre dentro de los procesos del pool de importacion.Hasheador.
+
+El pool arranca con "spawn": cada hijo es un intérprete nuevo que importa
+este módulo antes de que Django esté cargado, así que aquí no se importan
+modelos ni nada que los arrastre (importacion.py sí lo hace).
+"""
+import django
+
+
+def inicializar(hashers):
+    """Carga Django en el hijo con los mismos hashers que el proceso padre."""
+    from django.apps import apps
+    from django.conf import settings
+
+    if not apps.ready:
+        django.setup()
+    # Pueden venir de override_settings (tests) o de settings.py
+    settings.PASSWORD_HASHERS = hashers
+
+
+def hashear_tramo(claves) -> list:
+    from django.contrib.auth.hashers import make_password
+
+    # None -> clave no usable (make_password(None))
+    return [make_password(c) for c in claves]
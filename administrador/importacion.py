@@ -0,0 +1,270 @@
+# administrador/importacion.py
+"""
+Importación masiva de usuarios desde CSV o JSONL (p. ej. los socios de un
+gimnasio asociado).
+
+Columnas (CSV con encabezado, o una clave por campo en cada línea JSONL):
+``username`` (obligatoria), ``email``, ``password``, ``first_name``,
+``last_name``, ``rol`` (cliente por defecto) e ``is_active`` (sí por
+defecto). Sin ``password`` el usuario queda con clave no usable y entra tras
+recuperar su contraseña.
+
+Por cada lote de TAMANO_LOTE filas:
+
+  - valida cada fila y descarta las repetidas dentro del archivo;
+  - revisa contra la base usuario y correo normalizados de TODO el lote en
+    una consulta (login.credenciales.en_uso);
+  - calcula los hashes de contraseña en un pool de procesos (PBKDF2 gasta
+    CPU: con N núcleos va ~N veces más rápido que en un hilo). El pool se
+    arranca con "spawn": la importación corre dentro de los hilos de
+    procesar_trabajos y un fork desde un proceso con hilos puede heredar
+    locks tomados y colgarse;
+  - inserta con ``bulk_create`` en una transacción y ajusta el KPI de
+    usuarios activos (bulk_create no dispara señales).
+
+Las filas rechazadas se informan con su número de línea y el motivo; no
+detienen el resto. Comando: ``python manage.py importar_usuarios``; desde
+el panel, ``administrador:usuarios_importar`` encola un trabajo.
+"""
+import csv
+import io
+import json
+import multiprocessing
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from login.credenciales import en_uso
+
+from . import hasheo, kpis
+
+TAMANO_LOTE = 1000
+# Contraseñas por tarea enviada a un proceso del pool
+TAMANO_TAREA_HASH = 50
+FORMATOS = ("csv", "jsonl")
+VERDADEROS = {"1", "true", "si", "sí", "s", "yes", "y", "x"}
+FALSOS = {"0", "false", "no", "n"}
+
+_validar_username = UnicodeUsernameValidator()
+
+
+def formato_de(nombre: str) -> str:
+    """Formato según la extensión del archivo ("csv" si no se reconoce)."""
+    return "jsonl" if nombre.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+# ----------------------- Lectura -----------------------
+def leer(texto: str, formato: str):
+    """
+    ([(linea, fila), ...], [(linea, motivo), ...]): filas como dict y las
+    líneas que no se pudieron leer.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato} (usa {', '.join(FORMATOS)})")
+    texto = texto.lstrip("\ufeff")
+    filas, rechazos = [], []
+    if formato == "csv":
+        lector = csv.DictReader(io.StringIO(texto))
+        if lector.fieldnames:
+            lector.fieldnames = [(c or "").strip().lower() for c in lector.fieldnames]
+        for fila in lector:
+            filas.append((lector.line_num, fila))
+        return filas, rechazos
+
+    for linea, contenido in enumerate(texto.splitlines(), start=1):
+        if not contenido.strip():
+            continue
+        try:
+            fila = json.loads(contenido)
+        except ValueError:
+            rechazos.append((linea, "JSON inválido"))
+            continue
+        if not isinstance(fila, dict):
+            rechazos.append((linea, "se esperaba un objeto JSON"))
+            continue
+        filas.append((linea, {str(k).strip().lower(): v for k, v in fila.items()}))
+    return filas, rechazos
+
+
+def _texto(fila, campo) -> str:
+    valor = fila.get(campo)
+    return "" if valor is None else str(valor).strip()
+
+
+def _booleano(valor) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    texto = "" if valor is None else str(valor).strip().lower()
+    if not texto:
+        return True  # por defecto, activo
+    if texto in VERDADEROS:
+        return True
+    if texto in FALSOS:
+        return False
+    raise ValidationError(f"is_active inválido: {valor!r}")
+
+
+def construir(fila: dict):
+    """(User sin guardar, contraseña en claro o None); ValidationError si no sirve."""
+    User = get_user_model()
+    username = _texto(fila, "username")
+    email = _texto(fila, "email")
+    rol = _texto(fila, "rol").lower() or "cliente"
+
+    if not username:
+        raise ValidationError("falta username")
+    if len(username) > 150:
+        raise ValidationError("username de más de 150 caracteres")
+    _validar_username(username)
+    if email:
+        if len(email) > 254:
+            raise ValidationError("email de más de 254 caracteres")
+        validate_email(email)
+    roles = dict(User._meta.get_field("rol").choices)
+    if rol not in roles:
+        raise ValidationError(f"rol desconocido: {rol} (usa {', '.join(roles)})")
+    nombres = {campo: _texto(fila, campo) for campo in ("first_name", "last_name")}
+    for campo, valor in nombres.items():
+        if len(valor) > 150:
+            raise ValidationError(f"{campo} de más de 150 caracteres")
+
+    user = User(
+        username=username,
+        email=email,
+        rol=rol,
+        is_active=_booleano(fila.get("is_active")),
+        **nombres,
+    )
+    user.normalizar_credenciales()
+    return user, _texto(fila, "password") or None
+
+
+# ----------------------- Hash en procesos -----------------------
+
+
+class Hasheador:
+    """make_password sobre listas, en un pool de `procesos` o en este proceso."""
+
+    def __init__(self, procesos: int = 1):
+        self.procesos = max(1, procesos or 1)
+        self._pool = None
+
+    def __enter__(self):
+        if self.procesos > 1:
+            # "spawn" y no el fork por defecto de Linux: se llama desde hilos
+            # (procesar_trabajos) y los hijos no heredan ni locks ni conexiones.
+            # Lo que corre en ellos vive en administrador.hasheo
+            self._pool = multiprocessing.get_context("spawn").Pool(
+                self.procesos, initializer=hasheo.inicializar,
+                initargs=(list(settings.PASSWORD_HASHERS),))
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __call__(self, claves) -> list:
+        if self._pool is None or len(claves) <= TAMANO_TAREA_HASH:
+            return hasheo.hashear_tramo(claves)
+        tramos = [claves[i:i + TAMANO_TAREA_HASH]
+                  for i in range(0, len(claves), TAMANO_TAREA_HASH)]
+        # map conserva el orden de los tramos
+        return [h for tramo in self._pool.map(hasheo.hashear_tramo, tramos) for h in tramo]
+
+
+# ----------------------- Importación -----------------------
+def _sin_tomados(User, candidatos, rechazar) -> list:
+    """Descarta los candidatos cuyo usuario o correo ya existe (una consulta)."""
+    tomados_u, tomados_e = en_uso(
+        User,
+        (u.username_norm for _, u, _ in candidatos),
+        (u.email_norm for _, u, _ in candidatos),
+    )
+    libres = []
+    for linea, user, clave in candidatos:
+        if user.username_norm in tomados_u:
+            rechazar(linea, f"el usuario {user.username} ya existe")
+        elif user.email_norm in tomados_e:
+            rechazar(linea, f"el correo {user.email} ya está registrado")
+        else:
+            libres.append((linea, user, clave))
+    return libres
+
+
+def _insertar(User, candidatos, rechazar) -> list:
+    """bulk_create del lote; si alguien se registró entretanto, revisa y reintenta."""
+    for intento in (1, 2):
+        try:
+            with transaction.atomic():
+                usuarios = [u for _, u, _ in candidatos]
+                User.objects.bulk_create(usuarios)
+                kpis.ajustar({kpis.USUARIOS_ACTIVOS: sum(u.is_active for u in usuarios)})
+            return candidatos
+        except IntegrityError:
+            if intento == 2:
+                raise
+            candidatos = _sin_tomados(User, candidatos, rechazar)
+    return candidatos
+
+
+def importar(texto: str, formato: str, procesos: int = 1,
+             tamano_lote: int = TAMANO_LOTE, simular: bool = False,
+             al_avanzar=None) -> dict:
+    """
+    Importa los usuarios de `texto`. Con `simular=True` solo valida (no
+    calcula hashes ni inserta). `al_avanzar(hechas, total)` se llama tras
+    cada lote. Devuelve {"leidas", "creados", "rechazados": [(linea, motivo)]}.
+    """
+    User = get_user_model()
+    filas, rechazados = leer(texto, formato)
+
+    def rechazar(linea, motivo):
+        rechazados.append((linea, motivo))
+
+    total = len(filas)
+    creados = 0
+    usuarios_vistos, correos_vistos = set(), set()
+    with Hasheador(1 if simular else procesos) as hashear:
+        for inicio in range(0, total, tamano_lote):
+            candidatos = []
+            for linea, fila in filas[inicio:inicio + tamano_lote]:
+                try:
+                    user, clave = construir(fila)
+                except ValidationError as exc:
+                    rechazar(linea, "; ".join(exc.messages))
+                    continue
+                if user.username_norm in usuarios_vistos:
+                    rechazar(linea, f"usuario {user.username} repetido en el archivo")
+                    continue
+                if user.email_norm in correos_vistos:
+                    rechazar(linea, f"correo {user.email} repetido en el archivo")
+                    continue
+                usuarios_vistos.add(user.username_norm)
+                correos_vistos.add(user.email_norm)
+                candidatos.append((linea, user, clave))
+
+            candidatos = _sin_tomados(User, candidatos, rechazar)
+            if candidatos and not simular:
+                for (_, user, _), hash_ in zip(candidatos, hashear([c for _, _, c in candidatos])):
+                    user.password = hash_
+                candidatos = _insertar(User, candidatos, rechazar)
+            creados += len(candidatos)
+            if al_avanzar:
+                al_avanzar(min(inicio + tamano_lote, total), total)
+
+    rechazados.sort()
+    return {"leidas": total, "creados": creados, "rechazados": rechazados}
+
+
+def informe_rechazos(rechazados, limite: int = 200) -> str:
+    """Texto con las primeras `limite` filas rechazadas (para el panel)."""
+    lineas = [f"Línea {linea}: {motivo}" for linea, motivo in rechazados[:limite]]
+    if len(rechazados) > limite:
+        lineas.append(f"... y {len(rechazados) - limite} más.")
+    return "\n".join(lineas)
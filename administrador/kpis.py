@@ -0,0 +1,157 @@
+# administrador/kpis.py
+"""
+Contadores del dashboard (tabla/colección ``IndicadorKPI``).
+
+En vez de contar Reserva/Contacto/User en cada visita a admin_home, cada
+KPI es una fila que se ajusta con +1/-1 desde las señales
+(administrador.signals) y desde los caminos que no las disparan
+(bulk_create en administrador.generacion). El dashboard lee todas sus
+claves en UNA consulta.
+
+  - Si falta una clave (instalación nueva, fecha sin datos) se siembra
+    contando una sola vez desde la fuente de verdad.
+  - Los ajustes sobre claves no sembradas se ignoran: la siembra ya las
+    contará bien.
+  - ``python manage.py recalcular_kpis`` reconstruye todo (reconciliación
+    periódica, p. ej. en cron).
+"""
+from collections import Counter
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, F
+
+from index import nativo
+from index.models import Contacto, Reserva
+
+from .models import ClasePilates, IndicadorKPI
+
+CONTACTOS_PENDIENTES = "contactos_pendientes"
+USUARIOS_ACTIVOS = "usuarios_activos"
+
+
+def clave_reservas(fecha: date) -> str:
+    return f"reservas:{fecha.isoformat()}"
+
+
+def clave_clases(fecha: date) -> str:
+    return f"clases:{fecha.isoformat()}"
+
+
+def claves_semana(lunes: date) -> list:
+    return [clave_clases(lunes + timedelta(days=i)) for i in range(7)]
+
+
+def contacto_pendiente(estado) -> bool:
+    return (estado or "").lower() == "pendiente"
+
+
+# ----------------------- Fuente de verdad -----------------------
+def _contar(clave: str) -> int:
+    """Cuenta una clave desde los modelos (solo para sembrar)."""
+    if clave == CONTACTOS_PENDIENTES:
+        return Contacto.objects.filter(estado_mensaje__iexact="pendiente").count()
+    if clave == USUARIOS_ACTIVOS:
+        return get_user_model().objects.filter(is_active=True).count()
+    tipo, _, fecha = clave.partition(":")
+    if tipo == "reservas":
+        return Reserva.objects.filter(fecha=date.fromisoformat(fecha)).count()
+    if tipo == "clases":
+        return ClasePilates.objects.filter(fecha=date.fromisoformat(fecha)).count()
+    raise ValueError(f"Clave de KPI desconocida: {clave}")
+
+
+# ----------------------- Lectura -----------------------
+def leer(claves) -> dict:
+    """{clave: valor} con una consulta; siembra las claves que falten."""
+    claves = list(claves)
+    if nativo.activo():
+        valores = nativo.indicadores(claves)
+    else:
+        valores = dict(
+            IndicadorKPI.objects.filter(clave__in=claves).values_list("clave", "valor")
+        )
+    for clave in claves:
+        if clave not in valores:
+            valor = _contar(clave)
+            IndicadorKPI.objects.get_or_create(clave=clave, defaults={"valor": valor})
+            valores[clave] = valor
+    return valores
+
+
+# ----------------------- Ajustes incrementales -----------------------
+def _incrementar(clave: str, delta: int) -> None:
+    if connection.vendor == "djongo":
+        # djongo no traduce UPDATE ... SET valor = valor + n
+        connection.ensure_connection()
+        connection.connection[IndicadorKPI._meta.db_table].update_one(
+            {"clave": clave}, {"$inc": {"valor": delta}}
+        )
+        return
+    IndicadorKPI.objects.filter(clave=clave).update(valor=F("valor") + delta)
+
+
+def ajustar(cambios) -> None:
+    """
+    Aplica deltas {clave: delta} cuando la transacción en curso se confirma
+    (si se revierte, los contadores no cambian).
+    """
+    cambios = {k: v for k, v in dict(cambios).items() if v}
+    if not cambios:
+        return
+
+    def _aplicar():
+        for clave, delta in cambios.items():
+            _incrementar(clave, delta)
+
+    transaction.on_commit(_aplicar)
+
+
+def clases_creadas(clases) -> None:
+    """Para inserciones masivas que no disparan señales (bulk_create)."""
+    ajustar(Counter(clave_clases(c.fecha) for c in clases))
+
+
+# ----------------------- Reconciliación -----------------------
+def recalcular() -> int:
+    """Reconstruye todos los KPI desde cero. Devuelve cuántas claves quedaron."""
+    filas = {
+        CONTACTOS_PENDIENTES: _contar(CONTACTOS_PENDIENTES),
+        USUARIOS_ACTIVOS: _contar(USUARIOS_ACTIVOS),
+    }
+    por_fecha = (
+        (Reserva, clave_reservas),
+        (ClasePilates, clave_clases),
+    )
+    for modelo, clave in por_fecha:
+        for r in modelo.objects.order_by().values("fecha").annotate(cnt=Count("id")):
+            filas[clave(r["fecha"])] = r["cnt"]
+
+    # Sin borrar la tabla: en djongo delete() + bulk_create() no es atómico y
+    # un leer()/ajustar() concurrente caería entre medio (clave duplicada o
+    # deltas perdidos). Cada clave se fija en su lugar y solo se borran las
+    # que ya no corresponden.
+    existentes = dict(IndicadorKPI.objects.values_list("clave", "pk"))
+    for clave, valor in filas.items():
+        if clave in existentes:
+            _fijar(clave, valor)
+            continue
+        _, creada = IndicadorKPI.objects.get_or_create(clave=clave, defaults={"valor": valor})
+        if not creada:   # la sembró un leer() concurrente
+            _fijar(clave, valor)
+
+    sobrantes = [pk for clave, pk in existentes.items() if clave not in filas]
+    for i in range(0, len(sobrantes), 500):
+        IndicadorKPI.objects.filter(pk__in=sobrantes[i:i + 500]).delete()
+    return len(filas)
+
+
+def _fijar(clave: str, valor: int) -> None:
+    if connection.vendor == "djongo":
+        connection.ensure_connection()
+        connection.connection[IndicadorKPI._meta.db_table].update_one(
+            {"clave": clave}, {"$set": {"valor": valor}}
+        )
+        return
+    IndicadorKPI.objects.filter(clave=clave).update(valor=valor)
@@ -0,0 +1,197 @@
+# administrador/management/commands/benchmark_backends.py
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador import datos_sinteticos
+from administrador.models import ClasePilates
+
+VISTAS = (
+    "clases_disponibles",
+    "reservar_clase",
+    "admin_home",
+    "reservas_admin_list",
+    "mis_reservas",
+)
+
+
+def _resumen(tiempos, consultas):
+    tiempos = sorted(tiempos)
+    p95 = tiempos[min(len(tiempos) - 1, math.ceil(0.95 * len(tiempos)) - 1)]
+    return {
+        "mediana_ms": round(statistics.median(tiempos) * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "consultas": round(consultas / len(tiempos), 1),
+    }
+
+
+def _cronometrar(vista, peticion, repeticiones):
+    tiempos, consultas = [], 0
+    for i in range(repeticiones):
+        with CaptureQueriesContext(connection) as ctx:
+            inicio = time.perf_counter()
+            respuesta = peticion(i)
+            tiempos.append(time.perf_counter() - inicio)
+        if respuesta.status_code >= 400:
+            raise CommandError(f"{vista} respondió {respuesta.status_code}")
+        consultas += len(ctx.captured_queries)
+    return _resumen(tiempos, consultas)
+
+
+def medir_vistas(repeticiones: int) -> dict:
+    """
+    Mide las vistas calientes sobre los datos ya sembrados en la base activa.
+    {vista: {"mediana_ms", "p95_ms", "consultas"}} (consultas por petición).
+    """
+    User = get_user_model()
+    hoy = timezone.localdate()
+
+    admin = User.objects.create_user("bench_admin", password="x", rol="administrador")
+    # El cliente con más historial: el peor caso de "Mis reservas"
+    cliente = (
+        User.objects.filter(rol="cliente", is_active=True, username__startswith="sint_cliente_")
+        .annotate(n=Count("reserva_index"))
+        .order_by("-n", "id").first()
+    )
+    if cliente is None:
+        raise CommandError("No hay datos sintéticos: ejecuta datos_sinteticos.sembrar().")
+
+    # reservar_clase: cada repetición es un cliente nuevo en una clase con cupo
+    clase = ClasePilates.objects.create(
+        nombre_clase="Reformer", fecha=hoy + timedelta(days=1),
+        horario=datos_sinteticos.HORARIOS[0], capacidad_maxima=repeticiones + 1,
+        nombre_instructor="Benchmark", descripcion="Clase para benchmark_backends",
+    )
+    reservantes = []
+    for i in range(repeticiones):
+        c = Client()
+        c.force_login(User.objects.create_user(f"bench_reserva_{i}", password="x"))
+        reservantes.append(c)
+
+    como_admin, como_cliente = Client(), Client()
+    como_admin.force_login(admin)
+    como_cliente.force_login(cliente)
+
+    peticiones = {
+        "clases_disponibles": lambda i: como_cliente.get(
+            reverse("usuarios:clases_disponibles")),
+        "reservar_clase": lambda i: reservantes[i].get(
+            reverse("usuarios:reservar_clase", args=[clase.pk])),
+        "admin_home": lambda i: como_admin.get(reverse("administrador:home")),
+        "reservas_admin_list": lambda i: como_admin.get(
+            reverse("administrador:reservas_list")),
+        "mis_reservas": lambda i: como_cliente.get(reverse("usuarios:mis_reservas")),
+    }
+    return {v: _cronometrar(v, peticiones[v], repeticiones) for v in VISTAS}
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga el mismo conjunto sintético en una base de prueba y mide las "
+        "vistas calientes (mediana, p95 y consultas por petición). Con "
+        "--perfiles compara varios perfiles de PILATES_DB, cada uno en su "
+        "propio proceso."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--perfiles", nargs="+", choices=list(settings.PERFILES_DB),
+            help="Perfiles a comparar (por defecto solo el activo).",
+        )
+        parser.add_argument("--repeticiones", type=int, default=30)
+        parser.add_argument("--usuarios", type=int, default=200)
+        parser.add_argument("--clases", type=int, default=300)
+        parser.add_argument("--reservas", type=int, default=1800)
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument(
+            "--json", action="store_true",
+            help="Imprime el resultado como JSON (lo usa el modo con --perfiles).",
+        )
+
+    # ----------------------- Un perfil (proceso actual) -----------------------
+    def _medir_perfil(self, options) -> dict:
+        # Siempre sobre la base de prueba (test_<NAME>): nunca sobre datos reales
+        setup_test_environment()
+        nombre_original = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            inicio = time.perf_counter()
+            filas = datos_sinteticos.sembrar(
+                usuarios=options["usuarios"],
+                clases=options["clases"],
+                reservas=options["reservas"],
+                semilla=options["semilla"],
+            )
+            carga = time.perf_counter() - inicio
+            vistas = medir_vistas(max(1, options["repeticiones"]))
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+            teardown_test_environment()
+        return {"filas": filas, "carga_s": round(carga, 2), "vistas": vistas}
+
+    # ----------------------- Varios perfiles (subprocesos) -----------------------
+    def _en_subproceso(self, perfil, options) -> dict:
+        argumentos = [
+            sys.executable, str(settings.BASE_DIR / "manage.py"), "benchmark_backends",
+            "--json",
+            "--repeticiones", str(options["repeticiones"]),
+            "--usuarios", str(options["usuarios"]),
+            "--clases", str(options["clases"]),
+            "--reservas", str(options["reservas"]),
+            "--semilla", str(options["semilla"]),
+        ]
+        proceso = subprocess.run(
+            argumentos, capture_output=True, text=True,
+            env={**os.environ, "PILATES_DB": perfil},
+        )
+        if proceso.returncode != 0:
+            lineas = proceso.stderr.strip().splitlines() or ["sin salida"]
+            # La excepción final (p. ej. driver ausente o servidor caído)
+            error = next((l for l in reversed(lineas) if "Error" in l), lineas[-1])
+            return {"error": error.strip()}
+        return json.loads(proceso.stdout)[perfil]
+
+    def _tabla(self, resultados):
+        for perfil, r in resultados.items():
+            self.stdout.write(f"\n== {perfil} ==")
+            if "error" in r:
+                self.stdout.write(self.style.ERROR(f"  no disponible: {r['error']}"))
+                continue
+            filas = ", ".join(f"{n} {t}" for t, n in r["filas"].items())
+            self.stdout.write(f"  Datos: {filas} (carga {r['carga_s']} s)")
+            self.stdout.write(f"  {'vista':<22}{'mediana ms':>12}{'p95 ms':>10}{'consultas':>11}")
+            for vista, m in r["vistas"].items():
+                self.stdout.write(
+                    f"  {vista:<22}{m['mediana_ms']:>12.2f}{m['p95_ms']:>10.2f}{m['consultas']:>11}"
+                )
+
+    def handle(self, *args, **options):
+        perfiles = options["perfiles"] or [settings.PERFIL_DB]
+        if perfiles == [settings.PERFIL_DB]:
+            resultados = {settings.PERFIL_DB: self._medir_perfil(options)}
+        else:
+            resultados = {p: self._en_subproceso(p, options) for p in perfiles}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(resultados))
+        else:
+            self._tabla(resultados)
@@ -0,0 +1,78 @@
+# administrador/management/commands/benchmark_exportacion.py
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from administrador import capacidades, exportacion
+from administrador.models import ClasePilates
+from index.models import Contacto
+
+try:  # no existe en Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def _rss_pico_mb():
+    """Pico de memoria residente del proceso (MB) o None si no se puede medir."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo informa en KB; macOS en bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la exportación CSV en streaming: filas/segundo, MB generados y "
+        "pico de memoria (RSS) del proceso."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modelo", default="reservas",
+            choices=["reservas", "clases", "usuarios", "contactos"],
+        )
+        parser.add_argument(
+            "--bloque", type=int, default=exportacion.TAMANO_BLOQUE,
+            help=f"chunk_size del iterator (por defecto {exportacion.TAMANO_BLOQUE}).",
+        )
+
+    def _origen(self, modelo):
+        if modelo == "reservas":
+            reserva = capacidades.modelo_reserva()
+            return reserva.objects.order_by("-id"), exportacion.columnas_reservas(reserva)
+        if modelo == "clases":
+            return ClasePilates.objects.order_by("id"), exportacion.COLUMNAS_CLASES
+        if modelo == "usuarios":
+            User = get_user_model()
+            return User.objects.order_by("id"), exportacion.columnas_usuarios(User)
+        return Contacto.objects.order_by("-id"), exportacion.COLUMNAS_CONTACTOS
+
+    def handle(self, *args, **options):
+        qs, columnas = self._origen(options["modelo"])
+        rss_inicial = _rss_pico_mb()
+
+        filas = bytes_ = 0
+        inicio = time.perf_counter()
+        for linea in exportacion.filas_csv(qs, columnas, options["bloque"]):
+            filas += 1
+            bytes_ += len(linea.encode("utf-8"))
+        segundos = time.perf_counter() - inicio
+        filas = max(filas - 2, 0)  # BOM + encabezado
+
+        rss_final = _rss_pico_mb()
+        self.stdout.write(f"Modelo:        {options['modelo']} (bloque {options['bloque']})")
+        self.stdout.write(f"Filas:         {filas}")
+        self.stdout.write(f"Tiempo:        {segundos:.2f} s")
+        self.stdout.write(f"Filas/segundo: {filas / segundos if segundos else 0:,.0f}")
+        self.stdout.write(f"CSV generado:  {bytes_ / (1024 * 1024):.2f} MB")
+        if rss_final is not None:
+            self.stdout.write(
+                f"RSS pico:      {rss_final:.1f} MB "
+                f"(+{rss_final - rss_inicial:.1f} MB durante la exportación)"
+            )
+        else:
+            self.stdout.write("RSS pico:      no disponible en esta plataforma")
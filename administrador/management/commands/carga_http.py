@@ -0,0 +1,206 @@
+# administrador/management/commands/carga_http.py
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+from administrador import carga, datos_sinteticos
+from administrador.models import ClasePilates
+from login import limites
+
+
+def _pesos(texto: str) -> dict:
+    """'landing=4,catalogo=3' -> {'landing': 4, 'catalogo': 3}"""
+    pesos = {}
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        nombre, _, valor = parte.partition("=")
+        if nombre not in carga.MEZCLA:
+            raise CommandError(
+                f"Escenario desconocido: {nombre} (usa {', '.join(carga.MEZCLA)})")
+        try:
+            pesos[nombre] = int(valor)
+        except ValueError:
+            raise CommandError(f"Peso inválido para {nombre}: {valor!r}")
+    if not any(pesos.values()):
+        raise CommandError("La mezcla no tiene ningún escenario con peso > 0.")
+    return pesos
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga HTTP: sirve la aplicación con un servidor WSGI local "
+        "sobre una base de prueba con datos sintéticos, la recorre con tráfico "
+        "mixto (landing, catálogo, login, panel) y termina con una ráfaga de "
+        "reservas sobre una misma clase. Informa operaciones por segundo, "
+        "p50/p95/p99 y sobreventa."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--usuarios-virtuales", type=int, default=20,
+                            help="Hilos que generan tráfico mixto a la vez.")
+        parser.add_argument("--duracion", type=float, default=20,
+                            help="Segundos de tráfico mixto.")
+        parser.add_argument(
+            "--mezcla", type=_pesos, default=dict(carga.MEZCLA),
+            help="Pesos de los escenarios, p. ej. landing=4,catalogo=3,login=1,admin=2,ataque=5",
+        )
+        parser.add_argument("--rafaga", type=int, default=300,
+                            help="Clientes que reservan la misma clase a la vez (0 = sin ráfaga).")
+        parser.add_argument("--cupos", type=int, default=20,
+                            help="Capacidad de la clase de la ráfaga.")
+        parser.add_argument("--usuarios", type=int, default=200)
+        parser.add_argument("--clases", type=int, default=300)
+        parser.add_argument("--reservas", type=int, default=1800)
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument("--json", action="store_true")
+
+    # ----------------------- Base de prueba -----------------------
+    def _crear_base(self):
+        # Siempre sobre test_<NAME>, como benchmark_backends. La base SQLite
+        # de prueba es en memoria y compartida: con escrituras desde varios
+        # hilos da "table is locked"; en archivo espera su turno como en
+        # producción.
+        if connection.vendor == "sqlite":
+            self._archivo = tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False).name
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = self._archivo
+        setup_test_environment()
+        self._nombre_original = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    def _borrar_base(self):
+        connection.creation.destroy_test_db(self._nombre_original, verbosity=0)
+        teardown_test_environment()
+        if getattr(self, "_archivo", None) and os.path.exists(self._archivo):
+            os.remove(self._archivo)
+
+    # ----------------------- Preparación -----------------------
+    def _preparar(self, options):
+        User = get_user_model()
+        inicio = time.perf_counter()
+        filas = datos_sinteticos.sembrar(
+            usuarios=options["usuarios"], clases=options["clases"],
+            reservas=options["reservas"], semilla=options["semilla"],
+        )
+        self._carga_s = round(time.perf_counter() - inicio, 2)
+        clientes = list(
+            User.objects.filter(username__startswith="sint_cliente_", is_active=True)
+            .values_list("username", "email")
+        )
+        if not clientes:
+            raise CommandError("Sin clientes activos: usa --usuarios > 0.")
+        admin = User.objects.create_user(
+            "carga_admin", password=datos_sinteticos.CLAVE_POR_DEFECTO, rol="administrador")
+        cliente = User.objects.get(username=clientes[0][0])
+        return filas, clientes, carga.cookies_de_sesion(cliente), carga.cookies_de_sesion(admin)
+
+    def _preparar_rafaga(self, options):
+        User = get_user_model()
+        clave = make_password(datos_sinteticos.CLAVE_POR_DEFECTO)
+        usuarios = [
+            User(username=f"carga_rafaga_{i}", email=f"carga_rafaga_{i}@example.com",
+                 password=clave, rol="cliente")
+            for i in range(options["rafaga"])
+        ]
+        for u in usuarios:
+            u.normalizar_credenciales()
+        usuarios = User.objects.bulk_create(usuarios)
+        if not all(u.pk for u in usuarios):
+            usuarios = list(User.objects.filter(username__startswith="carga_rafaga_"))
+        clase = ClasePilates.objects.create(
+            nombre_clase="Reformer", fecha=timezone.localdate() + timedelta(days=1),
+            horario=datos_sinteticos.HORARIOS[0], capacidad_maxima=options["cupos"],
+            nombre_instructor="Carga", descripcion="Clase de la ráfaga de carga_http",
+        )
+        return clase, [carga.cookies_de_sesion(u) for u in usuarios]
+
+    # ----------------------- Ejecución -----------------------
+    def handle(self, *args, **options):
+        if options["usuarios_virtuales"] < 1:
+            raise CommandError("--usuarios-virtuales debe ser al menos 1.")
+        self._crear_base()
+        try:
+            filas, clientes, sesion_cliente, sesion_admin = self._preparar(options)
+            if options["rafaga"] > 0:
+                clase, sesiones = self._preparar_rafaga(options)
+            limites.vaciar_memoria()
+            limites.reiniciar_estadisticas()
+            # Cada usuario virtual manda su IP en X-Forwarded-For
+            with override_settings(LIMITE_IP_CABECERA="HTTP_X_FORWARDED_FOR"), \
+                    carga.Servidor() as servidor:
+                escenarios = carga.Escenarios(
+                    servidor.puerto, clientes, sesion_cliente, sesion_admin)
+                resultado = {
+                    "perfil": settings.PERFIL_DB,
+                    "filas": filas,
+                    "carga_s": self._carga_s,
+                    "mezcla": carga.mezcla(
+                        escenarios, options["usuarios_virtuales"], options["duracion"],
+                        options["mezcla"], options["semilla"]),
+                }
+                resultado["limites"] = limites.estadisticas()
+                if options["rafaga"] > 0:
+                    resultado["rafaga"] = carga.rafaga(servidor.puerto, clase, sesiones)
+            resultado["sobreventa_total"] = carga.sobreventa_total()
+        finally:
+            self._borrar_base()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(resultado))
+        else:
+            self._informe(resultado)
+
+    def _fila(self, nombre, m):
+        self.stdout.write(
+            f"  {nombre:<16}{m['operaciones']:>8}{m['errores']:>8}{m['por_segundo']:>9.1f}"
+            f"{m['p50_ms']:>10.1f}{m['p95_ms']:>10.1f}{m['p99_ms']:>10.1f}"
+        )
+
+    def _informe(self, r):
+        filas = ", ".join(f"{n} {t}" for t, n in r["filas"].items())
+        self.stdout.write(f"Perfil {r['perfil']}. Datos: {filas} (carga {r['carga_s']} s)")
+
+        m = r["mezcla"]
+        self.stdout.write(f"\n== Tráfico mixto ({m['duracion_s']} s) ==")
+        self.stdout.write(
+            f"  {'escenario':<16}{'ops':>8}{'errores':>8}{'ops/s':>9}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for nombre, valores in m["escenarios"].items():
+            self._fila(nombre, valores)
+        self._fila("total", m["total"])
+        li = r["limites"]
+        self.stdout.write(
+            f"  Login: {li['hash_verificaciones']} claves verificadas "
+            f"({li['hash_segundos']:.2f} s de CPU), {li['rechazados_login']} intentos "
+            f"rechazados por el límite"
+        )
+
+        if "rafaga" in r:
+            ra = r["rafaga"]
+            self.stdout.write(
+                f"\n== Ráfaga: {ra['clientes']} clientes, una clase de {ra['capacidad']} cupos "
+                f"({ra['duracion_s']} s) =="
+            )
+            self._fila("reservar_clase", ra["total"])
+            self.stdout.write(
+                f"  Reservas activas: {ra['reservas_activas']} | cupos_ocupados: "
+                f"{ra['cupos_ocupados']}"
+            )
+            estilo = self.style.SUCCESS if ra["sobreventa"] == 0 else self.style.ERROR
+            self.stdout.write(estilo(f"  Sobreventa de la clase: {ra['sobreventa']}"))
+
+        estilo = self.style.SUCCESS if r["sobreventa_total"] == 0 else self.style.ERROR
+        self.stdout.write(estilo(f"\nSobreventa en todas las clases: {r['sobreventa_total']}"))
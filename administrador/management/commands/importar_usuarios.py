@@ -0,0 +1,52 @@
+# administrador/management/commands/importar_usuarios.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from administrador import importacion, trabajos
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa usuarios desde un CSV (con encabezado) o JSONL: username, "
+        "email, password, first_name, last_name, rol, is_active. Revisa "
+        "unicidad por lotes en una consulta, calcula los hashes en un pool de "
+        "procesos e inserta con bulk_create. Informa las filas rechazadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta del archivo .csv o .jsonl.")
+        parser.add_argument("--formato", choices=importacion.FORMATOS,
+                            help="Por defecto, según la extensión.")
+        parser.add_argument("--procesos", type=int, default=None,
+                            help="Procesos para los hashes (por defecto IMPORTACION_PROCESOS "
+                                 "o los núcleos de la máquina).")
+        parser.add_argument("--lote", type=int, default=importacion.TAMANO_LOTE,
+                            help="Filas por consulta de unicidad y por bulk_create.")
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo valida: no calcula hashes ni inserta.")
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1:
+            raise CommandError("--lote debe ser al menos 1.")
+        try:
+            with open(options["archivo"], encoding="utf-8-sig") as f:
+                texto = f.read()
+        except (OSError, UnicodeDecodeError) as exc:
+            raise CommandError(f"No se pudo leer {options['archivo']}: {exc}")
+
+        formato = options["formato"] or importacion.formato_de(options["archivo"])
+        procesos = options["procesos"] or trabajos.importacion_procesos()
+        inicio = time.perf_counter()
+        r = importacion.importar(
+            texto, formato, procesos=procesos, tamano_lote=options["lote"],
+            simular=options["simular"],
+        )
+        segundos = time.perf_counter() - inicio
+
+        verbo = "válidas (simulación)" if options["simular"] else "creados"
+        self.stdout.write(self.style.SUCCESS(
+            f"Filas leídas: {r['leidas']}, {verbo}: {r['creados']}, "
+            f"rechazadas: {len(r['rechazados'])} ({segundos:.1f} s, {procesos} procesos)."))
+        for linea, motivo in r["rechazados"]:
+            self.stdout.write(self.style.WARNING(f"  Línea {linea}: {motivo}"))
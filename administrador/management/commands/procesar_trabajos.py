@@ -0,0 +1,64 @@
+# administrador/management/commands/procesar_trabajos.py
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+
+from administrador import trabajos
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de trabajos en segundo plano: reclama trabajos pendientes "
+        "(administrador.Trabajo) y los ejecuta en un pool de hilos. Los "
+        "trabajos en curso sin avance en TRABAJOS_TIEMPO_MAXIMO segundos "
+        "vuelven a la cola."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hilos", type=int, default=2,
+            help="Trabajos simultáneos (por defecto 2).",
+        )
+        parser.add_argument(
+            "--intervalo", type=float, default=2.0,
+            help="Segundos de espera cuando no hay trabajos (por defecto 2).",
+        )
+        parser.add_argument(
+            "--una-vez", action="store_true", dest="una_vez",
+            help="Procesa lo pendiente y termina (útil en cron).",
+        )
+
+    def handle(self, *args, **options):
+        hilos = max(1, options["hilos"])
+        intervalo = options["intervalo"]
+        una_vez = options["una_vez"]
+        procesados = 0
+
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            en_curso = set()
+            try:
+                while True:
+                    libres = hilos - len(en_curso)
+                    ids = trabajos.reclamar_pendientes(libres) if libres else []
+                    for trabajo_id in ids:
+                        self.stdout.write(f"Ejecutando trabajo #{trabajo_id}...")
+                        en_curso.add(pool.submit(trabajos.ejecutar_en_hilo, trabajo_id))
+
+                    if una_vez and not ids and not en_curso:
+                        break
+                    if en_curso:
+                        hechos, en_curso = wait(en_curso, timeout=intervalo,
+                                                return_when="FIRST_COMPLETED")
+                        for futuro in hechos:
+                            if futuro.exception() is not None:
+                                self.stderr.write(f"Error en el worker: {futuro.exception()}")
+                        procesados += len(hechos)
+                    elif not ids:
+                        time.sleep(intervalo)
+            except KeyboardInterrupt:
+                self.stdout.write("Interrumpido; esperando trabajos en curso...")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Trabajos procesados: {procesados}.")
+        )
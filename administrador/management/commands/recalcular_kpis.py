@@ -0,0 +1,15 @@
+# administrador/management/commands/recalcular_kpis.py
+from django.core.management.base import BaseCommand
+
+from administrador import kpis
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los contadores del dashboard (administrador.IndicadorKPI) "
+        "desde Reserva, ClasePilates, Contacto y User. Pensado para cron."
+    )
+
+    def handle(self, *args, **options):
+        total = kpis.recalcular()
+        self.stdout.write(self.style.SUCCESS(f"KPIs recalculados: {total} claves."))
@@ -0,0 +1,282 @@
+# administrador/metricas.py
+"""
+Métricas de peticiones en memoria del proceso, en formato Prometheus.
+
+administrador.middleware.MetricasMiddleware mide cada petición y la
+registra aquí bajo el nombre de su URL (``administrador:home``):
+
+  - tiempo total, tiempo en la base de datos, número de consultas y tiempo
+    de render de plantillas;
+  - histograma acumulado de latencia (buckets fijos);
+  - ventana circular (deque con maxlen) de las últimas METRICAS_VENTANA
+    peticiones por vista, para los cuantiles p50/p95/p99;
+  - las METRICAS_TOP_CONSULTAS consultas más lentas (SQL con marcadores).
+
+Todo ocupa memoria acotada: las vistas son las del URLconf y cada una tiene
+buckets y ventana de tamaño fijo. Los valores son por proceso (cada worker
+de gunicorn expone los suyos). Se publican en ``/administrador/metrics``.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CUANTILES = (0.5, 0.95, 0.99)
+VENTANA = 1000
+TOP_CONSULTAS = 20
+SIN_RUTA = "<sin_ruta>"
+
+
+def _ventana() -> int:
+    return max(1, getattr(settings, "METRICAS_VENTANA", VENTANA))
+
+
+def _top() -> int:
+    return max(1, getattr(settings, "METRICAS_TOP_CONSULTAS", TOP_CONSULTAS))
+
+
+# ----------------------- Medición de una petición -----------------------
+class Medicion:
+    """Acumula lo que pasa durante una petición."""
+
+    __slots__ = ("vista", "inicio", "total", "bd", "consultas", "plantillas", "lentas")
+
+    def __init__(self):
+        self.vista = SIN_RUTA
+        self.inicio = time.perf_counter()
+        self.total = self.bd = self.plantillas = 0.0
+        self.consultas = 0
+        self.lentas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Envoltorio para connection.execute_wrapper()."""
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.bd += duracion
+            self.consultas += 1
+            self.lentas.append((duracion, sql))
+
+    def terminar(self):
+        self.total = time.perf_counter() - self.inicio
+
+
+_actual = contextvars.ContextVar("medicion_actual", default=None)
+
+
+@contextmanager
+def medir():
+    """Mide lo que ocurre dentro del bloque (consultas de la conexión default)."""
+    medicion = Medicion()
+    token = _actual.set(medicion)
+    try:
+        with connection.execute_wrapper(medicion):
+            yield medicion
+    finally:
+        _actual.reset(token)
+        medicion.terminar()
+
+
+# ----------------------- Render de plantillas -----------------------
+_instalado = False
+
+
+def instalar_plantillas() -> None:
+    """
+    Envuelve el render de plantillas de Django para sumar su tiempo a la
+    petición en curso (solo el render de nivel superior: los include quedan
+    dentro).
+    """
+    global _instalado
+    if _instalado:
+        return
+    from django.template.backends.django import Template
+
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        medicion = _actual.get()
+        if medicion is None:
+            return original(self, context, request)
+        inicio = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            medicion.plantillas += time.perf_counter() - inicio
+
+    Template.render = render
+    _instalado = True
+
+
+# ----------------------- Almacén por vista -----------------------
+class _Vista:
+    __slots__ = ("buckets", "peticiones", "total", "bd", "consultas", "plantillas", "recientes")
+
+    def __init__(self, ventana: int):
+        self.buckets = [0] * len(BUCKETS)
+        self.peticiones = 0
+        self.total = self.bd = self.plantillas = 0.0
+        self.consultas = 0
+        self.recientes = deque(maxlen=ventana)
+
+
+class Almacen:
+    def __init__(self, ventana: int = VENTANA, top: int = TOP_CONSULTAS):
+        self.ventana = ventana
+        self.top = top
+        self._vistas = {}
+        # sql -> (segundos, vista); se guarda la peor ejecución de cada SQL
+        self._lentas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, m: Medicion) -> None:
+        with self._lock:
+            v = self._vistas.get(m.vista)
+            if v is None:
+                v = self._vistas[m.vista] = _Vista(self.ventana)
+            v.peticiones += 1
+            v.total += m.total
+            v.bd += m.bd
+            v.consultas += m.consultas
+            v.plantillas += m.plantillas
+            v.recientes.append(m.total)
+            for i, limite in enumerate(BUCKETS):
+                if m.total <= limite:
+                    v.buckets[i] += 1
+
+            for duracion, sql in m.lentas:
+                self._registrar_lenta(duracion, sql, m.vista)
+
+    def _registrar_lenta(self, duracion, sql, vista):
+        previa = self._lentas.get(sql)
+        if previa is not None:
+            if duracion > previa[0]:
+                self._lentas[sql] = (duracion, vista)
+            return
+        if len(self._lentas) < self.top:
+            self._lentas[sql] = (duracion, vista)
+            return
+        mas_rapida = min(self._lentas, key=lambda s: self._lentas[s][0])
+        if duracion > self._lentas[mas_rapida][0]:
+            del self._lentas[mas_rapida]
+            self._lentas[sql] = (duracion, vista)
+
+    def instantanea(self) -> dict:
+        """Copia consistente de lo acumulado (para exportar sin el lock)."""
+        with self._lock:
+            vistas = {
+                nombre: {
+                    "buckets": list(v.buckets),
+                    "peticiones": v.peticiones,
+                    "total": v.total,
+                    "bd": v.bd,
+                    "consultas": v.consultas,
+                    "plantillas": v.plantillas,
+                    "recientes": sorted(v.recientes),
+                }
+                for nombre, v in self._vistas.items()
+            }
+            lentas = sorted(
+                ((d, sql, vista) for sql, (d, vista) in self._lentas.items()),
+                reverse=True,
+            )
+        return {"vistas": vistas, "lentas": lentas}
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._vistas.clear()
+            self._lentas.clear()
+
+
+_almacen = None
+_almacen_lock = threading.Lock()
+
+
+def almacen() -> Almacen:
+    global _almacen
+    if _almacen is None:
+        with _almacen_lock:
+            if _almacen is None:
+                _almacen = Almacen(_ventana(), _top())
+    return _almacen
+
+
+# ----------------------- Formato Prometheus -----------------------
+def _etiqueta(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _cuantil(ordenados, q):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+def _cabecera(lineas, nombre, tipo, ayuda):
+    lineas.append(f"# HELP {nombre} {ayuda}")
+    lineas.append(f"# TYPE {nombre} {tipo}")
+
+
+def prometheus(extra=None) -> str:
+    """
+    Texto de exposición de Prometheus (versión 0.0.4). `extra` es un dict
+    {nombre_metrica: (tipo, ayuda, valor)} para métricas sueltas (cachés).
+    """
+    datos = almacen().instantanea()
+    vistas = datos["vistas"]
+    lineas = []
+
+    nombre = "pilates_request_duration_seconds"
+    _cabecera(lineas, nombre, "histogram", "Tiempo total de la petición por vista.")
+    for vista, v in sorted(vistas.items()):
+        e = _etiqueta(vista)
+        for limite, n in zip(BUCKETS, v["buckets"]):
+            lineas.append(f'{nombre}_bucket{{vista="{e}",le="{limite}"}} {n}')
+        lineas.append(f'{nombre}_bucket{{vista="{e}",le="+Inf"}} {v["peticiones"]}')
+        lineas.append(f'{nombre}_sum{{vista="{e}"}} {v["total"]:.6f}')
+        lineas.append(f'{nombre}_count{{vista="{e}"}} {v["peticiones"]}')
+
+    # Summary: cuantiles, suma y cantidad de la ventana de peticiones recientes
+    nombre = "pilates_request_duration_recent_seconds"
+    _cabecera(lineas, nombre, "summary",
+              "Cuantiles de latencia de las últimas peticiones de cada vista.")
+    for vista, v in sorted(vistas.items()):
+        e = _etiqueta(vista)
+        recientes = v["recientes"]
+        for q in CUANTILES:
+            lineas.append(
+                f'{nombre}{{vista="{e}",quantile="{q}"}} {_cuantil(recientes, q):.6f}'
+            )
+        lineas.append(f'{nombre}_sum{{vista="{e}"}} {sum(recientes):.6f}')
+        lineas.append(f'{nombre}_count{{vista="{e}"}} {len(recientes)}')
+
+    acumulados = (
+        ("pilates_db_seconds_total", "bd", "Tiempo en la base de datos.", "{:.6f}"),
+        ("pilates_db_queries_total", "consultas", "Consultas ejecutadas.", "{}"),
+        ("pilates_template_seconds_total", "plantillas", "Tiempo de render de plantillas.", "{:.6f}"),
+    )
+    for nombre, clave, ayuda, formato in acumulados:
+        _cabecera(lineas, nombre, "counter", ayuda)
+        for vista, v in sorted(vistas.items()):
+            lineas.append(f'{nombre}{{vista="{_etiqueta(vista)}"}} {formato.format(v[clave])}')
+
+    nombre = "pilates_slow_query_seconds"
+    _cabecera(lineas, nombre, "gauge", "Consultas más lentas vistas por este proceso.")
+    for puesto, (duracion, sql, vista) in enumerate(datos["lentas"], start=1):
+        lineas.append(
+            f'{nombre}{{puesto="{puesto}",vista="{_etiqueta(vista)}",sql="{_etiqueta(sql)}"}} '
+            f"{duracion:.6f}"
+        )
+
+    for nombre, (tipo, ayuda, valor) in sorted((extra or {}).items()):
+        _cabecera(lineas, nombre, tipo, ayuda)
+        lineas.append(f"{nombre} {valor}")
+
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,78 @@
+# administrador/middleware.py
+from django.conf import settings
+from django.http import HttpResponse
+
+from . import metricas, perfilado
+
+
+class MetricasMiddleware:
+    """
+    Registra tiempo total, tiempo y número de consultas y tiempo de
+    plantillas de cada petición, por nombre de URL (administrador.metricas).
+    Va primero en MIDDLEWARE para incluir la sesión y el usuario. En
+    respuestas en streaming solo se mide hasta que empieza el envío.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "METRICAS_ACTIVAS", True)
+        if self.activo:
+            metricas.instalar_plantillas()
+
+    def __call__(self, request):
+        if not self.activo:
+            return self.get_response(request)
+
+        with metricas.medir() as medicion:
+            response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.view_name:
+            medicion.vista = match.view_name
+        metricas.almacen().registrar(medicion)
+        return response
+
+
+class PerfiladoMiddleware:
+    """
+    Perfilado a pedido (administrador.perfilado): si un administrador manda
+    ``?_perfil=1`` o la cabecera ``X-Perfil`` (sirve también para POST),
+    la petición corre bajo cProfile y se devuelve el informe en lugar de la
+    página. Va después de AuthenticationMiddleware para conocer el usuario.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "PERFILADO_ACTIVO", True)
+
+    def __call__(self, request):
+        formato = perfilado.pedido(request) if self.activo else None
+        if formato is None or not perfilado.es_admin(request.user):
+            return self.get_response(request)
+
+        limitador = perfilado.limitador()
+        if not limitador.tomar():
+            response = HttpResponse(
+                "Límite de perfilados alcanzado; intenta de nuevo en unos segundos.\n",
+                status=429, content_type="text/plain; charset=utf-8",
+            )
+            response["Retry-After"] = str(limitador.espera())
+            return response
+        try:
+            resultado = perfilado.perfilar(self.get_response, request)
+        finally:
+            limitador.soltar()
+
+        match = getattr(request, "resolver_match", None)
+        vista = match.view_name if match is not None and match.view_name else request.path
+        if formato == "prof":
+            response = HttpResponse(
+                perfilado.archivo_prof(resultado), content_type="application/octet-stream"
+            )
+            nombre = vista.replace(":", "-").replace("/", "_").strip("_") or "raiz"
+            response["Content-Disposition"] = f'attachment; filename="perfil-{nombre}.prof"'
+            return response
+        texto = perfilado.informe(
+            resultado, f"{request.method} {request.get_full_path()} ({vista})",
+            request.GET.get("_orden", "cumulative"),
+        )
+        return HttpResponse(texto, content_type="text/plain; charset=utf-8")
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrador', '0004_auto_20250901_2338'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clasepilates',
+            name='cupos_ocupados',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
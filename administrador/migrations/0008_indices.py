@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Índices ascendentes y sin condición: djongo los traduce a create_index
+
+    dependencies = [
+        ('administrador', '0007_indicadorkpi'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clasepilates',
+            index=models.Index(fields=['fecha', 'horario'], name='clase_fecha_horario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='horariobloque',
+            index=models.Index(fields=['activo', 'dia_semana'], name='bloque_activo_dia_idx'),
+        ),
+    ]
@@ -27,13 +27,24 @@ class ClasePilates(models.Model):
     capacidad_maxima = models.PositiveIntegerField()
     nombre_instructor = models.CharField(max_length=100)
     descripcion = models.TextField()
+    # Contador desnormalizado de reservas no canceladas.
+    # Lo mantiene index.cupos con updates atómicos; no editar a mano.
+    cupos_ocupados = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-fecha", "horario"]
+        indexes = [
+            # Catálogo y listados: fecha >= hoy ordenado por fecha, horario
+            models.Index(fields=["fecha", "horario"], name="clase_fecha_horario_idx"),
+        ]
 
     def __str__(self):
         return f'{self.nombre_clase} - {self.fecha} {self.horario}'
 
+    @property
+    def cupos_libres(self) -> int:
+        return max((self.capacidad_maxima or 0) - (self.cupos_ocupados or 0), 0)
+
 
 class ReservaClase(models.Model):
     # related_name único para evitar conflictos
@@ -106,6 +117,10 @@ class HorarioBloque(models.Model):
 
     class Meta:
         ordering = ("dia_semana", "hora_inicio")
+        indexes = [
+            # Generación de clases: bloques activos por día de la semana
+            models.Index(fields=["activo", "dia_semana"], name="bloque_activo_dia_idx"),
+        ]
         verbose_name = "Bloque horario"
         verbose_name_plural = "Bloques horarios"
 
@@ -118,3 +133,66 @@ class HorarioBloque(models.Model):
         if self.hora_fin <= self.hora_inicio:
             raise ValidationError(
                 "La hora de fin debe ser mayor a la hora de inicio.")
+
+
+# =========================
+# Trabajos en segundo plano
+# =========================
+class Trabajo(models.Model):
+    """
+    Tarea pesada encolada desde el panel (p. ej. generar clases de un año).
+    La ejecuta el comando `procesar_trabajos`; ver administrador.trabajos.
+    """
+    ESTADOS = [
+        ("pendiente", "Pendiente"),
+        ("en_curso", "En curso"),
+        ("completado", "Completado"),
+        ("fallido", "Fallido"),
+    ]
+
+    tipo = models.CharField(max_length=50)
+    # JSON serializado en texto: funciona igual en djongo y en SQL
+    parametros = models.TextField(default="{}")
+    estado = models.CharField(max_length=12, choices=ESTADOS, default="pendiente")
+    progreso = models.PositiveSmallIntegerField(default=0)
+    creados = models.PositiveIntegerField(default=0)
+    saltados = models.PositiveIntegerField(default=0)
+    errores = models.TextField(blank=True)
+
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="trabajos",
+    )
+    creado = models.DateTimeField(auto_now_add=True)
+    iniciado = models.DateTimeField(null=True, blank=True)
+    # Último aviso de vida del worker (al reclamar y con cada avance); ver
+    # trabajos.reencolar_colgados
+    actualizado = models.DateTimeField(null=True, blank=True)
+    terminado = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.pk} ({self.estado})"
+
+    @property
+    def terminado_ok(self) -> bool:
+        return self.estado == "completado"
+
+
+class IndicadorKPI(models.Model):
+    """
+    Contador del dashboard mantenido de forma incremental (administrador.kpis).
+    Claves: "contactos_pendientes", "usuarios_activos",
+    "reservas:<AAAA-MM-DD>" y "clases:<AAAA-MM-DD>".
+    """
+    clave = models.CharField(max_length=40, unique=True)
+    valor = models.IntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.clave} = {self.valor}"
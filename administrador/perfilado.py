@@ -0,0 +1,142 @@
+# administrador/perfilado.py
+"""
+Perfilado a pedido de una petición (solo administradores).
+
+Un administrador agrega ``?_perfil=1`` (o la cabecera ``X-Perfil: 1``) a
+cualquier URL y esa petición se ejecuta bajo cProfile; en vez de la página
+recibe un informe de texto con las funciones más costosas y las consultas
+ejecutadas con sus tiempos. Con ``_perfil=prof`` descarga el archivo
+``.prof`` (se abre con ``python -m pstats`` o snakeviz). ``_orden`` elige la
+columna del informe: cumulative (por defecto), tottime o calls.
+
+Límites, por proceso: un perfilado a la vez y como mucho
+PERFILADO_POR_MINUTO por minuto; fuera de eso se responde 429. Se desactiva
+con ``PERFILADO_ACTIVO = False``.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from . import metricas
+
+PARAMETRO = "_perfil"
+CABECERA = "HTTP_X_PERFIL"
+POR_MINUTO = 6
+ORDENES = ("cumulative", "tottime", "calls")
+LINEAS_INFORME = 40
+CONSULTAS_INFORME = 30
+
+
+def pedido(request):
+    """Formato pedido ("texto" o "prof") o None si no se pidió perfilado."""
+    valor = request.GET.get(PARAMETRO) or request.META.get(CABECERA)
+    if not valor or valor == "0":
+        return None
+    return "prof" if valor == "prof" else "texto"
+
+
+def es_admin(user) -> bool:
+    from . import views  # diferido: views importa media aplicación
+
+    return user.is_authenticated and views._solo_admin(user)
+
+
+class Limitador:
+    """Ventana deslizante de un minuto + un solo perfilado simultáneo."""
+
+    def __init__(self, por_minuto: int):
+        self._inicios = deque(maxlen=max(1, por_minuto))
+        self._lock = threading.Lock()
+        self._en_curso = threading.Lock()
+
+    def tomar(self) -> bool:
+        """True si se puede perfilar ahora (hay que llamar a soltar())."""
+        if not self._en_curso.acquire(blocking=False):
+            return False
+        ahora = time.monotonic()
+        with self._lock:
+            lleno = len(self._inicios) == self._inicios.maxlen
+            if lleno and ahora - self._inicios[0] < 60:
+                self._en_curso.release()
+                return False
+            self._inicios.append(ahora)
+        return True
+
+    def soltar(self) -> None:
+        self._en_curso.release()
+
+    def espera(self) -> int:
+        """Segundos hasta que se libere un cupo (aprox.)."""
+        with self._lock:
+            if len(self._inicios) < self._inicios.maxlen:
+                return 1
+            return max(1, int(60 - (time.monotonic() - self._inicios[0])) + 1)
+
+
+_limitador = None
+
+
+def limitador() -> Limitador:
+    global _limitador
+    if _limitador is None:
+        _limitador = Limitador(getattr(settings, "PERFILADO_POR_MINUTO", POR_MINUTO))
+    return _limitador
+
+
+class Resultado:
+    __slots__ = ("perfil", "medicion", "respuesta")
+
+    def __init__(self, perfil, medicion, respuesta):
+        self.perfil = perfil
+        self.medicion = medicion
+        self.respuesta = respuesta
+
+
+def perfilar(funcion, *args) -> Resultado:
+    """Ejecuta funcion(*args) bajo cProfile capturando sus consultas."""
+    perfil = cProfile.Profile()
+    with metricas.medir() as medicion:
+        perfil.enable()
+        try:
+            respuesta = funcion(*args)
+            # El contenido de una respuesta en streaming se genera al leerla
+            if getattr(respuesta, "streaming", False):
+                respuesta.streaming_content = [b"".join(respuesta.streaming_content)]
+        finally:
+            perfil.disable()
+    return Resultado(perfil, medicion, respuesta)
+
+
+def archivo_prof(resultado: Resultado) -> bytes:
+    """Mismo contenido que pstats.Stats.dump_stats(), sin pasar por disco."""
+    resultado.perfil.create_stats()
+    return marshal.dumps(resultado.perfil.stats)
+
+
+def informe(resultado: Resultado, titulo: str, orden: str = "cumulative") -> str:
+    m = resultado.medicion
+    if orden not in ORDENES:
+        orden = "cumulative"
+
+    salida = io.StringIO()
+    salida.write(f"Perfil de {titulo}\n")
+    salida.write(
+        f"Tiempo total: {m.total * 1000:.1f} ms | BD: {m.bd * 1000:.1f} ms en "
+        f"{m.consultas} consultas | plantillas: {m.plantillas * 1000:.1f} ms | "
+        f"estado HTTP: {resultado.respuesta.status_code}\n\n"
+    )
+
+    salida.write(f"== Funciones (orden: {orden}, primeras {LINEAS_INFORME}) ==\n")
+    stats = pstats.Stats(resultado.perfil, stream=salida)
+    stats.strip_dirs().sort_stats(orden).print_stats(LINEAS_INFORME)
+
+    salida.write(f"\n== Consultas más lentas (de {m.consultas}) ==\n")
+    for duracion, sql in sorted(m.lentas, key=lambda x: x[0], reverse=True)[:CONSULTAS_INFORME]:
+        salida.write(f"{duracion * 1000:9.2f} ms  {sql}\n")
+    return salida.getvalue()
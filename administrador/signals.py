@@ -0,0 +1,105 @@
+# administrador/signals.py
+"""
+Mantiene los contadores del dashboard (administrador.kpis).
+
+El valor previo de cada campo seguido se toma al instanciar (post_init, que
+también corre en from_db), así un save no relee la fila. Solo si el campo
+vino diferido (only/defer) se consulta en pre_save.
+
+No pasan por aquí, y deben ajustar los KPI por su cuenta con
+``kpis.ajustar``, ``kpis.clases_creadas`` o ``kpis.recalcular``:
+
+  - ``bulk_create``: administrador.generacion, importacion y
+    datos_sinteticos ya lo hacen;
+  - ``QuerySet.update()`` sobre un campo seguido (fecha de Reserva o
+    ClasePilates, estado_mensaje, is_active). Hoy ningún camino lo hace; los
+    update() de index.cupos/transiciones solo tocan estado y cupos_ocupados;
+  - ``refresh_from_db()`` tras un update() externo del campo: la instancia
+    conserva el valor con que se cargó.
+
+``python manage.py recalcular_kpis`` corrige cualquier desvío.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from index.models import Contacto, Reserva
+
+from . import kpis
+from .models import ClasePilates
+
+User = get_user_model()
+
+# Campo que define cada KPI y cómo se traduce a {clave: 1}
+_SEGUIDOS = {
+    Reserva: ("fecha", lambda v: {kpis.clave_reservas(v): 1}),
+    ClasePilates: ("fecha", lambda v: {kpis.clave_clases(v): 1}),
+    Contacto: (
+        "estado_mensaje",
+        lambda v: {kpis.CONTACTOS_PENDIENTES: 1} if kpis.contacto_pendiente(v) else {},
+    ),
+    User: (
+        "is_active",
+        lambda v: {kpis.USUARIOS_ACTIVOS: 1} if v else {},
+    ),
+}
+
+
+def _aportes(sender, valor) -> dict:
+    return _SEGUIDOS[sender][1](valor)
+
+
+# Campo diferido al instanciar: el valor guardado no se conoce todavía
+_SIN_CARGAR = object()
+
+
+def _al_iniciar(sender, instance, **kwargs):
+    campo = _SEGUIDOS[sender][0]
+    instance._kpi_cargado = instance.__dict__.get(campo, _SIN_CARGAR)
+
+
+def _antes_de_guardar(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    campo = _SEGUIDOS[sender][0]
+    if update_fields is not None and campo not in update_fields:
+        return
+    if getattr(instance, "_kpi_cargado", _SIN_CARGAR) is _SIN_CARGAR:
+        instance._kpi_cargado = (
+            sender.objects.filter(pk=instance.pk).values_list(campo, flat=True).first()
+        )
+
+
+def _al_guardar(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    campo = _SEGUIDOS[sender][0]
+    if not created and update_fields is not None and campo not in update_fields:
+        return
+    actual = getattr(instance, campo)
+    previo = getattr(instance, "_kpi_cargado", _SIN_CARGAR)
+    # El próximo save compara contra lo que quedó guardado ahora
+    instance._kpi_cargado = actual
+
+    cambios = {}
+    if created:
+        cambios.update(_aportes(sender, actual))
+    else:
+        if previo is _SIN_CARGAR or previo == actual:
+            return
+        for clave, n in _aportes(sender, previo).items():
+            cambios[clave] = cambios.get(clave, 0) - n
+        for clave, n in _aportes(sender, actual).items():
+            cambios[clave] = cambios.get(clave, 0) + n
+    kpis.ajustar(cambios)
+
+
+def _al_borrar(sender, instance, **kwargs):
+    campo = _SEGUIDOS[sender][0]
+    kpis.ajustar({k: -n for k, n in _aportes(sender, getattr(instance, campo)).items()})
+
+
+for _modelo in _SEGUIDOS:
+    post_init.connect(_al_iniciar, sender=_modelo, dispatch_uid=f"kpi_init_{_modelo._meta.label}")
+    pre_save.connect(_antes_de_guardar, sender=_modelo, dispatch_uid=f"kpi_pre_{_modelo._meta.label}")
+    post_save.connect(_al_guardar, sender=_modelo, dispatch_uid=f"kpi_post_{_modelo._meta.label}")
+    post_delete.connect(_al_borrar, sender=_modelo, dispatch_uid=f"kpi_del_{_modelo._meta.label}")
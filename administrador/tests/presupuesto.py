@@ -0,0 +1,127 @@
+# administrador/tests/presupuesto.py
+"""
+Presupuesto de consultas por página.
+
+Cada app declara sus páginas con el número exacto de consultas que hacen
+(sesión y usuario incluidos). ``PresupuestoConsultasMixin`` siembra datos
+sintéticos a varios tamaños y comprueba que ese número no cambia con la
+cantidad de filas: una consulta por fila (N+1) rompe el presupuesto.
+
+Se mide con la caché vacía (peor caso) y después de una visita previa, para
+que lo que se siembra una sola vez (p. ej. claves de KPI) no cuente. Las
+sesiones se fijan en cached_db con el usuario memorizado (el perfil con caché
+compartida; en los tests hay un solo proceso y locmem sirve): con la caché
+vacía cuestan una consulta, con cookies firmadas ninguna.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+
+from administrador import datos_sinteticos
+from administrador.models import (
+    ClasePilates, Contacto as ContactoAdmin, HorarioBloque, PerfilUsuario,
+    ReservaClase, Trabajo,
+)
+from index.models import Contacto, Reserva
+
+User = get_user_model()
+
+TAMANOS = (10, 1000)
+SESIONES = "django.contrib.sessions.backends.cached_db"
+USUARIO_CACHE = "default"
+
+
+class PresupuestoConsultasMixin:
+    """
+    Mezclar con TestCase y definir ``paginas``:
+    [(nombre, rol, url, consultas), ...] con rol "anonimo", "cliente",
+    "admin" o "superusuario" y url como texto o función(objetos) -> texto.
+    """
+
+    paginas = ()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.usuarios = {
+            "cliente": User.objects.create_user("cliente", password="x"),
+            "admin": User.objects.create_user("admin", password="x", rol="administrador"),
+            "superusuario": User.objects.create_superuser("root", "root@example.com", "x"),
+        }
+
+    # ----------------------- Datos -----------------------
+    def _crecer(self, filas: int, anteriores: int) -> None:
+        """Lleva cada tabla de `anteriores` a `filas` filas (aprox.)."""
+        n = filas - anteriores
+        prefijo = f"p{filas}"
+        datos_sinteticos.sembrar(
+            usuarios=n, clases=n, reservas=n, contactos=n,
+            prefijo=prefijo, semilla=filas,
+        )
+        nuevos = list(User.objects.filter(username__startswith=f"{prefijo}_").order_by("id"))
+        clases = list(ClasePilates.objects.order_by("-id")[:n])
+        PerfilUsuario.objects.bulk_create([
+            PerfilUsuario(usuario=u, primer_nombre="Ana", apellido_paterno="Soto",
+                          rut=f"{prefijo}-{u.pk}", direccion="Calle 1", telefono="1")
+            for u in nuevos
+        ])
+        ReservaClase.objects.bulk_create([
+            ReservaClase(cliente=u, clase=clases[i % len(clases)]) for i, u in enumerate(nuevos)
+        ])
+        ContactoAdmin.objects.bulk_create([
+            ContactoAdmin(nombre="Contacto", correo_electronico="c@example.com",
+                          mensaje="Hola", telefono="1")
+            for _ in range(n)
+        ])
+        # "Mis reservas" del cliente también crece con el tamaño
+        cliente = self.usuarios["cliente"]
+        Reserva.objects.bulk_create([
+            Reserva(user=cliente, clase=c, tipo="mat", fecha=c.fecha, inicio=c.horario)
+            for c in clases
+        ])
+        Trabajo.objects.get_or_create(tipo="generar_clases", defaults={"solicitado_por": cliente})
+
+    def _objetos(self) -> dict:
+        return {
+            "clase": ClasePilates.objects.order_by("id").first(),
+            "bloque": HorarioBloque.objects.order_by("id").first(),
+            "contacto": Contacto.objects.order_by("id").first(),
+            "perfil": PerfilUsuario.objects.order_by("id").first(),
+            "reserva": Reserva.objects.filter(user=self.usuarios["cliente"]).first(),
+            "trabajo": Trabajo.objects.first(),
+            "cliente": self.usuarios["cliente"],
+        }
+
+    # ----------------------- Medición -----------------------
+    def _entrar(self, rol):
+        if rol == "anonimo":
+            self.client.logout()
+        else:
+            self.client.force_login(self.usuarios[rol])
+
+    def _pedir(self, url):
+        respuesta = self.client.get(url)
+        if respuesta.streaming:
+            b"".join(respuesta.streaming_content)
+        return respuesta
+
+    def _cache_vacia(self):
+        caches[getattr(settings, "DISPONIBILIDAD_CACHE", "default")].clear()
+
+    @override_settings(SESSION_ENGINE=SESIONES, USUARIO_CACHE=USUARIO_CACHE)
+    def test_presupuesto_por_pagina(self):
+        anteriores = 0
+        for filas in TAMANOS:
+            self._crecer(filas, anteriores)
+            anteriores = filas
+            objetos = self._objetos()
+            for nombre, rol, url, consultas in self.paginas:
+                url = url(objetos) if callable(url) else url
+                with self.subTest(pagina=nombre, filas=filas):
+                    self._entrar(rol)
+                    self._pedir(url)
+                    self._cache_vacia()
+                    with self.assertNumQueries(consultas):
+                        respuesta = self._pedir(url)
+                    self.assertLess(respuesta.status_code, 400)
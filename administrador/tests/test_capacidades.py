@@ -0,0 +1,31 @@
+# administrador/tests/test_capacidades.py
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from administrador import capacidades
+from administrador.forms import ReservaEstadoForm
+from administrador.models import ClasePilates, HorarioBloque
+from index.models import Contacto, Reserva
+
+
+class CapacidadesTests(SimpleTestCase):
+    def test_roles_detectados(self):
+        reserva = capacidades.de(Reserva)
+        self.assertEqual(reserva.estado, "estado")
+        self.assertEqual(reserva.cliente, "user")
+        self.assertEqual(reserva.fecha, "fecha")
+        self.assertEqual(capacidades.de(Contacto).estado_contacto, "estado_mensaje")
+        self.assertEqual(capacidades.de(ClasePilates).fecha, "fecha")
+        self.assertIsNone(capacidades.de(HorarioBloque).cliente)
+
+    def test_modelo_de_reservas(self):
+        self.assertIs(capacidades.modelo_reserva(), Reserva)
+
+    def test_registro_resuelto_al_arrancar(self):
+        # ready() ya lo llenó: el formulario no vuelve a inspeccionar _meta
+        self.assertIn(Reserva, capacidades._REGISTRO)
+        with patch.object(Reserva._meta, "get_fields") as get_fields:
+            form = ReservaEstadoForm()
+        get_fields.assert_not_called()
+        self.assertEqual(form.estado_field_name, "estado")
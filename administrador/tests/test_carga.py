@@ -0,0 +1,76 @@
+# administrador/tests/test_carga.py
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+
+from administrador import carga, datos_sinteticos
+from administrador.management.commands.carga_http import _pesos
+from administrador.models import ClasePilates
+
+User = get_user_model()
+
+
+class RegistroTests(SimpleTestCase):
+    def test_percentiles_y_errores(self):
+        registro = carga.Registro()
+        for ms in range(1, 101):
+            registro.anotar("landing", ms / 1000, ok=ms != 50)
+        r = registro.resumen(duracion=2)
+        landing = r["escenarios"]["landing"]
+        self.assertEqual((landing["p50_ms"], landing["p95_ms"], landing["p99_ms"]),
+                         (50.0, 95.0, 99.0))
+        self.assertEqual((landing["errores"], landing["por_segundo"]), (1, 50.0))
+        self.assertEqual(r["total"]["operaciones"], 100)
+
+    def test_mezcla_desde_texto(self):
+        self.assertEqual(_pesos("landing=1, login=0"), {"landing": 1, "login": 0})
+        with self.assertRaises(CommandError):
+            _pesos("checkout=1")
+        with self.assertRaises(CommandError):
+            _pesos("login=0")
+
+
+class CargaHttpTests(TransactionTestCase):
+    """Servidor WSGI real en un hilo, contra la base de prueba."""
+
+    def setUp(self):
+        datos_sinteticos.sembrar(usuarios=5, clases=5, reservas=10, contactos=2, semilla=3)
+        self.admin = User.objects.create_user("admin", password="x", rol="administrador")
+        self.clientes = list(
+            User.objects.filter(username__startswith="sint_cliente_", is_active=True)
+            .values_list("username", "email")
+        )
+
+    def test_cada_escenario_responde_lo_esperado(self):
+        with carga.Servidor() as servidor:
+            escenarios = carga.Escenarios(
+                servidor.puerto, self.clientes,
+                carga.cookies_de_sesion(User.objects.get(username=self.clientes[0][0])),
+                carga.cookies_de_sesion(self.admin),
+            )
+            rnd = random.Random(1)
+            for escenario in carga.MEZCLA:
+                with self.subTest(escenario=escenario):
+                    self.assertTrue(escenarios.ejecutar(escenario, rnd))
+
+    def test_rafaga_no_sobrevende(self):
+        clase = ClasePilates.objects.create(
+            nombre_clase="Reformer", fecha=timezone.localdate() + timedelta(days=1),
+            horario=datos_sinteticos.HORARIOS[0], capacidad_maxima=2,
+            nombre_instructor="Carga", descripcion="Ráfaga",
+        )
+        sesiones = [
+            carga.cookies_de_sesion(User.objects.create_user(f"r{i}", password="x"))
+            for i in range(4)
+        ]
+        with carga.Servidor() as servidor:
+            r = carga.rafaga(servidor.puerto, clase, sesiones)
+        self.assertEqual(r["total"]["operaciones"], 4)
+        self.assertEqual(r["reservas_activas"], 2)
+        self.assertEqual(r["cupos_ocupados"], 2)
+        self.assertEqual(r["sobreventa"], 0)
+        self.assertEqual(carga.sobreventa_total(), 0)
@@ -0,0 +1,116 @@
+# administrador/tests/test_datos_sinteticos.py
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from administrador import datos_sinteticos, kpis
+from administrador.management.commands.benchmark_backends import VISTAS, medir_vistas
+from administrador.models import ClasePilates, HorarioBloque
+from index.models import Contacto, Reserva
+
+User = get_user_model()
+
+
+class SembrarTests(TestCase):
+    def test_crea_lo_pedido_con_contadores_consistentes(self):
+        filas = datos_sinteticos.sembrar(usuarios=20, clases=15, reservas=75, contactos=4)
+        self.assertEqual(
+            {k: v for k, v in filas.items() if k != "reservas"},
+            {"bloques": 48, "usuarios": 20, "clases": 15, "contactos": 4},
+        )
+        self.assertEqual(Reserva.objects.count(), filas["reservas"])
+        self.assertEqual(HorarioBloque.objects.count(), 48)
+
+        # cupos_ocupados coincide con las reservas no canceladas y no pasa la capacidad
+        activas = dict(
+            Reserva.objects.values("clase_id")
+            .annotate(n=Count("id", filter=~Q(estado="Cancelada")))
+            .values_list("clase_id", "n")
+        )
+        for clase in ClasePilates.objects.all():
+            self.assertEqual(clase.cupos_ocupados, activas.get(clase.pk, 0))
+            self.assertLessEqual(clase.cupos_ocupados, clase.capacidad_maxima)
+            self.assertNotEqual(clase.fecha.weekday(), 6)
+        activos = User.objects.filter(is_active=True).count()
+        self.assertEqual(kpis.leer([kpis.USUARIOS_ACTIVOS])[kpis.USUARIOS_ACTIVOS], activos)
+
+    def test_estado_segun_fecha(self):
+        hoy = date(2026, 3, 2)
+        datos_sinteticos.sembrar(usuarios=30, clases=40, reservas=400, contactos=0, hoy=hoy)
+        pasadas = set(Reserva.objects.filter(fecha__lt=hoy).values_list("estado", flat=True))
+        futuras = set(Reserva.objects.filter(fecha__gte=hoy).values_list("estado", flat=True))
+        self.assertLessEqual(pasadas, {"Completada", "Cancelada"})
+        self.assertLessEqual(futuras, {"Confirmada", "Pendiente", "Cancelada"})
+
+    def test_misma_semilla_mismos_datos(self):
+        def huella():
+            return list(
+                Reserva.objects.order_by("clase__descripcion", "user__username")
+                .values_list("clase__descripcion", "user__username", "estado")
+            )
+
+        datos_sinteticos.sembrar(usuarios=10, clases=6, reservas=24, semilla=7)
+        primera = huella()
+        Reserva.objects.all().delete()
+        ClasePilates.objects.all().delete()
+        User.objects.all().delete()
+        Contacto.objects.all().delete()
+        datos_sinteticos.sembrar(usuarios=10, clases=6, reservas=24, semilla=7)
+        self.assertEqual(huella(), primera)
+
+    def test_ids_de_clases_por_rango_de_fecha(self):
+        # Como en djongo: bulk_create no devuelve los ids
+        with mock.patch.object(connection.features, "can_return_rows_from_bulk_insert", False), \
+             CaptureQueriesContext(connection) as ctx:
+            filas = datos_sinteticos.sembrar(usuarios=10, clases=12, reservas=60, contactos=0)
+        self.assertEqual(Reserva.objects.count(), filas["reservas"])
+        self.assertFalse(Reserva.objects.filter(clase__isnull=True).exists())
+        # Fuera de la comprobación inicial del prefijo (exists() -> LIMIT 1)
+        lecturas = [q["sql"] for q in ctx.captured_queries
+                    if q["sql"].startswith("SELECT") and '"descripcion"' in q["sql"]
+                    and "LIMIT 1" not in q["sql"]]
+        self.assertEqual(len(lecturas), 1)
+        self.assertIn('"fecha" >=', lecturas[0])
+        self.assertNotIn('"descripcion" IN', lecturas[0])
+
+    def test_no_repite_prefijo(self):
+        datos_sinteticos.sembrar(usuarios=5, clases=4, reservas=10, contactos=0)
+        # Aunque ya no queden sus clientes, las marcas de las clases chocarían
+        User.objects.filter(username__startswith="sint_").delete()
+        with self.assertRaises(ValueError):
+            datos_sinteticos.sembrar(usuarios=5, clases=4, reservas=10, contactos=0)
+        self.assertEqual(ClasePilates.objects.count(), 4)
+
+
+class GenerarDatosCommandTests(TestCase):
+    def test_genera_y_no_repite_prefijo(self):
+        salida = StringIO()
+        call_command(
+            "generar_datos", usuarios=8, clases=10, reservas=40, contactos=3,
+            procesos=1, stdout=salida,
+        )
+        self.assertIn("8 usuarios", salida.getvalue())
+        self.assertEqual(Contacto.objects.count(), 3)
+        with self.assertRaises(CommandError):
+            call_command("generar_datos", usuarios=1, clases=0, stdout=StringIO())
+
+
+class BenchmarkBackendsTests(TestCase):
+    def test_mide_todas_las_vistas_calientes(self):
+        datos_sinteticos.sembrar(usuarios=10, clases=12, reservas=36, contactos=2)
+        resultado = medir_vistas(repeticiones=2)
+        self.assertEqual(tuple(resultado), VISTAS)
+        for metricas in resultado.values():
+            self.assertGreater(metricas["mediana_ms"], 0)
+            self.assertGreater(metricas["consultas"], 0)
+        # reservar_clase realmente reservó en cada repetición
+        self.assertEqual(
+            Reserva.objects.filter(user__username__startswith="bench_reserva_").count(), 2
+        )
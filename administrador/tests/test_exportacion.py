@@ -0,0 +1,70 @@
+# administrador/tests/test_exportacion.py
+import csv
+import io
+from datetime import date, time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from administrador.models import ClasePilates
+from index.models import Contacto, Reserva
+
+User = get_user_model()
+
+
+def _leer(respuesta):
+    texto = b"".join(respuesta.streaming_content).decode("utf-8").lstrip("\ufeff")
+    return list(csv.reader(io.StringIO(texto)))
+
+
+@patch("administrador.views._solo_admin", return_value=True)
+class ExportacionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", password="x")
+        ana = User.objects.create_user(username="ana", password="x", first_name="Ana")
+        beto = User.objects.create_user(username="beto", password="x", is_active=False)
+        clase = ClasePilates.objects.create(
+            nombre_clase="Mat", fecha=date(2030, 1, 7), horario=time(9, 0),
+            capacidad_maxima=5, nombre_instructor="Ana", descripcion=".",
+        )
+        for u, estado in ((ana, "Confirmada"), (beto, "Cancelada")):
+            Reserva.objects.create(
+                user=u, clase=clase, tipo="mat", fecha=clase.fecha,
+                inicio=clase.horario, estado=estado,
+            )
+        Contacto.objects.create(nombre="=HYPERLINK()", correo="x@x.cl", mensaje="hola")
+
+    def setUp(self):
+        self.client.login(username="admin", password="x")
+
+    def test_reservas_respeta_filtros(self, _mock):
+        r = self.client.get(reverse("administrador:exportar_reservas"), {"f": "confirmada"})
+        self.assertEqual(r["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", r["Content-Disposition"])
+        filas = _leer(r)
+        self.assertEqual(filas[0][:3], ["ID", "Usuario", "Email"])
+        self.assertEqual([f[1] for f in filas[1:]], ["ana"])
+
+        filas = _leer(self.client.get(
+            reverse("administrador:exportar_reservas"), {"q": "beto"}))
+        self.assertEqual([f[1] for f in filas[1:]], ["beto"])
+
+    def test_usuarios_y_clases(self, _mock):
+        filas = _leer(self.client.get(
+            reverse("administrador:exportar_usuarios"), {"estado": "inactivos"}))
+        self.assertEqual([f[1] for f in filas[1:]], ["beto"])
+        filas = _leer(self.client.get(reverse("administrador:exportar_clases")))
+        self.assertEqual(len(filas), 2)
+
+    def test_contactos_neutraliza_formulas(self, _mock):
+        filas = _leer(self.client.get(reverse("administrador:exportar_contactos")))
+        self.assertEqual(filas[1][2], "'=HYPERLINK()")
+
+    def test_benchmark(self, _mock):
+        salida = io.StringIO()
+        call_command("benchmark_exportacion", "--modelo=reservas", stdout=salida)
+        self.assertIn("Filas:         2", salida.getvalue())
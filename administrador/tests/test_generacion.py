@@ -0,0 +1,62 @@
+# administrador/tests/test_generacion.py
+from datetime import date, time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from administrador import generacion
+from administrador.models import ClasePilates, HorarioBloque
+
+User = get_user_model()
+
+
+class GeneracionClasesTests(TestCase):
+    def setUp(self):
+        # Lunes y miércoles a las 9:00 con Ana; bloque inactivo el martes
+        for dia in (0, 2):
+            HorarioBloque.objects.create(
+                dia_semana=dia, hora_inicio=time(9, 0), hora_fin=time(10, 0),
+                instructor="Ana ", capacidad=8,
+            )
+        HorarioBloque.objects.create(
+            dia_semana=1, hora_inicio=time(9, 0), hora_fin=time(10, 0),
+            instructor="Beto", activo=False,
+        )
+        # 2030-01-07 es lunes
+        self.desde, self.hasta = date(2030, 1, 7), date(2030, 1, 20)
+
+    def test_plan_no_escribe(self):
+        plan = generacion.planificar(self.desde, self.hasta)
+        self.assertEqual(plan.total_crear, 4)
+        self.assertEqual(ClasePilates.objects.count(), 0)
+
+    def test_consultas_constantes_y_salta_existentes(self):
+        ClasePilates.objects.create(
+            nombre_clase="X", fecha=date(2030, 1, 7), horario=time(9, 0),
+            capacidad_maxima=8, nombre_instructor="Ana", descripcion=".",
+        )
+        # bloques + claves existentes + SAVEPOINT/INSERT/RELEASE, para cualquier rango
+        with self.assertNumQueries(5):
+            creadas, saltadas = generacion.generar_clases(self.desde, self.hasta)
+        self.assertEqual((creadas, saltadas), (3, 1))
+        self.assertEqual(
+            ClasePilates.objects.filter(nombre_instructor="Ana").count(), 4)
+
+    def test_solo_activos_false_incluye_inactivos(self):
+        plan = generacion.planificar(self.desde, self.hasta, solo_activos=False)
+        self.assertEqual(plan.total_crear, 6)
+
+    @patch("administrador.views._solo_admin", return_value=True)
+    def test_vista_previa_desde_la_vista(self, _mock):
+        User.objects.create_user(username="admin", password="x")
+        self.client.login(username="admin", password="x")
+        r = self.client.post(reverse("administrador:horarios_generar_clases"), {
+            "desde": self.desde, "hasta": self.hasta, "solo_activos": "on",
+            "ignorar_existentes": "on", "vista_previa": "on",
+            "nombre_clase": "Clase de Pilates",
+        })
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context["plan"].total_crear, 4)
+        self.assertEqual(ClasePilates.objects.count(), 0)
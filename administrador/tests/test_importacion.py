@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from administrador import importacion, kpis
+from administrador.models import IndicadorKPI, Trabajo
+
+User = get_user_model()
+
+RAPIDO = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+CSV = (
+    "username,email,password,first_name,last_name,rol,is_active\n"
+    "Ana,ana@example.com,clave-1,Ana,Soto,,\n"
+    "beto,,,Beto,Díaz,administrador,no\n"
+    "ANA,otra@example.com,x,,,,\n"
+    "carla,ANA@example.com,x,,,,\n"
+    "dani,no-es-correo,x,,,,\n"
+    "eva,eva@example.com,x,,,jefa,\n"
+)
+
+
+@override_settings(PASSWORD_HASHERS=RAPIDO)
+class ImportarTests(TestCase):
+    def test_crea_y_rechaza_con_motivo(self):
+        r = importacion.importar(CSV, "csv")
+        self.assertEqual((r["leidas"], r["creados"]), (6, 2))
+        self.assertEqual([linea for linea, _ in r["rechazados"]], [4, 5, 6, 7])
+        self.assertIn("repetido en el archivo", r["rechazados"][0][1])
+
+        ana = User.objects.get(username="Ana")
+        self.assertEqual((ana.username_norm, ana.email_norm), ("ana", "ana@example.com"))
+        self.assertTrue(ana.check_password("clave-1"))
+        self.assertEqual(ana.rol, "cliente")
+        beto = User.objects.get(username="beto")
+        self.assertFalse(beto.has_usable_password())
+        self.assertFalse(beto.is_active)
+        self.assertEqual(beto.rol, "administrador")
+
+    def test_existentes_sin_mayusculas_y_jsonl(self):
+        User.objects.create_user("Nora", email="nora@example.com", password="x")
+        texto = "\n".join([
+            json.dumps({"username": "NORA", "email": "n2@example.com"}),
+            json.dumps({"username": "n3", "email": "NORA@example.com"}),
+            "{no es json",
+            "",
+            json.dumps({"username": "n4", "is_active": False}),
+        ])
+        r = importacion.importar(texto, "jsonl")
+        self.assertEqual(r["creados"], 1)
+        self.assertEqual(
+            [(linea, motivo.split()[0]) for linea, motivo in r["rechazados"]],
+            [(1, "el"), (2, "el"), (3, "JSON")],
+        )
+        self.assertFalse(User.objects.get(username="n4").is_active)
+
+    def test_una_consulta_de_unicidad_por_lote(self):
+        texto = "username\n" + "\n".join(f"u{i}" for i in range(7))
+        with CaptureQueriesContext(connection) as ctx:
+            r = importacion.importar(texto, "csv", tamano_lote=3)
+        self.assertEqual(r["creados"], 7)
+        tabla = User._meta.db_table
+        selects = [q for q in ctx.captured_queries
+                   if q["sql"].startswith("SELECT") and tabla in q["sql"]]
+        self.assertEqual(len(selects), 3)
+
+    def test_kpi_usuarios_activos(self):
+        IndicadorKPI.objects.create(clave=kpis.USUARIOS_ACTIVOS, valor=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            importacion.importar("username,is_active\na,1\nb,0\nc,\n", "csv")
+        self.assertEqual(kpis.leer([kpis.USUARIOS_ACTIVOS])[kpis.USUARIOS_ACTIVOS], 2)
+
+    def test_comando_simular_no_inserta(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False,
+                                         encoding="utf-8") as f:
+            f.write(CSV)
+        self.addCleanup(os.remove, f.name)
+        salida = StringIO()
+        call_command("importar_usuarios", f.name, "--simular", "--procesos", "1",
+                     stdout=salida)
+        self.assertIn("válidas (simulación): 2, rechazadas: 4", salida.getvalue())
+        self.assertFalse(User.objects.exists())
+
+        call_command("importar_usuarios", f.name, "--procesos", "1", stdout=StringIO())
+        self.assertEqual(User.objects.count(), 2)
+
+
+@override_settings(PASSWORD_HASHERS=RAPIDO)
+class HasheadorTests(SimpleTestCase):
+    def test_pool_conserva_el_orden(self):
+        claves = [f"clave-{i}" for i in range(120)] + [None]
+        with importacion.Hasheador(2) as hashear:
+            hashes = hashear(claves)
+        self.assertEqual(len(hashes), len(claves))
+        self.assertTrue(check_password("clave-77", hashes[77]))
+        self.assertFalse(check_password("clave-77", hashes[78]))
+        self.assertTrue(hashes[-1].startswith("!"))
+
+    def test_pool_desde_un_hilo_como_procesar_trabajos(self):
+        def hashear():
+            with importacion.Hasheador(2) as h:
+                self.assertEqual(h._pool._ctx.get_start_method(), "spawn")
+                return h([f"c{i}" for i in range(60)])
+
+        with ThreadPoolExecutor(max_workers=2) as ejecutor:
+            hashes = ejecutor.submit(hashear).result(timeout=120)
+        self.assertTrue(check_password("c59", hashes[59]))
+
+
+@override_settings(PASSWORD_HASHERS=RAPIDO, TRABAJOS_SINCRONICOS=True,
+                   IMPORTACION_PROCESOS=1)
+class ImportarVistaTests(TestCase):
+    def setUp(self):
+        User.objects.create_user("admin", password="x", rol="administrador")
+        self.client.login(username="admin", password="x")
+
+    def test_subida_encola_y_limpia_el_archivo(self):
+        archivo = SimpleUploadedFile("socios.csv", CSV.encode("utf-8-sig"))
+        r = self.client.post(reverse("administrador:usuarios_importar"), {"archivo": archivo})
+        trabajo = Trabajo.objects.get()
+        self.assertRedirects(r, reverse("administrador:trabajo_detalle", args=[trabajo.pk]))
+        self.assertEqual((trabajo.estado, trabajo.creados, trabajo.saltados),
+                         ("completado", 2, 4))
+        self.assertIn("Línea 6:", trabajo.errores)
+        self.assertNotIn("clave-1", trabajo.parametros)
+        self.assertTrue(User.objects.filter(username_norm="beto").exists())
+
+    def test_archivo_grande_rechazado(self):
+        archivo = SimpleUploadedFile("socios.csv", b"username\n" + b"a\n" * 600)
+        with self.settings(IMPORTACION_MAX_MB=0.001):
+            r = self.client.post(reverse("administrador:usuarios_importar"), {"archivo": archivo})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "supera")
+        self.assertFalse(Trabajo.objects.exists())
@@ -0,0 +1,56 @@
+# administrador/tests/test_indices.py
+"""
+Filtros calientes de ClasePilates y HorarioBloque: deben usar índice
+(ver también index/tests/test_indices.py).
+"""
+import datetime
+import unittest
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+
+from administrador.models import ClasePilates, HorarioBloque
+from index import planes
+from index.catalogo import filtrar_clases
+
+es_mongo = connection.vendor == "djongo"
+
+
+@unittest.skipUnless(planes.explain_soportado(), "EXPLAIN de SQL")
+class PlanesSQLTests(TestCase):
+    def test_catalogo_clases_futuras(self):
+        qs = filtrar_clases(desde="2026-01-01", hasta="2026-02-01")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+    def test_clases_de_un_dia(self):
+        qs = ClasePilates.objects.filter(fecha=date(2026, 1, 5)).order_by("horario")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+    @unittest.skipIf(
+        connection.vendor == "sqlite",
+        'SQLite no busca por una columna booleana sola (WHERE "activo")',
+    )
+    def test_bloques_activos_para_generar(self):
+        # Misma forma que administrador.generacion.planificar
+        qs = HorarioBloque.objects.filter(activo=True).order_by("dia_semana", "hora_inicio")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+
+@unittest.skipUnless(es_mongo, "explain de Mongo")
+class PlanesMongoTests(TestCase):
+    def _sin_collscan(self, modelo, filtro, orden=None):
+        tabla = modelo._meta.db_table
+        self.assertFalse(
+            planes.escaneo_coleccion(tabla, filtro, orden),
+            planes.plan_mongo(tabla, filtro, orden),
+        )
+
+    def test_catalogo_clases_futuras(self):
+        desde = datetime.datetime(2026, 1, 1)   # djongo guarda DateField a medianoche
+        self._sin_collscan(ClasePilates, {"fecha": {"$gte": desde}},
+                           [("fecha", 1), ("horario", 1)])
+
+    def test_bloques_activos(self):
+        self._sin_collscan(HorarioBloque, {"activo": True},
+                           [("dia_semana", 1), ("hora_inicio", 1)])
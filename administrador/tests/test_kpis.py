@@ -0,0 +1,124 @@
+# administrador/tests/test_kpis.py
+from datetime import date, time, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador import generacion, kpis
+from administrador.models import ClasePilates, HorarioBloque, IndicadorKPI
+from index.models import Contacto, Reserva
+
+User = get_user_model()
+
+
+class KPIsTests(TestCase):
+    def setUp(self):
+        self.hoy = timezone.localdate()
+        self.user = User.objects.create_user(username="u1", password="x")
+
+    def _clase(self, fecha):
+        return ClasePilates.objects.create(
+            nombre_clase="C", fecha=fecha, horario=time(9, 0),
+            capacidad_maxima=5, nombre_instructor="Ana", descripcion=".",
+        )
+
+    def _valor(self, clave):
+        return kpis.leer([clave])[clave]
+
+    def test_siembra_perezosa(self):
+        Contacto.objects.create(nombre="A", correo="a@a.cl", mensaje="hola")
+        self.assertFalse(IndicadorKPI.objects.exists())
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 1)
+        self.assertTrue(
+            IndicadorKPI.objects.filter(clave=kpis.CONTACTOS_PENDIENTES).exists())
+
+    def test_senales_ajustan_contadores(self):
+        clave_hoy = kpis.clave_reservas(self.hoy)
+        self.assertEqual(self._valor(clave_hoy), 0)
+        self.assertEqual(self._valor(kpis.USUARIOS_ACTIVOS), 1)
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            clase = self._clase(self.hoy)
+            r = Reserva.objects.create(
+                user=self.user, clase=clase, tipo="mat", fecha=self.hoy,
+                inicio=clase.horario,
+            )
+            c = Contacto.objects.create(nombre="A", correo="a@a.cl", mensaje="hola")
+            User.objects.create_user(username="u2", password="x", is_active=False)
+        self.assertEqual(self._valor(clave_hoy), 1)
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 1)
+        self.assertEqual(self._valor(kpis.USUARIOS_ACTIVOS), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            r.fecha = self.hoy + timedelta(days=1)
+            r.save()
+            c.estado_mensaje = "revisado"
+            c.save()
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self._valor(clave_hoy), 0)
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 0)
+        self.assertEqual(self._valor(kpis.USUARIOS_ACTIVOS), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            r.delete()
+        self.assertEqual(self._valor(kpis.clave_reservas(r.fecha)), 0)
+
+    def test_guardar_no_relee_la_fila(self):
+        Contacto.objects.create(nombre="A", correo="a@a.cl", mensaje="hola")
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 1)
+
+        c = Contacto.objects.get()
+        c.estado_mensaje = "revisado"
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):   # solo el UPDATE
+                c.save()
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 0)
+
+        # Campo diferido al cargar: ahí sí se lee el valor guardado
+        c = Contacto.objects.only("nombre").get()
+        c.estado_mensaje = "pendiente"
+        with self.captureOnCommitCallbacks(execute=True):
+            c.save()
+        self.assertEqual(self._valor(kpis.CONTACTOS_PENDIENTES), 1)
+
+    def test_bulk_create_de_generacion(self):
+        lunes = date(2030, 1, 7)
+        self.assertEqual(self._valor(kpis.clave_clases(lunes)), 0)
+        HorarioBloque.objects.create(
+            dia_semana=0, hora_inicio=time(9, 0), hora_fin=time(10, 0),
+            instructor="Ana", capacidad=8,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            generacion.generar_clases(lunes, lunes)
+        self.assertEqual(self._valor(kpis.clave_clases(lunes)), 1)
+
+    def test_recalcular_corrige_desvios(self):
+        self._clase(self.hoy)
+        desviada = IndicadorKPI.objects.create(clave=kpis.clave_clases(self.hoy), valor=99)
+        IndicadorKPI.objects.create(clave=kpis.clave_clases(date(2020, 1, 1)), valor=3)
+        kpis.recalcular()
+        self.assertEqual(self._valor(kpis.clave_clases(self.hoy)), 1)
+        self.assertEqual(self._valor(kpis.USUARIOS_ACTIVOS), 1)
+        # Se corrige en su lugar (no se borra y recrea la tabla) y las claves
+        # sin filas desaparecen
+        self.assertEqual(IndicadorKPI.objects.get(pk=desviada.pk).valor, 1)
+        self.assertFalse(
+            IndicadorKPI.objects.filter(clave=kpis.clave_clases(date(2020, 1, 1))).exists())
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+                       USUARIO_CACHE="default")
+    @patch("administrador.views._solo_admin", return_value=True)
+    def test_dashboard_lee_contadores_en_una_consulta(self, _mock):
+        self._clase(self.hoy)
+        self.client.login(username="u1", password="x")
+        self.client.get(reverse("administrador:home"))  # siembra
+        # KPIs + próximas clases + últimos contactos (sesión y usuario en caché)
+        with self.assertNumQueries(3):
+            r = self.client.get(reverse("administrador:home"))
+        self.assertEqual(r.context["clases_semana"], 1)
+        self.assertEqual(r.context["usuarios_activos"], 1)
@@ -0,0 +1,76 @@
+# administrador/tests/test_metricas.py
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from administrador import metricas
+
+User = get_user_model()
+
+
+def _medicion(vista, total, consultas=()):
+    m = metricas.Medicion()
+    m.vista = vista
+    m.total = total
+    for duracion, sql in consultas:
+        m.lentas.append((duracion, sql))
+    return m
+
+
+class AlmacenTests(SimpleTestCase):
+    def test_histograma_acumulado_y_ventana_acotada(self):
+        almacen = metricas.Almacen(ventana=3)
+        for total in (0.001, 0.02, 0.3, 4.0):
+            almacen.registrar(_medicion("home", total))
+        v = almacen.instantanea()["vistas"]["home"]
+        self.assertEqual(v["peticiones"], 4)
+        self.assertEqual(v["recientes"], [0.02, 0.3, 4.0])   # solo las últimas 3
+        buckets = dict(zip(metricas.BUCKETS, v["buckets"]))
+        self.assertEqual((buckets[0.005], buckets[0.025], buckets[0.5], buckets[5.0]), (1, 2, 3, 4))
+
+    def test_top_consultas_lentas(self):
+        almacen = metricas.Almacen(top=2)
+        almacen.registrar(_medicion("a", 1, [(0.1, "SELECT 1"), (0.3, "SELECT 2")]))
+        almacen.registrar(_medicion("b", 1, [(0.2, "SELECT 3"), (0.5, "SELECT 1")]))
+        lentas = almacen.instantanea()["lentas"]
+        # SELECT 1 se queda con su peor tiempo; SELECT 3 desplaza a la más rápida
+        self.assertEqual(lentas, [(0.5, "SELECT 1", "b"), (0.3, "SELECT 2", "a")])
+
+    def test_escapa_etiquetas(self):
+        self.assertEqual(metricas._etiqueta('a "b"\\\n'), 'a \\"b\\"\\\\\\n')
+
+
+class MetricasEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", rol="administrador")
+        cls.cliente = User.objects.create_user("cliente", password="x")
+
+    def setUp(self):
+        metricas.almacen().reiniciar()
+
+    def test_mide_por_vista_y_exporta_prometheus(self):
+        self.client.force_login(self.admin)
+        self.client.get(reverse("index"))
+        self.client.get(reverse("administrador:home"))
+
+        resp = self.client.get(reverse("administrador:metricas"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+        texto = resp.content.decode()
+        self.assertIn('pilates_request_duration_seconds_count{vista="index"} 1', texto)
+        self.assertIn('pilates_request_duration_seconds_bucket{vista="administrador:home",le="+Inf"} 1', texto)
+        self.assertIn('pilates_request_duration_recent_seconds{vista="index",quantile="0.95"}', texto)
+        self.assertIn("# TYPE pilates_request_duration_recent_seconds summary", texto)
+        self.assertIn('pilates_request_duration_recent_seconds_count{vista="index"}', texto)
+        self.assertIn("# TYPE pilates_slow_query_seconds gauge", texto)
+        self.assertIn("pilates_disponibilidad_cache_hits_total", texto)
+
+        home = metricas.almacen().instantanea()["vistas"]["administrador:home"]
+        self.assertGreater(home["consultas"], 0)
+        self.assertGreater(home["bd"], 0)
+        self.assertGreater(home["plantillas"], 0)
+
+    def test_solo_administradores(self):
+        self.client.force_login(self.cliente)
+        self.assertEqual(self.client.get(reverse("administrador:metricas")).status_code, 403)
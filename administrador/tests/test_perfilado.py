@@ -0,0 +1,83 @@
+# administrador/tests/test_perfilado.py
+import marshal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from administrador import perfilado
+
+User = get_user_model()
+
+
+class LimitadorTests(SimpleTestCase):
+    def test_un_perfilado_a_la_vez(self):
+        limitador = perfilado.Limitador(por_minuto=5)
+        self.assertTrue(limitador.tomar())
+        self.assertFalse(limitador.tomar())
+        limitador.soltar()
+        self.assertTrue(limitador.tomar())
+
+    def test_maximo_por_minuto(self):
+        limitador = perfilado.Limitador(por_minuto=2)
+        for _ in range(2):
+            self.assertTrue(limitador.tomar())
+            limitador.soltar()
+        self.assertFalse(limitador.tomar())
+        self.assertGreater(limitador.espera(), 1)
+
+
+class PerfiladoMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", rol="administrador")
+        cls.cliente = User.objects.create_user("cliente", password="x")
+
+    def setUp(self):
+        perfilado._limitador = perfilado.Limitador(por_minuto=2)
+
+    def tearDown(self):
+        perfilado._limitador = None
+
+    def test_informe_con_funciones_y_consultas(self):
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse("administrador:home"), {"_perfil": "1", "_orden": "tottime"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain"))
+        texto = resp.content.decode()
+        self.assertIn("(administrador:home)", texto)
+        self.assertIn("orden: tottime", texto)
+        self.assertIn("function calls", texto)
+        self.assertIn("== Consultas más lentas", texto)
+        self.assertIn("SELECT", texto)
+
+    def test_descarga_prof_por_cabecera(self):
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse("administrador:home"), HTTP_X_PERFIL="prof")
+        self.assertEqual(resp["Content-Disposition"],
+                         'attachment; filename="perfil-administrador-home.prof"')
+        stats = marshal.loads(resp.content)
+        self.assertTrue(any(funcion[2] == "admin_home" for funcion in stats))
+
+    def test_no_admin_recibe_la_pagina_normal(self):
+        self.client.force_login(self.cliente)
+        resp = self.client.get(reverse("index"), {"_perfil": "1"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/html"))
+
+    def test_limite_responde_429(self):
+        self.client.force_login(self.admin)
+        url = reverse("index")
+        for _ in range(2):
+            self.assertTrue(self.client.get(url, {"_perfil": "1"})["Content-Type"].startswith("text/plain"))
+        resp = self.client.get(url, {"_perfil": "1"})
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn("Retry-After", resp)
+        # Sin pedir perfil la página sigue respondiendo
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(PERFILADO_ACTIVO=False)
+    def test_desactivado(self):
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse("index"), {"_perfil": "1"})
+        self.assertTrue(resp["Content-Type"].startswith("text/html"))
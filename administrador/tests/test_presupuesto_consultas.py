@@ -0,0 +1,63 @@
+# administrador/tests/test_presupuesto_consultas.py
+"""
+Consultas por página del panel de administración y del admin de Django,
+con 10 y con 1000 filas (ver administrador/tests/presupuesto.py).
+"""
+from django.test import TestCase
+from django.urls import reverse
+
+from .presupuesto import PresupuestoConsultasMixin
+
+
+class PresupuestoAdministradorTests(PresupuestoConsultasMixin, TestCase):
+    # Base de cada página del panel: sesión + usuario
+    paginas = [
+        # sesión, usuario, KPIs, próximas clases, últimos contactos
+        ("home", "admin", reverse("administrador:home"), 5),
+        ("listar_contactos", "admin", reverse("administrador:listar_contactos"), 3),
+        ("exportar_contactos", "admin", reverse("administrador:exportar_contactos"), 3),
+        ("modificar_contacto", "admin",
+         lambda o: reverse("administrador:modificar_contacto", args=[o["contacto"].pk]), 3),
+        ("crm_contactos", "admin", reverse("administrador:crm_contactos"), 3),
+        ("listar_clases", "admin", reverse("administrador:listar_clases"), 3),
+        ("exportar_clases", "admin", reverse("administrador:exportar_clases"), 3),
+        ("crear_clase", "admin", reverse("administrador:crear_clase"), 2),
+        ("modificar_clase", "admin",
+         lambda o: reverse("administrador:modificar_clase", args=[o["clase"].pk]), 3),
+        ("eliminar_clase", "admin",
+         lambda o: reverse("administrador:eliminar_clase", args=[o["clase"].pk]), 3),
+        ("reservas_list", "admin", reverse("administrador:reservas_list"), 3),
+        ("reservas_list_cliente", "admin",
+         lambda o: reverse("administrador:reservas_list") + f"?cliente={o['cliente'].pk}", 3),
+        ("exportar_reservas", "admin", reverse("administrador:exportar_reservas"), 3),
+        ("usuarios_list", "admin", reverse("administrador:usuarios_list"), 3),
+        ("exportar_usuarios", "admin", reverse("administrador:exportar_usuarios"), 3),
+        ("usuario_crear", "admin", reverse("administrador:usuario_crear"), 2),
+        ("usuario_editar", "admin",
+         lambda o: reverse("administrador:usuario_editar", args=[o["cliente"].pk]), 3),
+        ("horarios_list", "admin", reverse("administrador:horarios_list"), 3),
+        ("horario_crear", "admin", reverse("administrador:horario_crear"), 2),
+        ("horario_editar", "admin",
+         lambda o: reverse("administrador:horario_editar", args=[o["bloque"].pk]), 3),
+        ("horario_eliminar", "admin",
+         lambda o: reverse("administrador:horario_eliminar", args=[o["bloque"].pk]), 3),
+        ("horarios_generar_clases", "admin",
+         reverse("administrador:horarios_generar_clases"), 4),
+        ("trabajo_detalle", "admin",
+         lambda o: reverse("administrador:trabajo_detalle", args=[o["trabajo"].pk]), 3),
+        ("trabajo_progreso", "admin",
+         lambda o: reverse("administrador:trabajo_progreso", args=[o["trabajo"].pk]), 3),
+        ("perfiles_list", "admin", reverse("administrador:perfiles_list"), 3),
+        # + usuarios activos para el select
+        ("perfil_crear", "admin", reverse("administrador:perfil_crear"), 3),
+        ("perfil_editar", "admin",
+         lambda o: reverse("administrador:perfil_editar", args=[o["perfil"].pk]), 4),
+        ("perfil_eliminar", "admin",
+         lambda o: reverse("administrador:perfil_eliminar", args=[o["perfil"].pk]), 4),
+        # Admin de Django: sesión, usuario, conteo, conteo total, filas
+        ("admin_index", "superusuario", "/admin/", 3),
+        ("admin_perfiles", "superusuario", "/admin/administrador/perfilusuario/", 5),
+        ("admin_reservas_clase", "superusuario", "/admin/administrador/reservaclase/", 5),
+        ("admin_clases", "superusuario", "/admin/administrador/clasepilates/", 5),
+        ("admin_contactos", "superusuario", "/admin/administrador/contacto/", 5),
+    ]
@@ -0,0 +1,148 @@
+# administrador/tests/test_trabajos.py
+import json
+from concurrent.futures import Future
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador import trabajos
+from administrador.models import ClasePilates, HorarioBloque, Trabajo
+
+User = get_user_model()
+
+PARAMS = {"desde": "2030-01-07", "hasta": "2030-01-20"}
+
+
+class _PoolEnLinea:
+    """Ejecuta en el mismo hilo: otro hilo no ve la transacción del test."""
+
+    def __init__(self, max_workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, func, *args):
+        futuro = Future()
+        futuro.set_result(func(*args))
+        return futuro
+
+
+class TrabajosTests(TestCase):
+    def setUp(self):
+        for dia in (0, 2):
+            HorarioBloque.objects.create(
+                dia_semana=dia, hora_inicio=time(9, 0), hora_fin=time(10, 0),
+                instructor="Ana", capacidad=8,
+            )
+
+    def test_encolar_no_ejecuta(self):
+        t = trabajos.encolar("generar_clases", PARAMS)
+        self.assertEqual(t.estado, "pendiente")
+        self.assertEqual(ClasePilates.objects.count(), 0)
+
+    def test_tipo_desconocido(self):
+        with self.assertRaises(ValueError):
+            trabajos.encolar("no_existe", {})
+
+    def test_reclamar_una_sola_vez(self):
+        t = trabajos.encolar("generar_clases", PARAMS)
+        self.assertEqual(trabajos.reclamar_pendientes(5), [t.pk])
+        self.assertFalse(trabajos.reclamar(t.pk))
+        self.assertEqual(trabajos.reclamar_pendientes(5), [])
+
+    @override_settings(TRABAJOS_TIEMPO_MAXIMO=600)
+    def test_colgado_vuelve_a_la_cola(self):
+        colgado = trabajos.encolar("generar_clases", PARAMS)
+        vivo = trabajos.encolar("generar_clases", PARAMS)
+        trabajos.reclamar_pendientes(5)
+        hace_rato = timezone.now() - timedelta(minutes=11)
+        Trabajo.objects.filter(pk=colgado.pk).update(iniciado=hace_rato, actualizado=hace_rato)
+        # Empezó hace rato pero sigue avanzando
+        Trabajo.objects.filter(pk=vivo.pk).update(iniciado=hace_rato)
+        trabajos.Progreso(vivo.pk)(1, 10)
+
+        with self.assertLogs("administrador.trabajos", "WARNING"):
+            self.assertEqual(trabajos.reclamar_pendientes(5), [colgado.pk])
+        self.assertEqual(trabajos.reencolar_colgados(), 0)
+        self.assertEqual(Trabajo.objects.get(pk=vivo.pk).estado, "en_curso")
+        with self.settings(TRABAJOS_TIEMPO_MAXIMO=None):
+            Trabajo.objects.update(actualizado=hace_rato)
+            self.assertEqual(trabajos.reencolar_colgados(), 0)
+
+    def test_ejecutar_reporta_resultado(self):
+        ClasePilates.objects.create(
+            nombre_clase="X", fecha=date(2030, 1, 7), horario=time(9, 0),
+            capacidad_maxima=8, nombre_instructor="Ana", descripcion=".",
+        )
+        t = trabajos.encolar("generar_clases", PARAMS)
+        trabajos.reclamar(t.pk)
+        trabajos.ejecutar(t.pk)
+        t.refresh_from_db()
+        self.assertEqual(
+            (t.estado, t.progreso, t.creados, t.saltados), ("completado", 100, 3, 1))
+
+    def test_error_queda_registrado(self):
+        t = Trabajo.objects.create(
+            tipo="generar_clases", parametros=json.dumps({"desde": "mal"}))
+        trabajos.reclamar(t.pk)
+        with self.assertLogs("administrador.trabajos", "ERROR"):
+            trabajos.ejecutar(t.pk)
+        t.refresh_from_db()
+        self.assertEqual(t.estado, "fallido")
+        self.assertIn("mal", t.errores)
+
+    def test_comando_procesa_pendientes(self):
+        trabajos.encolar("generar_clases", PARAMS)
+        with patch("administrador.management.commands.procesar_trabajos"
+                   ".ThreadPoolExecutor", _PoolEnLinea), \
+             patch("administrador.trabajos.ejecutar_en_hilo", trabajos.ejecutar):
+            call_command("procesar_trabajos", "--una-vez", "--hilos=1",
+                         "--intervalo=0.01", stdout=StringIO())
+        self.assertEqual(Trabajo.objects.get().estado, "completado")
+        self.assertEqual(ClasePilates.objects.count(), 4)
+
+
+@patch("administrador.views._solo_admin", return_value=True)
+class TrabajosVistasTests(TestCase):
+    def setUp(self):
+        HorarioBloque.objects.create(
+            dia_semana=0, hora_inicio=time(9, 0), hora_fin=time(10, 0),
+            instructor="Ana", capacidad=8,
+        )
+        self.user = User.objects.create_user(username="admin", password="x")
+        self.client.login(username="admin", password="x")
+
+    def _generar(self):
+        return self.client.post(reverse("administrador:horarios_generar_clases"), {
+            "desde": "2030-01-07", "hasta": "2030-01-20", "solo_activos": "on",
+            "ignorar_existentes": "on", "nombre_clase": "Clase de Pilates",
+        })
+
+    def test_generar_encola_y_redirige(self, _mock):
+        r = self._generar()
+        t = Trabajo.objects.get()
+        self.assertRedirects(
+            r, reverse("administrador:trabajo_detalle", args=[t.pk]))
+        self.assertEqual(t.solicitado_por, self.user)
+        self.assertEqual(ClasePilates.objects.count(), 0)
+        self.assertContains(self.client.get(r.url), "trabajo-barra")
+
+    @override_settings(TRABAJOS_SINCRONICOS=True)
+    def test_progreso_json(self, _mock):
+        self._generar()
+        t = Trabajo.objects.get()
+        data = self.client.get(
+            reverse("administrador:trabajo_progreso", args=[t.pk])).json()
+        self.assertEqual(data["estado"], "completado")
+        self.assertEqual(data["creados"], 2)
+        self.assertTrue(data["terminado"])
@@ -0,0 +1,232 @@
+# administrador/trabajos.py
+"""
+Trabajos en segundo plano sin servicios externos.
+
+  - La cola es la tabla/colección ``Trabajo`` (administrador.models).
+  - Las vistas llaman a ``encolar()`` y responden de inmediato.
+  - El comando ``python manage.py procesar_trabajos`` reclama trabajos
+    pendientes (update condicionado, seguro con varios workers) y los ejecuta
+    en un pool de hilos local.
+  - Un trabajo 'en_curso' sin avance en TRABAJOS_TIEMPO_MAXIMO segundos
+    (el worker murió a mitad) vuelve a 'pendiente' y se reclama de nuevo.
+    Las tareas deben poder repetirse: generar_clases salta las clases que
+    ya existen e importar_usuarios los usuarios ya creados.
+  - El panel consulta el avance en ``administrador:trabajo_progreso``.
+
+Para registrar un tipo nuevo:
+
+    @tarea("mi_tipo")
+    def _mi_tarea(trabajo, parametros, progreso):
+        ...
+        return creados, saltados
+"""
+import json
+import logging
+import os
+import time
+import traceback
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from . import generacion, importacion
+from .models import Trabajo
+
+logger = logging.getLogger(__name__)
+
+TAREAS = {}
+
+# Con avance sin cambio de porcentaje, Progreso igual escribe cada LATIDO
+# segundos para que el trabajo no parezca colgado
+LATIDO = 60
+
+
+def tarea(tipo: str):
+    def registrar(func):
+        TAREAS[tipo] = func
+        return func
+    return registrar
+
+
+# ----------------------- Cola -----------------------
+def encolar(tipo: str, parametros: dict, usuario=None) -> Trabajo:
+    if tipo not in TAREAS:
+        raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+    trabajo = Trabajo.objects.create(
+        tipo=tipo,
+        parametros=json.dumps(parametros),
+        solicitado_por=usuario if getattr(usuario, "pk", None) else None,
+    )
+    # Desarrollo/tests: ejecutar en la misma petición
+    if getattr(settings, "TRABAJOS_SINCRONICOS", False):
+        if reclamar(trabajo.pk):
+            ejecutar(trabajo.pk)
+            trabajo.refresh_from_db()
+    return trabajo
+
+
+def reclamar(trabajo_id: int) -> bool:
+    """Pasa el trabajo a 'en_curso' solo si seguía pendiente."""
+    ahora = timezone.now()
+    return (
+        Trabajo.objects.filter(pk=trabajo_id, estado="pendiente")
+        .update(estado="en_curso", iniciado=ahora, actualizado=ahora)
+        == 1
+    )
+
+
+def reencolar_colgados(tiempo_maximo=None) -> int:
+    """
+    Devuelve a 'pendiente' los trabajos 'en_curso' sin avance desde hace más
+    de `tiempo_maximo` segundos (TRABAJOS_TIEMPO_MAXIMO por defecto).
+    Update condicionado: con varios workers solo uno los reencola.
+    """
+    if tiempo_maximo is None:
+        tiempo_maximo = getattr(settings, "TRABAJOS_TIEMPO_MAXIMO", None)
+    if not tiempo_maximo:
+        return 0
+    limite = timezone.now() - timedelta(seconds=tiempo_maximo)
+    reencolados = (
+        Trabajo.objects.filter(estado="en_curso")
+        .filter(Q(actualizado__lt=limite)
+                | Q(actualizado__isnull=True, iniciado__lt=limite))
+        .update(estado="pendiente", progreso=0, iniciado=None, actualizado=None)
+    )
+    if reencolados:
+        logger.warning("%s trabajo(s) colgado(s) vuelven a la cola", reencolados)
+    return reencolados
+
+
+def reclamar_pendientes(limite: int) -> list:
+    """
+    Reclama hasta `limite` trabajos pendientes (los más antiguos primero),
+    después de reencolar los colgados.
+    """
+    reencolar_colgados()
+    reclamados = []
+    candidatos = (
+        Trabajo.objects.filter(estado="pendiente")
+        .order_by("id")
+        .values_list("id", flat=True)[: limite * 2]
+    )
+    for trabajo_id in candidatos:
+        if len(reclamados) >= limite:
+            break
+        if reclamar(trabajo_id):
+            reclamados.append(trabajo_id)
+    return reclamados
+
+
+# ----------------------- Ejecución -----------------------
+class Progreso:
+    """
+    Callback de avance; escribe en la BD como máximo cada 1% de avance, o
+    cada LATIDO segundos aunque el porcentaje no cambie.
+    """
+
+    def __init__(self, trabajo_id: int):
+        self.trabajo_id = trabajo_id
+        self._ultimo = -1
+        self._escrito = time.monotonic()
+
+    def __call__(self, hechas: int, total: int, **contadores):
+        pct = 100 if not total else min(int(hechas * 100 / total), 100)
+        ahora = time.monotonic()
+        if pct == self._ultimo and not contadores and ahora - self._escrito < LATIDO:
+            return
+        self._ultimo = pct
+        self._escrito = ahora
+        Trabajo.objects.filter(pk=self.trabajo_id).update(
+            progreso=pct, actualizado=timezone.now(), **contadores)
+
+
+def ejecutar(trabajo_id: int) -> None:
+    """Ejecuta un trabajo ya reclamado y deja el resultado en la fila."""
+    trabajo = Trabajo.objects.get(pk=trabajo_id)
+    try:
+        func = TAREAS[trabajo.tipo]
+        creados, saltados = func(
+            trabajo, json.loads(trabajo.parametros or "{}"), Progreso(trabajo_id)
+        )
+    except Exception as exc:
+        logger.exception("Trabajo %s falló", trabajo_id)
+        Trabajo.objects.filter(pk=trabajo_id).update(
+            estado="fallido",
+            errores=f"{exc}\n\n{traceback.format_exc(limit=5)}",
+            terminado=timezone.now(),
+        )
+        return
+
+    Trabajo.objects.filter(pk=trabajo_id).update(
+        estado="completado",
+        progreso=100,
+        creados=creados,
+        saltados=saltados,
+        terminado=timezone.now(),
+    )
+
+
+def ejecutar_en_hilo(trabajo_id: int) -> None:
+    """Envoltorio para el pool: cada hilo usa y cierra su propia conexión."""
+    close_old_connections()
+    try:
+        ejecutar(trabajo_id)
+    finally:
+        close_old_connections()
+
+
+def resumen(trabajo: Trabajo) -> dict:
+    return {
+        "id": trabajo.pk,
+        "tipo": trabajo.tipo,
+        "estado": trabajo.estado,
+        "progreso": trabajo.progreso,
+        "creados": trabajo.creados,
+        "saltados": trabajo.saltados,
+        "errores": trabajo.errores,
+        "terminado": trabajo.estado in ("completado", "fallido"),
+    }
+
+
+# ----------------------- Tareas -----------------------
+@tarea("generar_clases")
+def _generar_clases(trabajo, parametros, progreso):
+    plan = generacion.planificar(
+        date.fromisoformat(parametros["desde"]),
+        date.fromisoformat(parametros["hasta"]),
+        solo_activos=parametros.get("solo_activos", True),
+        nombre_clase=parametros.get("nombre_clase") or "Clase de Pilates",
+        descripcion=parametros.get("descripcion") or "",
+    )
+    progreso(0, plan.total_crear, saltados=plan.total_saltadas)
+    creadas = generacion.ejecutar(
+        plan, al_avanzar=progreso, transaccion_por_lote=True)
+    return creadas, plan.total_saltadas
+
+
+@tarea("importar_usuarios")
+def _importar_usuarios(trabajo, parametros, progreso):
+    try:
+        resultado = importacion.importar(
+            parametros["contenido"],
+            parametros["formato"],
+            procesos=parametros.get("procesos") or importacion_procesos(),
+            al_avanzar=progreso,
+        )
+    finally:
+        # El archivo trae contraseñas en claro: no se deja en la cola
+        Trabajo.objects.filter(pk=trabajo.pk).update(
+            parametros=json.dumps({"formato": parametros.get("formato")}))
+    rechazados = resultado["rechazados"]
+    if rechazados:
+        Trabajo.objects.filter(pk=trabajo.pk).update(
+            errores=importacion.informe_rechazos(rechazados))
+    return resultado["creados"], len(rechazados)
+
+
+def importacion_procesos() -> int:
+    """Procesos para los hashes de una importación (IMPORTACION_PROCESOS)."""
+    return getattr(settings, "IMPORTACION_PROCESOS", None) or os.cpu_count() or 1
@@ -9,11 +9,14 @@ urlpatterns = [
     # Dashboard / Contactos
     path("", views.admin_home, name="home"),
     path("contactos/", views.listar_contactos, name="listar_contactos"),
+    path("contactos/exportar/", views.exportar_contactos,
+         name="exportar_contactos"),
     path("contactos/<int:contacto_id>/",
          views.modificar_contacto, name="modificar_contacto"),
 
     # Clases
     path("clases/", views.listar_clases, name="listar_clases"),
+    path("clases/exportar/", views.exportar_clases, name="exportar_clases"),
     path("clases/nueva/", views.crear_clase, name="crear_clase"),
     path("clases/<int:clase_id>/editar/",
          views.modificar_clase, name="modificar_clase"),
@@ -22,12 +25,20 @@ urlpatterns = [
 
     # Reservas (panel)
     path("reservas/", views.reservas_admin_list, name="reservas_list"),
+    path("reservas/estado-masivo/", views.reservas_admin_estado_masivo,
+         name="reservas_estado_masivo"),
+    path("reservas/exportar/", views.exportar_reservas,
+         name="exportar_reservas"),
     path("reservas/<int:reserva_id>/estado/",
          views.reserva_admin_cambiar_estado, name="reserva_cambiar_estado"),
 
     # Usuarios (panel)
     path("usuarios/", views.admin_usuarios_list, name="usuarios_list"),
+    path("usuarios/exportar/", views.exportar_usuarios,
+         name="exportar_usuarios"),
     path("usuarios/nuevo/", views.admin_usuario_crear, name="usuario_crear"),
+    path("usuarios/importar/", views.admin_usuarios_importar,
+         name="usuarios_importar"),
     path("usuarios/<int:user_id>/editar/",
          views.admin_usuario_editar, name="usuario_editar"),
     path("usuarios/<int:user_id>/toggle-activo/",
@@ -43,6 +54,16 @@ urlpatterns = [
     path("horarios/generar-clases/", views.horarios_generar_clases,
          name="horarios_generar_clases"),
 
+    # Trabajos en segundo plano
+    path("trabajos/<int:trabajo_id>/", views.trabajo_detalle,
+         name="trabajo_detalle"),
+    path("trabajos/<int:trabajo_id>/progreso/", views.trabajo_progreso,
+         name="trabajo_progreso"),
+
+    # Métricas en formato Prometheus (solo admin). Sin barra final: es la
+    # ruta que se configura en el scraper
+    path("metrics", views.metricas_prometheus, name="metricas"),
+
     # Perfiles (CRUD)  <-- NUEVO: incluye las rutas del módulo de perfiles
     path("perfiles/", include("administrador.urls_perfiles")),
     path("perfiles/<int:user_id>/reservas/",
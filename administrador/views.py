@@ -1,39 +1,37 @@
 # administrador/views.py
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, QueryDict
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
+from django.urls import reverse
 from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from datetime import timedelta, date
+from datetime import timedelta
 
+from index import cupos, disponibilidad, paginas, transiciones, traduccion
 from index.models import Contacto
+from index.paginacion import PARAM_CURSOR, PaginadorKeyset
+from login import limites
 
 from .forms import (
     ClasePilatesForm,
     ReservaEstadoForm,
     UsuarioAdminForm,
     UsuarioCrearForm,
+    ImportarUsuariosForm,
     HorarioBloqueForm,
     GenerarClasesForm,
     ContactoAdminForm,
 )
-from .models import ClasePilates, HorarioBloque  # <- modelo de horarios
+from . import capacidades, exportacion, generacion, kpis, metricas, trabajos
+from .models import ClasePilates, HorarioBloque, Trabajo  # <- modelo de horarios
 
 User = get_user_model()
 
-# ===== Elegir el modelo de reservas correcto =====
-USE_INDEX_RESERVA = False
-try:
-    # típicamente: user, clase, (estado|status|...)
-    from index.models import Reserva as ReservaModel
-    USE_INDEX_RESERVA = True
-except Exception:
-    # típicamente: cliente, clase, (estado|...)
-    from .models import ReservaClase as ReservaModel
-    USE_INDEX_RESERVA = False
+# ===== Modelo de reservas y sus campos (resueltos al arrancar) =====
+ReservaModel = capacidades.modelo_reserva()
+USE_INDEX_RESERVA = ReservaModel._meta.app_label == "index"
 
 
 # ---- Helpers de autorización ----
@@ -47,15 +45,6 @@ def _forbidden_if_not_admin(request):
     return None
 
 
-def _has_field(model, name: str) -> bool:
-    """Helper seguro para verificar si un modelo tiene un campo por nombre."""
-    try:
-        model._meta.get_field(name)
-        return True
-    except Exception:
-        return False
-
-
 # ---- DASHBOARD HOME (con KPIs reales) ----
 @login_required
 def admin_home(request):
@@ -64,47 +53,17 @@ def admin_home(request):
 
     hoy = timezone.localdate()
     lunes = hoy - timedelta(days=hoy.weekday())
-    domingo = lunes + timedelta(days=6)
-
-    # ---- Contactos pendientes ----
-    contactos_qs = Contacto.objects.all()
-    if _has_field(Contacto, "estado_mensaje"):
-        contactos_pendientes = contactos_qs.filter(
-            estado_mensaje__iexact="pendiente"
-        ).count()
-    elif _has_field(Contacto, "estado_contacto"):
-        contactos_pendientes = contactos_qs.filter(
-            estado_contacto__iexact="pendiente"
-        ).count()
-    elif _has_field(Contacto, "estado"):
-        contactos_pendientes = contactos_qs.filter(
-            estado__iexact="pendiente").count()
-    else:
-        # MVP: si no hay campo de estado, mostramos el total como pendientes
-        contactos_pendientes = contactos_qs.count()
-
-    # ---- Reservas de HOY ----
-    reservas_qs = ReservaModel.objects.all()
-    reservas_hoy = 0
-    if _has_field(ReservaModel, "fecha"):
-        reservas_hoy = reservas_qs.filter(fecha=hoy).count()
-    elif _has_field(ReservaModel, "fecha_reserva"):
-        reservas_hoy = reservas_qs.filter(fecha_reserva=hoy).count()
-    elif _has_field(ReservaModel, "clase") and _has_field(ClasePilates, "fecha"):
-        try:
-            reservas_hoy = reservas_qs.select_related("clase").filter(
-                clase__fecha=hoy
-            ).count()
-        except Exception:
-            reservas_hoy = 0
-
-    # ---- Clases de esta semana ----
-    clases_semana = ClasePilates.objects.filter(
-        fecha__range=(lunes, domingo)
-    ).count()
 
-    # ---- Usuarios activos ----
-    usuarios_activos = User.objects.filter(is_active=True).count()
+    # ---- KPIs: una sola lectura de contadores (administrador.kpis) ----
+    semana = kpis.claves_semana(lunes)
+    valores = kpis.leer(
+        [kpis.CONTACTOS_PENDIENTES, kpis.USUARIOS_ACTIVOS,
+         kpis.clave_reservas(hoy), *semana]
+    )
+    contactos_pendientes = valores[kpis.CONTACTOS_PENDIENTES]
+    reservas_hoy = valores[kpis.clave_reservas(hoy)]
+    clases_semana = sum(valores[c] for c in semana)
+    usuarios_activos = valores[kpis.USUARIOS_ACTIVOS]
 
     # ---- Próximas clases (top 5) ----
     proximas_clases = (
@@ -113,11 +72,7 @@ def admin_home(request):
     )
 
     # ---- Últimos contactos (top 5) ----
-    if _has_field(Contacto, "fecha_envio"):
-        ultimos_contactos = Contacto.objects.all().order_by(
-            "-fecha_envio", "-id")[:5]
-    else:
-        ultimos_contactos = Contacto.objects.all().order_by("-id")[:5]
+    ultimos_contactos = Contacto.objects.order_by("-fecha_envio", "-id")[:5]
 
     contexto = {
         "admin_name": request.user.username,
@@ -141,7 +96,25 @@ def listar_contactos(request):
     q = (request.GET.get("q") or "").strip()
     estado = (request.GET.get("estado") or "todos").lower()
 
-    qs = Contacto.objects.all().order_by("-fecha_envio")
+    qs = _contactos_filtrados(q, estado)
+    paginador = PaginadorKeyset(qs, ["-fecha_envio", "-id"], 10)
+    page_obj = paginador.pagina(request.GET.get(PARAM_CURSOR), request.GET)
+
+    return render(
+        request,
+        "administrador/contactos_list.html",
+        {
+            "page_obj": page_obj,
+            "q": q,
+            "estado": estado,
+            "estados": ["todos", "pendiente", "revisado", "respondido"],
+        },
+    )
+
+
+def _contactos_filtrados(q: str, estado: str):
+    """Filtros del CRM (`q`, `estado`); los usan el listado y la exportación."""
+    qs = Contacto.objects.all()
 
     # Búsqueda: usa los NOMBRES DE CAMPO reales del modelo Contacto
     if q:
@@ -154,23 +127,10 @@ def listar_contactos(request):
         )
 
     # Filtro por estado si corresponde
-    if estado in {"pendiente", "revisado", "respondido"} and _has_field(Contacto, "estado_mensaje"):
-        qs = qs.filter(estado_mensaje=estado)
-
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(request.GET.get("page") or 1)
-
-    return render(
-        request,
-        "administrador/contactos_list.html",
-        {
-            "page_obj": page_obj,
-            "paginator": paginator,
-            "q": q,
-            "estado": estado,
-            "estados": ["todos", "pendiente", "revisado", "respondido"],
-        },
-    )
+    campo_estado = capacidades.de(Contacto).estado_contacto
+    if estado in {"pendiente", "revisado", "respondido"} and campo_estado:
+        qs = qs.filter(**{campo_estado: estado})
+    return qs
 
 
 @login_required
@@ -253,61 +213,21 @@ def eliminar_clase(request, clase_id: int):
     return render(request, "clases/eliminar_clase.html", {"clase": clase})
 
 
-# ===== Utilidades para Reservas =====
-def _field_exists(model, name: str) -> bool:
-    return any(getattr(f, "name", None) == name for f in model._meta.get_fields())
-
-
-def _first_existing_field(model, candidates):
-    for name in candidates:
-        if _field_exists(model, name):
-            return name
-    return None
-
-
 # ---- Panel de Reservas con filtros/búsqueda/paginación ----
 @login_required
 def reservas_admin_list(request):
     if (resp := _forbidden_if_not_admin(request)) is not None:
         return resp
 
-    qs = ReservaModel.objects.all().order_by("-id")
-
-    # select_related seguro según el modelo elegido
-    client_fk = "user" if USE_INDEX_RESERVA else "cliente"
-    for rel in (client_fk, "clase"):
-        if _field_exists(ReservaModel, rel):
-            try:
-                qs = qs.select_related(rel)
-            except Exception:
-                pass
-
-    # ---- FILTRO POR CLIENTE ----
     cliente_id = request.GET.get("cliente")
-    if cliente_id and _field_exists(ReservaModel, client_fk):
-        qs = qs.filter(**{f"{client_fk}_id": cliente_id})
-
-    # -------- Filtros por estado --------
-    estado_field = _first_existing_field(
-        ReservaModel, ["estado", "status", "estado_reserva"]
-    )
     f = (request.GET.get("f") or "todas").lower()
-    if estado_field and f in {"confirmada", "pendiente", "cancelada", "completada"}:
-        qs = qs.filter(**{f"{estado_field}__iexact": f})
-
-    # Búsqueda por cliente
     q = (request.GET.get("q") or "").strip()
-    if q and _field_exists(ReservaModel, client_fk):
-        qs = qs.filter(
-            Q(**{f"{client_fk}__username__icontains": q})
-            | Q(**{f"{client_fk}__first_name__icontains": q})
-            | Q(**{f"{client_fk}__last_name__icontains": q})
-        )
+    qs = _reservas_filtradas(cliente_id, f, q)
+    estado_field = capacidades.de(ReservaModel).estado
 
-    # -------- Paginación --------
-    page = request.GET.get("page") or 1
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(page)
+    # -------- Paginación por cursor (sin OFFSET ni COUNT) --------
+    paginador = PaginadorKeyset(qs, ["-id"], 10, estimar_total=True)
+    page_obj = paginador.pagina(request.GET.get(PARAM_CURSOR), request.GET)
 
     filters = [
         ("todas", "Todas"),
@@ -319,8 +239,8 @@ def reservas_admin_list(request):
 
     contexto = {
         "reservas": page_obj.object_list,
+        "estados_reserva": capacidades.de(ReservaModel).opciones(estado_field),
         "page_obj": page_obj,
-        "paginator": paginator,
         "use_index_reserva": USE_INDEX_RESERVA,
         "f": f,
         "q": q,
@@ -331,17 +251,85 @@ def reservas_admin_list(request):
     return render(request, "administrador/reservas_list.html", contexto)
 
 
+@login_required
+def reservas_admin_estado_masivo(request):
+    """Cambia el estado de las reservas marcadas en el listado (un solo UPDATE)."""
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+    if request.method != "POST":
+        return redirect("administrador:reservas_list")
+
+    # Volvemos al listado con los mismos filtros (re-codificados)
+    volver = QueryDict(request.POST.get("volver") or "").urlencode()
+    destino = redirect(f"{reverse('administrador:reservas_list')}?{volver}")
+
+    cap = capacidades.de(ReservaModel)
+    ids = [i for i in request.POST.getlist("ids") if i.isdigit()]
+    nuevo = request.POST.get("nuevo_estado")
+    if not ids or nuevo not in {valor for valor, _ in cap.opciones(cap.estado)}:
+        messages.error(request, "Selecciona reservas y un estado válido.")
+        return destino
+
+    sin_cupo = []
+    if USE_INDEX_RESERVA:
+        # Ajusta contadores de cupos y disponibilidad si cruza "Cancelada"
+        resultado = transiciones.cambiar_estado(ids, nuevo)
+        cambiadas, sin_cupo = resultado.cambiadas, resultado.sin_cupo
+    else:
+        cambiadas = ReservaModel.objects.filter(pk__in=ids).update(**{cap.estado: nuevo})
+    messages.success(request, f"Reservas actualizadas: {cambiadas}.")
+    if sin_cupo:
+        messages.warning(
+            request,
+            f"No se reactivaron {len(sin_cupo)} reservas porque su clase está llena "
+            f"(#{', #'.join(map(str, sorted(sin_cupo)))}).",
+        )
+    return destino
+
+
+def _reservas_filtradas(cliente_id, f: str, q: str):
+    """Filtros del panel de reservas (`cliente`, `f`, `q`)."""
+    cap = capacidades.de(ReservaModel)
+    client_fk = cap.cliente
+
+    qs = ReservaModel.objects.all().order_by("-id")
+    relaciones = [rel for rel in (client_fk, "clase") if rel and cap.tiene(rel)]
+    if relaciones:
+        qs = qs.select_related(*relaciones)
+
+    # ---- FILTRO POR CLIENTE ----
+    if cliente_id and client_fk:
+        qs = qs.filter(**{f"{client_fk}_id": cliente_id})
+
+    # -------- Filtros por estado --------
+    if cap.estado and f in {"confirmada", "pendiente", "cancelada", "completada"}:
+        qs = qs.filter(**{f"{cap.estado}__iexact": f})
+
+    # Búsqueda por cliente
+    if q and client_fk:
+        qs = qs.filter(
+            Q(**{f"{client_fk}__username__icontains": q})
+            | Q(**{f"{client_fk}__first_name__icontains": q})
+            | Q(**{f"{client_fk}__last_name__icontains": q})
+        )
+    return qs
+
+
 @login_required
 def reserva_admin_cambiar_estado(request, reserva_id: int):
     if (resp := _forbidden_if_not_admin(request)) is not None:
         return resp
 
     reserva = get_object_or_404(ReservaModel, pk=reserva_id)
+    estado_anterior = getattr(reserva, "estado", None)
 
     if request.method == "POST":
         form = ReservaEstadoForm(request.POST, instance=reserva)
         if form.is_valid():
             form.save()
+            if USE_INDEX_RESERVA:
+                # Mantener el contador de cupos de la clase al (des)cancelar
+                cupos.sincronizar_cambio_estado(reserva, estado_anterior)
             messages.success(request, "Estado de la reserva actualizado.")
             return redirect("administrador:reservas_list")
         messages.error(
@@ -380,26 +368,11 @@ def admin_usuarios_list(request):
     sort_field = allowed.get(sort) or "id"
     if direction == "desc":
         sort_field = f"-{sort_field}"
+    orden = [sort_field] if sort_field.lstrip("-") == "id" else [sort_field, "id"]
 
-    qs = User.objects.all()
-
-    if q:
-        qs = qs.filter(
-            Q(username__icontains=q)
-            | Q(first_name__icontains=q)
-            | Q(last_name__icontains=q)
-            | Q(email__icontains=q)
-        )
-    if estado == "activos":
-        qs = qs.filter(is_active=True)
-    elif estado == "inactivos":
-        qs = qs.filter(is_active=False)
-
-    qs = qs.order_by(sort_field, "id")
-
-    paginator = Paginator(qs, 10)
-    page = request.GET.get("page") or 1
-    page_obj = paginator.get_page(page)
+    qs = _usuarios_filtrados(q, estado)
+    paginador = PaginadorKeyset(qs, orden, 10, estimar_total=True)
+    page_obj = paginador.pagina(request.GET.get(PARAM_CURSOR), request.GET)
 
     return render(
         request,
@@ -416,6 +389,24 @@ def admin_usuarios_list(request):
     )
 
 
+def _usuarios_filtrados(q: str, estado: str):
+    """Filtros del listado de usuarios (`q`, `estado`)."""
+    qs = User.objects.all()
+
+    if q:
+        qs = qs.filter(
+            Q(username__icontains=q)
+            | Q(first_name__icontains=q)
+            | Q(last_name__icontains=q)
+            | Q(email__icontains=q)
+        )
+    if estado == "activos":
+        qs = qs.filter(is_active=True)
+    elif estado == "inactivos":
+        qs = qs.filter(is_active=False)
+    return qs
+
+
 @login_required
 def admin_usuario_crear(request):
     if (resp := _forbidden_if_not_admin(request)) is not None:
@@ -434,6 +425,32 @@ def admin_usuario_crear(request):
     return render(request, "administrador/usuario_form_crear.html", {"form": form})
 
 
+@login_required
+def admin_usuarios_importar(request):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    if request.method == "POST":
+        form = ImportarUsuariosForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Miles de hashes no caben en una petición: corre en procesar_trabajos
+            trabajo = trabajos.encolar(
+                "importar_usuarios",
+                {
+                    "contenido": form.cleaned_data["contenido"],
+                    "formato": form.cleaned_data["formato"],
+                },
+                usuario=request.user,
+            )
+            messages.info(request, f"Importación encolada (trabajo #{trabajo.pk}).")
+            return redirect("administrador:trabajo_detalle", trabajo_id=trabajo.pk)
+        messages.error(request, "Revisa el formulario.")
+    else:
+        form = ImportarUsuariosForm()
+
+    return render(request, "administrador/usuarios_importar.html", {"form": form})
+
+
 @login_required
 def admin_usuario_editar(request, user_id: int):
     if (resp := _forbidden_if_not_admin(request)) is not None:
@@ -605,6 +622,10 @@ def horario_eliminar(request, bloque_id: int):
     return render(request, "administrador/horario_confirm_delete.html", {"bloque": bloque})
 
 
+# Filas mostradas en la vista previa de generación
+VISTA_PREVIA_MAX = 100
+
+
 @login_required
 def horarios_generar_clases(request):
     if (resp := _forbidden_if_not_admin(request)) is not None:
@@ -612,12 +633,17 @@ def horarios_generar_clases(request):
 
     default_desde = timezone.localdate()
     default_hasta = default_desde + timedelta(days=28)
+    plan = None
 
     if request.method == "POST":
         form = GenerarClasesForm(request.POST)
         if form.is_valid():
-            return _generar_clases_desde_bloques(request, form.cleaned_data)
-        messages.error(request, "Revisa el formulario.")
+            if form.cleaned_data.get("vista_previa"):
+                plan = _plan_desde_form(form.cleaned_data)
+            else:
+                return _encolar_generacion(request, form.cleaned_data)
+        else:
+            messages.error(request, "Revisa el formulario.")
     else:
         form = GenerarClasesForm(
             initial={
@@ -635,60 +661,157 @@ def horarios_generar_clases(request):
     return render(
         request,
         "administrador/horarios_generar_clases.html",
-        {"form": form, "activos_count": activos_count, "total_count": total_count},
+        {
+            "form": form,
+            "activos_count": activos_count,
+            "total_count": total_count,
+            "plan": plan,
+            "plan_muestra": plan.a_crear[:VISTA_PREVIA_MAX] if plan else [],
+            "vista_previa_max": VISTA_PREVIA_MAX,
+        },
     )
 
 
-def _generar_clases_desde_bloques(request, data):
-    d_ini: date = data["desde"]
-    d_fin: date = data["hasta"]
-    solo_activos = data.get("solo_activos", True)
-    ignorar_existentes = data.get("ignorar_existentes", True)
-    nombre_clase = (data.get("nombre_clase") or "Clase de Pilates").strip()
-    desc_form = (data.get("descripcion") or "").strip()
-
-    bloques = HorarioBloque.objects.all()
-    if solo_activos:
-        bloques = bloques.filter(activo=True)
-
-    created = 0
-    skipped = 0
-
-    cur = d_ini
-    while cur <= d_fin:
-        weekday = cur.weekday()
-        for b in bloques.filter(dia_semana=weekday):
-            exists = ClasePilates.objects.filter(
-                fecha=cur,
-                horario=b.hora_inicio,
-                nombre_instructor=(b.instructor or "").strip(),
-            ).exists()
-
-            if exists and ignorar_existentes:
-                skipped += 1
-                continue
-
-            if not exists:
-                cp = ClasePilates(
-                    nombre_clase=nombre_clase,
-                    fecha=cur,
-                    horario=b.hora_inicio,
-                    capacidad_maxima=b.capacidad,
-                    nombre_instructor=(b.instructor or "").strip(),
-                    descripcion=desc_form
-                    or f"Generada automáticamente desde bloque (instructor: {b.instructor or 'N/A'}).",
-                )
-                cp.save()
-                created += 1
-            else:
-                skipped += 1
-        cur += timedelta(days=1)
+def _plan_desde_form(data):
+    return generacion.planificar(
+        data["desde"],
+        data["hasta"],
+        solo_activos=data.get("solo_activos", True),
+        nombre_clase=data.get("nombre_clase") or "Clase de Pilates",
+        descripcion=data.get("descripcion") or "",
+    )
 
-    messages.success(
-        request,
-        f"Generación finalizada. Clases creadas: {created}. Saltadas/Existentes: {skipped}.",
+
+def _encolar_generacion(request, data):
+    # La generación de rangos largos corre en segundo plano (procesar_trabajos)
+    trabajo = trabajos.encolar(
+        "generar_clases",
+        {
+            "desde": data["desde"].isoformat(),
+            "hasta": data["hasta"].isoformat(),
+            "solo_activos": data.get("solo_activos", True),
+            "nombre_clase": data.get("nombre_clase") or "Clase de Pilates",
+            "descripcion": data.get("descripcion") or "",
+        },
+        usuario=request.user,
+    )
+    messages.info(request, f"Generación encolada (trabajo #{trabajo.pk}).")
+    return redirect("administrador:trabajo_detalle", trabajo_id=trabajo.pk)
+
+
+# ---- Trabajos en segundo plano ----
+@login_required
+def trabajo_detalle(request, trabajo_id: int):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    trabajo = get_object_or_404(
+        Trabajo.objects.select_related("solicitado_por"), pk=trabajo_id)
+    return render(request, "administrador/trabajo_detalle.html", {"trabajo": trabajo})
+
+
+@login_required
+def trabajo_progreso(request, trabajo_id: int):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    trabajo = get_object_or_404(Trabajo, pk=trabajo_id)
+    return JsonResponse(trabajos.resumen(trabajo))
+
+
+# ---- Métricas (Prometheus) ----
+@login_required
+def metricas_prometheus(request):
+    """Métricas de este proceso (administrador.metricas) en texto Prometheus."""
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    disp = disponibilidad.estadisticas()
+    parseo = traduccion.estadisticas()
+    intentos = limites.estadisticas()
+    landing = paginas.estadisticas()
+    extra = {
+        "pilates_disponibilidad_cache_hits_total": (
+            "counter", "Aciertos de la caché de disponibilidad.", disp["aciertos"]),
+        "pilates_disponibilidad_cache_misses_total": (
+            "counter", "Fallos de la caché de disponibilidad.", disp["fallos"]),
+        "pilates_pagina_cache_hits_total": (
+            "counter", "Páginas públicas servidas desde la caché.", landing["aciertos"]),
+        "pilates_pagina_cache_misses_total": (
+            "counter", "Páginas públicas renderizadas por no estar en caché.", landing["fallos"]),
+        "pilates_pagina_not_modified_total": (
+            "counter", "Páginas públicas respondidas con 304.", landing["no_modificadas"]),
+        "pilates_djongo_parse_cache_hits_total": (
+            "counter", "Aciertos de la caché de SQL parseado de djongo.", parseo["aciertos"]),
+        "pilates_djongo_parse_cache_misses_total": (
+            "counter", "Fallos de la caché de SQL parseado de djongo.", parseo["fallos"]),
+        "pilates_djongo_parse_cache_entries": (
+            "gauge", "Consultas en la caché de SQL parseado de djongo.", parseo["entradas"]),
+        "pilates_login_rejected_total": (
+            "counter", "Intentos de login rechazados por el límite.", intentos["rechazados_login"]),
+        "pilates_contacto_rejected_total": (
+            "counter", "Envíos de contacto rechazados por el límite.",
+            intentos["rechazados_contacto"]),
+        "pilates_password_checks_total": (
+            "counter", "Contraseñas verificadas en el login.", intentos["hash_verificaciones"]),
+        "pilates_password_hash_cpu_seconds_total": (
+            "counter", "CPU gastado verificando contraseñas en el login.",
+            f"{intentos['hash_segundos']:.6f}"),
+    }
+    return HttpResponse(
+        metricas.prometheus(extra),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# ---- Exportaciones CSV (streaming, mismos filtros que los listados) ----
+@login_required
+def exportar_reservas(request):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    qs = _reservas_filtradas(
+        request.GET.get("cliente"),
+        (request.GET.get("f") or "todas").lower(),
+        (request.GET.get("q") or "").strip(),
     )
-    return redirect("administrador:listar_clases")
+    return exportacion.respuesta_csv(
+        "reservas", qs, exportacion.columnas_reservas(ReservaModel))
+
+
+@login_required
+def exportar_clases(request):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    qs = ClasePilates.objects.order_by("fecha", "horario", "id")
+    return exportacion.respuesta_csv("clases", qs, exportacion.COLUMNAS_CLASES)
+
+
+@login_required
+def exportar_usuarios(request):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    qs = _usuarios_filtrados(
+        (request.GET.get("q") or "").strip(),
+        (request.GET.get("estado") or "todos").lower(),
+    ).order_by("id")
+    return exportacion.respuesta_csv(
+        "usuarios", qs, exportacion.columnas_usuarios(User))
+
+
+@login_required
+def exportar_contactos(request):
+    if (resp := _forbidden_if_not_admin(request)) is not None:
+        return resp
+
+    qs = _contactos_filtrados(
+        (request.GET.get("q") or "").strip(),
+        (request.GET.get("estado") or "todos").lower(),
+    ).order_by("-fecha_envio", "-id")
+    return exportacion.respuesta_csv(
+        "contactos", qs, exportacion.COLUMNAS_CONTACTOS)
 
 
 # ---- CRM Contactos rápido (si usas una vista simple en sidebar) ----
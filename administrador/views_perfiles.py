@@ -53,15 +53,6 @@ def _must_be_admin(request):
     return True
 
 
-def _first_existing_field(model, candidates):
-    # (No lo usamos en este archivo ahora, pero lo dejamos por si luego lo necesitas)
-    names = {f.name for f in model._meta.get_fields()}
-    for c in candidates:
-        if c in names:
-            return c
-    return None
-
-
 # -------------------- CRUD Perfiles --------------------
 @login_required
 def perfiles_list(request):
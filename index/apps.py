@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class IndexConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'index'
+
+    def ready(self):
+        from django.db import connection
+
+        from . import signals  # noqa: F401  (registra receptores)
+        from . import traduccion
+
+        if connection.vendor == "djongo":
+            traduccion.instalar()
@@ -0,0 +1,88 @@
+# index/catalogo.py
+"""
+Servicio de consulta del catálogo de clases (vistas en tarjetas).
+
+Centraliza filtros + paginación y calcula la ocupación SOLO de las clases
+de la página actual, así el costo depende del tamaño de página y no de
+cuántas reservas existan en la historia del estudio. La ocupación se lee de
+la caché de disponibilidad; solo las clases sin entrada vigente van a la BD.
+"""
+from django.db.models import Q
+from django.utils.timezone import now
+
+from administrador.models import ClasePilates
+
+from . import disponibilidad
+from .paginacion import PARAM_CURSOR, PaginadorKeyset
+
+POR_PAGINA = 12
+ORDEN = ["fecha", "horario", "id"]
+
+
+class TarjetaClase:
+    """Clase lista para renderizar en una tarjeta del catálogo."""
+
+    __slots__ = ("obj", "reservados", "libres", "version")
+
+    def __init__(self, obj: ClasePilates, reservados: int, version=None):
+        self.obj = obj
+        self.reservados = reservados
+        self.libres = max((obj.capacidad_maxima or 0) - reservados, 0)
+        # Versión de la clase en index.disponibilidad: clave del fragmento
+        # {% cache %} de la tarjeta (cambia al editar la clase o sus reservas)
+        self.version = version
+
+    @property
+    def id(self):
+        return self.obj.id
+
+
+def filtrar_clases(q: str = "", desde: str = "", hasta: str = ""):
+    """Clases futuras (o desde `desde`) con búsqueda libre y tope `hasta`."""
+    qs = ClasePilates.objects.all().order_by(*ORDEN)
+    qs = qs.filter(fecha__gte=desde or now().date())
+    if hasta:
+        qs = qs.filter(fecha__lte=hasta)
+    if q:
+        qs = qs.filter(
+            Q(nombre_clase__icontains=q)
+            | Q(descripcion__icontains=q)
+            | Q(nombre_instructor__icontains=q)
+        )
+    return qs
+
+
+def tarjetas(clases) -> list:
+    """Tarjetas con ocupación y versión desde index.disponibilidad."""
+    clases = list(clases)
+    # Las filas salen de la consulta de la página: traen el contador al día
+    disp = disponibilidad.obtener_muchas(clases, frescas=True)
+    tarjetas = []
+    for c in clases:
+        d = disp.get(c.id)
+        tarjetas.append(TarjetaClase(
+            c, d.tomados if d else c.cupos_ocupados, d.version if d else None))
+    return tarjetas
+
+
+def contexto_catalogo(request, reserve_url_name: str, por_pagina: int = POR_PAGINA) -> dict:
+    """
+    Contexto común de las vistas de catálogo (template index/clases_grid.html).
+    `page_obj.object_list` contiene TarjetaClase en vez de ClasePilates.
+    """
+    q = (request.GET.get("q") or "").strip()
+    desde = request.GET.get("desde") or ""
+    hasta = request.GET.get("hasta") or ""
+
+    paginador = PaginadorKeyset(
+        filtrar_clases(q, desde, hasta), ORDEN, por_pagina)
+    page_obj = paginador.pagina(request.GET.get(PARAM_CURSOR), request.GET)
+    page_obj.object_list = tarjetas(page_obj.object_list)
+
+    return {
+        "page_obj": page_obj,
+        "q": q,
+        "desde": desde,
+        "hasta": hasta,
+        "reserve_url_name": reserve_url_name,
+    }
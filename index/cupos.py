@@ -0,0 +1,202 @@
+# index/cupos.py
+"""
+Motor de cupos para reservas de clases.
+
+Mantiene el contador desnormalizado ``ClasePilates.cupos_ocupados`` y toma o
+libera un cupo con UNA sola operación atómica condicionada a la capacidad:
+
+  - Mongo (djongo): ``find_one_and_update`` con ``$inc`` y filtro ``$expr``.
+  - SQL: ``UPDATE ... SET cupos_ocupados = cupos_ocupados + 1
+         WHERE id = %s AND cupos_ocupados < capacidad_maxima``.
+
+Así una ráfaga de clientes no puede sobrevender la clase y reservar ya no
+necesita contar todas las reservas de la clase.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+
+from administrador.models import ClasePilates
+
+from . import disponibilidad, resumen
+from .models import Reserva
+
+# Resultados posibles de reservar()
+RESERVA_CREADA = "creada"
+SIN_CUPO = "sin_cupo"
+YA_RESERVADA = "ya_reservada"
+
+ESTADO_CANCELADA = "Cancelada"
+
+
+def _es_mongo() -> bool:
+    return connection.vendor == "djongo"
+
+
+def _coleccion_clases():
+    """Colección Mongo de ClasePilates (solo con djongo)."""
+    connection.ensure_connection()
+    return connection.connection[ClasePilates._meta.db_table]
+
+
+# ----------------------- Operaciones atómicas -----------------------
+def tomar_cupo(clase_id: int, respetar_capacidad: bool = True) -> bool:
+    """
+    Incrementa el contador de la clase si queda cupo.
+    Devuelve True si se tomó el cupo, False si la clase está llena (o no existe).
+    """
+    if _es_mongo():
+        filtro = {"id": clase_id}
+        if respetar_capacidad:
+            filtro["$expr"] = {"$lt": ["$cupos_ocupados", "$capacidad_maxima"]}
+        doc = _coleccion_clases().find_one_and_update(
+            filtro, {"$inc": {"cupos_ocupados": 1}}
+        )
+        return doc is not None
+
+    qs = ClasePilates.objects.filter(pk=clase_id)
+    if respetar_capacidad:
+        qs = qs.filter(cupos_ocupados__lt=F("capacidad_maxima"))
+    return qs.update(cupos_ocupados=F("cupos_ocupados") + 1) == 1
+
+
+def liberar_cupo(clase_id: int, cantidad: int = 1) -> bool:
+    """
+    Resta `cantidad` al contador de la clase (nunca por debajo de 0).
+    Devuelve False si el contador era menor que `cantidad` (queda en 0).
+    """
+    if _es_mongo():
+        coleccion = _coleccion_clases()
+        doc = coleccion.find_one_and_update(
+            {"id": clase_id, "cupos_ocupados": {"$gte": cantidad}},
+            {"$inc": {"cupos_ocupados": -cantidad}},
+        )
+        if doc is None and cantidad > 1:
+            coleccion.update_one(
+                {"id": clase_id, "cupos_ocupados": {"$lt": cantidad}},
+                {"$set": {"cupos_ocupados": 0}},
+            )
+        return doc is not None
+
+    liberados = (
+        ClasePilates.objects.filter(pk=clase_id, cupos_ocupados__gte=cantidad)
+        .update(cupos_ocupados=F("cupos_ocupados") - cantidad)
+        == 1
+    )
+    if not liberados and cantidad > 1:
+        # Contador ya desfasado (menor que lo que se libera): se deja en 0
+        ClasePilates.objects.filter(pk=clase_id, cupos_ocupados__lt=cantidad).update(
+            cupos_ocupados=0)
+    return liberados
+
+
+# ----------------------- Flujo de reserva / cancelación -----------------------
+def reservar(usuario, clase: ClasePilates, **campos):
+    """
+    Reserva un cupo de `clase` para `usuario`.
+
+    Devuelve una tupla (resultado, reserva) donde resultado es RESERVA_CREADA,
+    SIN_CUPO o YA_RESERVADA. `campos` se usa al crear la Reserva
+    (tipo, fecha, inicio, fin...).
+    """
+    previa = Reserva.objects.filter(user=usuario, clase=clase).first()
+    if previa is not None and previa.estado != ESTADO_CANCELADA:
+        return YA_RESERVADA, previa
+
+    if not tomar_cupo(clase.pk):
+        return SIN_CUPO, None
+
+    try:
+        with transaction.atomic():
+            if previa is not None:
+                # La restricción única (user, clase) impide crear otra fila:
+                # se reactiva la reserva cancelada.
+                reactivada = Reserva.objects.filter(
+                    pk=previa.pk, estado=ESTADO_CANCELADA
+                ).update(estado="Confirmada")
+                if not reactivada:
+                    liberar_cupo(clase.pk)
+                    return YA_RESERVADA, previa
+                previa.estado = "Confirmada"
+                reserva = previa
+            else:
+                reserva = Reserva.objects.create(
+                    user=usuario, clase=clase, estado="Confirmada", **campos
+                )
+    except IntegrityError:
+        # Otra petición del mismo usuario ganó la carrera.
+        liberar_cupo(clase.pk)
+        return YA_RESERVADA, None
+    except Exception:
+        liberar_cupo(clase.pk)
+        raise
+
+    # update() no dispara señales: invalidamos las cachés a mano
+    disponibilidad.invalidar(clase.pk)
+    resumen.invalidar(usuario.pk)
+    return RESERVA_CREADA, reserva
+
+
+def cancelar(reserva: Reserva) -> bool:
+    """
+    Cancela la reserva y libera su cupo.
+    Devuelve False si ya estaba cancelada (no se libera nada dos veces).
+    """
+    cambiadas = (
+        Reserva.objects.filter(pk=reserva.pk)
+        .exclude(estado=ESTADO_CANCELADA)
+        .update(estado=ESTADO_CANCELADA)
+    )
+    if not cambiadas:
+        return False
+
+    reserva.estado = ESTADO_CANCELADA
+    resumen.invalidar(reserva.user_id)
+    if reserva.clase_id:
+        liberar_cupo(reserva.clase_id)
+        disponibilidad.invalidar(reserva.clase_id)
+    return True
+
+
+def sincronizar_cambio_estado(reserva: Reserva, estado_anterior: str) -> None:
+    """
+    Ajusta el contador tras un cambio de estado hecho fuera del motor
+    (p. ej. el formulario de estado del panel de administración).
+    """
+    if not reserva.clase_id or estado_anterior == reserva.estado:
+        return
+    if reserva.estado == ESTADO_CANCELADA:
+        liberar_cupo(reserva.clase_id)
+    elif estado_anterior == ESTADO_CANCELADA:
+        # El admin puede reactivar aunque la clase esté llena.
+        tomar_cupo(reserva.clase_id, respetar_capacidad=False)
+
+
+# ----------------------- Reparación -----------------------
+def recalcular_cupos(clase_ids=None) -> int:
+    """
+    Reconstruye cupos_ocupados desde Reserva (fuente de verdad).
+    Si `clase_ids` es None recalcula todas las clases.
+
+    Es una reparación (comando ``recalcular_cupos``, migraciones): cuenta y
+    luego escribe, así que un cupo tomado entre medio se pierde. Los caminos
+    en caliente ajustan el contador con deltas (tomar_cupo/liberar_cupo).
+    Devuelve cuántas clases quedaron con reservas activas.
+    """
+    clases = ClasePilates.objects.all()
+    reservas = Reserva.objects.filter(clase__isnull=False).exclude(
+        estado=ESTADO_CANCELADA
+    )
+    if clase_ids is not None:
+        clases = clases.filter(pk__in=clase_ids)
+        reservas = reservas.filter(clase_id__in=clase_ids)
+
+    conteos = {
+        r["clase_id"]: r["cnt"]
+        for r in reservas.values("clase_id").annotate(cnt=Count("id"))
+    }
+
+    with transaction.atomic():
+        clases.update(cupos_ocupados=0)
+        for clase_id, cnt in conteos.items():
+            ClasePilates.objects.filter(pk=clase_id).update(cupos_ocupados=cnt)
+    return len(conteos)
@@ -0,0 +1,158 @@
+# index/disponibilidad.py
+"""
+Caché de disponibilidad por clase (capacidad, cupos tomados y libres).
+
+Cada clase tiene una clave de versión en caché; las entradas se guardan bajo
+``disp:<clase_id>:<version>``. Las señales post_save/post_delete de Reserva y
+ClasePilates (index.signals) y el motor de cupos incrementan la versión, así
+una entrada vieja nunca se vuelve a leer y no hace falta borrarla.
+
+Los datos salen del contador ClasePilates.cupos_ocupados que mantiene
+index.cupos, no de contar reservas. Con ``frescas=True`` (filas recién
+leídas, como la página del catálogo) se usan tal cual; si no, en un fallo se
+releen por clave primaria.
+
+Funciona con cualquier backend de caché de Django (locmem o archivos), sin
+servicios externos. Ver DISPONIBILIDAD_CACHE en settings.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from administrador.models import ClasePilates
+
+TTL = 60 * 10
+
+_lock = threading.Lock()
+_contadores = {"aciertos": 0, "fallos": 0}
+
+
+class Disponibilidad:
+    # version: la de la clase en la caché; sirve de clave para fragmentos de
+    # plantilla que dependen de la clase (tarjetas del catálogo)
+    __slots__ = ("capacidad", "tomados", "libres", "version")
+
+    def __init__(self, capacidad: int, tomados: int, version=None):
+        self.capacidad = capacidad or 0
+        self.tomados = tomados or 0
+        self.libres = max(self.capacidad - self.tomados, 0)
+        self.version = version
+
+    def __repr__(self):
+        return f"Disponibilidad({self.capacidad}, {self.tomados})"
+
+
+def _cache():
+    return caches[getattr(settings, "DISPONIBILIDAD_CACHE", "default")]
+
+
+def _clave_version(clase_id) -> str:
+    return f"disp:v:{clase_id}"
+
+
+def _clave(clase_id, version) -> str:
+    return f"disp:{clase_id}:{version}"
+
+
+def _contar(aciertos: int = 0, fallos: int = 0) -> None:
+    with _lock:
+        _contadores["aciertos"] += aciertos
+        _contadores["fallos"] += fallos
+
+
+def estadisticas() -> dict:
+    """Aciertos/fallos acumulados en este proceso."""
+    with _lock:
+        return dict(_contadores)
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _contadores["aciertos"] = 0
+        _contadores["fallos"] = 0
+
+
+# ----------------------- Versionado -----------------------
+def _nueva_version() -> int:
+    # Basada en el reloj: si la clave de versión se pierde (expulsión de la
+    # caché, reinicio) la nueva versión no coincide con entradas antiguas.
+    return time.time_ns()
+
+
+def invalidar(clase_id) -> None:
+    """Incrementa la versión de la clase: sus entradas quedan obsoletas."""
+    if not clase_id:
+        return
+    cache = _cache()
+    try:
+        cache.incr(_clave_version(clase_id))
+    except ValueError:
+        cache.set(_clave_version(clase_id), _nueva_version(), None)
+
+
+def _versiones(ids) -> dict:
+    cache = _cache()
+    claves = {_clave_version(i): i for i in ids}
+    encontradas = cache.get_many(list(claves))
+    versiones = {claves[k]: v for k, v in encontradas.items()}
+
+    faltantes = [i for i in ids if i not in versiones]
+    if faltantes:
+        nuevas = {i: _nueva_version() for i in faltantes}
+        cache.set_many({_clave_version(i): v for i, v in nuevas.items()}, None)
+        versiones.update(nuevas)
+    return versiones
+
+
+# ----------------------- Lectura -----------------------
+def obtener_muchas(clases, frescas: bool = False) -> dict:
+    """
+    {clase_id: Disponibilidad} para las clases dadas.
+
+    frescas=True: las instancias se acaban de leer (ya traen capacidad y
+    contador); no se consulta la BD ni se guardan entradas, que podrían
+    fijar bajo una versión nueva un valor leído antes de la invalidación.
+    Si no, solo se consulta por las clases sin entrada vigente, con una
+    lectura por clave primaria; una clase borrada entretanto no aparece.
+    """
+    clases = {c.id: c for c in clases}
+    if not clases:
+        return {}
+
+    versiones = _versiones(list(clases))
+    if frescas:
+        return {
+            i: Disponibilidad(c.capacidad_maxima, c.cupos_ocupados, versiones[i])
+            for i, c in clases.items()
+        }
+
+    cache = _cache()
+    claves = {_clave(i, versiones[i]): i for i in clases}
+    en_cache = cache.get_many(list(claves))
+
+    resultado = {}
+    for clave, (capacidad, tomados) in en_cache.items():
+        clase_id = claves[clave]
+        resultado[clase_id] = Disponibilidad(capacidad, tomados, versiones[clase_id])
+
+    faltantes = [i for i in clases if i not in resultado]
+    _contar(aciertos=len(resultado), fallos=len(faltantes))
+
+    if faltantes:
+        # Se relee la fila: la instancia recibida puede ser anterior a la
+        # última reserva
+        filas = ClasePilates.objects.filter(pk__in=faltantes).values_list(
+            "id", "capacidad_maxima", "cupos_ocupados")
+        nuevas = {}
+        for i, capacidad, tomados in filas:
+            resultado[i] = Disponibilidad(capacidad, tomados, versiones[i])
+            nuevas[_clave(i, versiones[i])] = (capacidad, tomados)
+        cache.set_many(nuevas, TTL)
+
+    return resultado
+
+
+def obtener(clase) -> Disponibilidad:
+    return obtener_muchas([clase])[clase.id]
@@ -0,0 +1,75 @@
+# index/management/commands/benchmark_traduccion.py
+import re
+import time
+
+import sqlparse
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from administrador.models import ClasePilates
+from index import traduccion
+from index.catalogo import ORDEN, filtrar_clases
+from index.models import Reserva
+from index.paginacion import PaginadorKeyset
+
+
+def _formas_calientes():
+    """Ejecuta las consultas calientes una vez y captura su SQL con marcadores."""
+    capturadas = []
+
+    def capturar(execute, sql, params, many, context):
+        capturadas.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capturar):
+        Reserva.cupos_tomados(ClasePilates(pk=1))
+        PaginadorKeyset(filtrar_clases("mat", "", ""), ORDEN, 12).pagina()
+        # "Mis reservas" sin LECTURAS_NATIVAS
+        list(Reserva.objects.filter(user_id=1).order_by("fecha", "inicio"))
+        get_user_model().objects.filter(username="benchmark").first()
+
+    # Igual que djongo: %s -> %(n)s antes de parsear
+    formas = []
+    for sql in capturadas:
+        contador = iter(range(10_000))
+        formas.append(re.sub(r"%s", lambda _m: f"%({next(contador)})s", sql))
+    return formas
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark del parseo SQL de djongo (sqlparse) con y sin la "
+        "caché de index.traduccion para las consultas calientes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticiones", type=int, default=500)
+
+    def _medir(self, parse, formas, repeticiones):
+        inicio = time.process_time()
+        for _ in range(repeticiones):
+            for sql in formas:
+                parse(sql)
+        return time.process_time() - inicio
+
+    def handle(self, *args, **options):
+        repeticiones = max(1, options["repeticiones"])
+        formas = _formas_calientes()
+        n = repeticiones * len(formas)
+
+        sin_cache = self._medir(sqlparse.parse, formas, repeticiones)
+        cacheado = traduccion.envolver(sqlparse.parse, traduccion.CacheLRU())
+        con_cache = self._medir(cacheado, formas, repeticiones)
+
+        por_consulta_sin = sin_cache / n * 1e6
+        por_consulta_con = con_cache / n * 1e6
+        self.stdout.write(f"Formas de consulta: {len(formas)} x {repeticiones} repeticiones")
+        self.stdout.write(f"Sin caché:  {por_consulta_sin:9.1f} µs CPU/consulta")
+        self.stdout.write(f"Con caché:  {por_consulta_con:9.1f} µs CPU/consulta")
+        self.stdout.write(
+            f"Ahorro:     {por_consulta_sin - por_consulta_con:9.1f} µs CPU/consulta "
+            f"(tasa de aciertos {cacheado.cache.estadisticas()['tasa_aciertos']:.1%})"
+        )
+        if connection.vendor == "djongo":
+            self.stdout.write(f"Caché instalada en djongo: {traduccion.estadisticas()}")
@@ -0,0 +1,32 @@
+# index/management/commands/calentar_paginas.py
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from index import paginas
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalida la caché de páginas públicas (index.paginas) y vuelve a "
+        "renderizar el landing como visitante anónimo. Pensado para el deploy."
+    )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, "PAGINAS_CACHE_ACTIVA", True):
+            self.stdout.write(self.style.WARNING("PAGINAS_CACHE_ACTIVA = False: nada que hacer."))
+            return
+
+        resultado = paginas.calentar()
+        fallidas = [n for n, (estado, _) in resultado.items() if estado != 200]
+        for nombre, (estado, tamano) in resultado.items():
+            self.stdout.write(f"  {nombre:<16}{estado:>5}{tamano:>9} bytes")
+
+        if isinstance(caches[getattr(settings, "PAGINAS_CACHE", "default")], LocMemCache):
+            self.stdout.write(self.style.WARNING(
+                "La caché PAGINAS_CACHE es locmem (por proceso): los workers no ven "
+                "estas páginas; solo se verificó que rendericen."))
+        if fallidas:
+            raise CommandError(f"Páginas con error: {', '.join(fallidas)}")
+        self.stdout.write(self.style.SUCCESS(f"{len(resultado)} páginas renderizadas."))
@@ -0,0 +1,35 @@
+# index/management/commands/completar_reservas.py
+from django.core.management.base import BaseCommand
+
+from index import transiciones
+
+
+class Command(BaseCommand):
+    help = (
+        "Marca como 'Completada' las reservas 'Confirmada' de días anteriores, "
+        "por lotes. Pensado para ejecutarse a diario (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=transiciones.TAMANO_LOTE,
+            help=f"Reservas por UPDATE (por defecto {transiciones.TAMANO_LOTE}).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", dest="dry_run",
+            help="Solo informa cuántas reservas se completarían.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            total = transiciones.vencidas().count()
+            self.stdout.write(f"Reservas a completar: {total}.")
+            return
+
+        def avance(hechas):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  ... {hechas} completadas")
+
+        total = transiciones.completar_vencidas(
+            tamano_lote=max(1, options["lote"]), al_avanzar=avance)
+        self.stdout.write(self.style.SUCCESS(f"Reservas completadas: {total}."))
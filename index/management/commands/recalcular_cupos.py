@@ -0,0 +1,31 @@
+# index/management/commands/recalcular_cupos.py
+from django.core.management.base import BaseCommand
+
+from index import cupos
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el contador ClasePilates.cupos_ocupados a partir de las "
+        "reservas no canceladas (index.Reserva)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clase",
+            type=int,
+            action="append",
+            dest="clases",
+            help="ID de clase a recalcular (repetible). Por defecto, todas.",
+        )
+
+    def handle(self, *args, **options):
+        clase_ids = options.get("clases")
+        con_reservas = cupos.recalcular_cupos(clase_ids)
+        alcance = f"{len(clase_ids)} clase(s)" if clase_ids else "todas las clases"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cupos recalculados para {alcance}. "
+                f"Clases con reservas activas: {con_reservas}."
+            )
+        )
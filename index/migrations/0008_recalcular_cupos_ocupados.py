@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def recalcular_cupos(apps, schema_editor):
+    """Rellena ClasePilates.cupos_ocupados a partir de las reservas existentes."""
+    ClasePilates = apps.get_model('administrador', 'ClasePilates')
+    Reserva = apps.get_model('index', 'Reserva')
+
+    conteos = (
+        Reserva.objects.filter(clase__isnull=False)
+        .exclude(estado='Cancelada')
+        .values('clase_id')
+        .annotate(cnt=Count('id'))
+    )
+    for fila in conteos:
+        ClasePilates.objects.filter(pk=fila['clase_id']).update(
+            cupos_ocupados=fila['cnt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administrador', '0005_clasepilates_cupos_ocupados'),
+        ('index', '0007_auto_20250901_2338'),
+    ]
+
+    operations = [
+        migrations.RunPython(recalcular_cupos, migrations.RunPython.noop),
+    ]
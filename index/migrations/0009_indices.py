@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Índices ascendentes y sin condición: djongo los traduce a create_index.
+    # `id` en los de Contacto: el orden (-fecha_envio, -id) del CRM y del
+    # dashboard se resuelve con el índice también en Mongo
+
+    dependencies = [
+        ('index', '0008_recalcular_cupos_ocupados'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['clase', 'estado'], name='reserva_clase_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['user', 'fecha', 'inicio'], name='reserva_user_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contacto',
+            index=models.Index(fields=['estado_mensaje', 'fecha_envio', 'id'], name='contacto_estado_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contacto',
+            index=models.Index(fields=['fecha_envio', 'id'], name='contacto_fecha_id_idx'),
+        ),
+    ]
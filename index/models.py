@@ -50,6 +50,12 @@ class Reserva(models.Model):
                 fields=["user", "clase"], name="uniq_reserva_usuario_misma_clase"
             )
         ]
+        indexes = [
+            # Cupos de una clase: clase_id = X AND estado != 'Cancelada'
+            models.Index(fields=["clase", "estado"], name="reserva_clase_estado_idx"),
+            # "Mis reservas": user_id = X ordenado por fecha, inicio
+            models.Index(fields=["user", "fecha", "inicio"], name="reserva_user_fecha_idx"),
+        ]
 
     def __str__(self):
         base = f"{self.user} - {self.tipo} - {self.fecha} {self.inicio}"
@@ -87,5 +93,16 @@ class Contacto(models.Model):
     )
     comentario = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # CRM: filtro por estado, más recientes primero. `id` desempata el
+            # orden (-fecha_envio, -id) del paginador: sin él Mongo ordena en
+            # memoria
+            models.Index(fields=["estado_mensaje", "fecha_envio", "id"],
+                         name="contacto_estado_fecha_id_idx"),
+            # Dashboard y CRM sin filtro: últimos mensajes
+            models.Index(fields=["fecha_envio", "id"], name="contacto_fecha_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.nombre} - {self.correo}"
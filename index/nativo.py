@@ -0,0 +1,98 @@
+# index/nativo.py
+"""
+Lecturas calientes directo sobre pymongo (opcional).
+
+Con djongo cada consulta del ORM se genera como SQL, se vuelve a parsear con
+sqlparse y se traduce a Mongo. Para las lecturas más frecuentes este módulo
+arma el pipeline a mano y lo ejecuta sobre la base que djongo ya tiene
+abierta (mismo MongoClient, sin conexiones nuevas):
+
+  - indicadores():           contadores del dashboard (IndicadorKPI)
+  - reservas_de_usuario():   filas de "Mis reservas"
+
+Se activa con ``LECTURAS_NATIVAS = True`` en settings y solo con djongo; en
+otro caso los llamadores usan el ORM. Los resultados son filas livianas
+(FilaReserva) o dicts, no instancias de modelo.
+
+El catálogo no necesita lectura nativa: la ocupación sale del contador
+ClasePilates.cupos_ocupados que ya trae la consulta de la página (ver
+index.disponibilidad).
+
+Formato de djongo que hay que respetar: DateField se guarda como datetime a
+medianoche, TimeField como datetime del 1900-01-01 y las FK como ``<campo>_id``.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import connection
+
+from administrador.models import IndicadorKPI
+
+from .models import Reserva
+
+def activo() -> bool:
+    return bool(getattr(settings, "LECTURAS_NATIVAS", False)) and (
+        connection.vendor == "djongo"
+    )
+
+
+def _db(db=None):
+    """Base pymongo de djongo (o la indicada, p. ej. mongomock en tests)."""
+    if db is not None:
+        return db
+    connection.ensure_connection()
+    return connection.connection
+
+
+# ----------------------- Conversión de tipos djongo -----------------------
+def a_fecha(valor):
+    return valor.date() if isinstance(valor, datetime.datetime) else valor
+
+
+def a_hora(valor):
+    return valor.time() if isinstance(valor, datetime.datetime) else valor
+
+
+class FilaReserva:
+    """Fila de reserva sin instanciar el modelo (solo lo que usan las vistas)."""
+
+    __slots__ = ("id", "user_id", "clase_id", "tipo", "fecha", "inicio", "fin", "estado")
+
+    def __init__(self, doc):
+        self.id = doc.get("id")
+        self.user_id = doc.get("user_id")
+        self.clase_id = doc.get("clase_id")
+        self.tipo = doc.get("tipo")
+        self.fecha = a_fecha(doc.get("fecha"))
+        self.inicio = a_hora(doc.get("inicio"))
+        self.fin = a_hora(doc.get("fin"))
+        self.estado = doc.get("estado")
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __repr__(self):
+        return f"FilaReserva({self.id}, {self.fecha}, {self.estado})"
+
+
+# ----------------------- Lecturas -----------------------
+def indicadores(claves, db=None) -> dict:
+    """{clave: valor} de IndicadorKPI para las claves pedidas (sin sembrar)."""
+    pipeline = [
+        {"$match": {"clave": {"$in": list(claves)}}},
+        {"$project": {"_id": 0, "clave": 1, "valor": 1}},
+    ]
+    coleccion = _db(db)[IndicadorKPI._meta.db_table]
+    return {d["clave"]: d["valor"] for d in coleccion.aggregate(pipeline)}
+
+
+def reservas_de_usuario(user_id, db=None) -> list:
+    """Reservas del usuario ordenadas por fecha e inicio, como FilaReserva."""
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"fecha": 1, "inicio": 1, "id": 1}},
+        {"$project": {"_id": 0, **{c: 1 for c in FilaReserva.__slots__}}},
+    ]
+    coleccion = _db(db)[Reserva._meta.db_table]
+    return [FilaReserva(d) for d in coleccion.aggregate(pipeline)]
@@ -0,0 +1,196 @@
+# index/paginacion.py
+"""
+Paginación por keyset ("seek") reutilizable para listados grandes.
+
+En vez de OFFSET + COUNT (caros en djongo/Mongo a medida que crecen las
+colecciones), cada página se pide con un filtro sobre la clave de orden de
+la última fila vista:
+
+    WHERE (fecha, horario, id) > (:fecha, :horario, :id)  ORDER BY ... LIMIT n+1
+
+así la página 500 cuesta lo mismo que la página 1. El cursor es opaco
+(firmado con django.core.signing) y el total es solo un estimado opcional.
+
+Uso:
+    paginador = PaginadorKeyset(qs, ["fecha", "horario", "id"], 12)
+    page_obj = paginador.pagina(request.GET.get("cursor"), request.GET)
+"""
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.db import connections
+from django.db.models import Q
+
+SALT = "index.paginacion"
+PARAM_CURSOR = "cursor"
+
+
+class PaginaKeyset:
+    """Página de resultados; expone lo mínimo que usan los templates."""
+
+    def __init__(self, object_list, has_next, has_previous,
+                 cursor_siguiente, cursor_anterior, params, total_estimado=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+        self.total_estimado = total_estimado
+        self._params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _url(self, cursor):
+        params = [(k, v) for k, v in self._params if k != PARAM_CURSOR]
+        params.append((PARAM_CURSOR, cursor))
+        return "?" + urlencode(params)
+
+    @property
+    def url_siguiente(self):
+        return self._url(self.cursor_siguiente) if self.has_next else ""
+
+    @property
+    def url_anterior(self):
+        return self._url(self.cursor_anterior) if self.has_previous else ""
+
+
+class PaginadorKeyset:
+    """
+    `orden` es la lista de campos del ORDER BY (prefijo "-" = descendente).
+    Debe terminar en un campo único (normalmente "id") y sus campos no deben
+    ser nulos. Se admiten direcciones mixtas, p. ej. ["-first_name", "id"].
+    """
+
+    def __init__(self, queryset, orden, por_pagina: int, estimar_total: bool = False):
+        self.queryset = queryset
+        self.orden = list(orden)
+        self.por_pagina = por_pagina
+        self.estimar_total = estimar_total
+
+        opts = queryset.model._meta
+        self._campos = []
+        for item in self.orden:
+            nombre = item.lstrip("-")
+            campo = opts.pk if nombre == "pk" else opts.get_field(nombre)
+            self._campos.append((campo.attname, item.startswith("-"), campo))
+
+    # ---- cursores ----
+    def _clave(self, obj):
+        return [getattr(obj, attname) for attname, _desc, _campo in self._campos]
+
+    def _codificar(self, valores, direccion):
+        return signing.dumps(
+            {
+                "o": self.orden,
+                "d": direccion,
+                "v": [None if v is None else str(v) for v in valores],
+            },
+            salt=SALT,
+            compress=True,
+        )
+
+    def _decodificar(self, cursor):
+        """Devuelve (direccion, valores) o None si el cursor no sirve."""
+        if not cursor:
+            return None
+        try:
+            data = signing.loads(cursor, salt=SALT)
+            if data["o"] != self.orden or data["d"] not in ("n", "p"):
+                return None
+            valores = [
+                campo.to_python(v)
+                for v, (_a, _d, campo) in zip(data["v"], self._campos)
+            ]
+        except Exception:
+            # Cursor manipulado, viejo o de otro orden: volvemos al inicio
+            return None
+        if len(valores) != len(self._campos):
+            return None
+        return data["d"], valores
+
+    # ---- consulta ----
+    def _filtro_despues(self, valores, hacia_atras: bool) -> Q:
+        """(c1, c2, ...) > (v1, v2, ...) respetando la dirección de cada campo."""
+        filtro = Q()
+        iguales = {}
+        for (attname, desc, _campo), valor in zip(self._campos, valores):
+            mayor = desc == hacia_atras  # asc hacia adelante -> __gt
+            op = "gt" if mayor else "lt"
+            filtro |= Q(**iguales, **{f"{attname}__{op}": valor})
+            iguales[attname] = valor
+        return filtro
+
+    def _orden_invertido(self):
+        return [o[1:] if o.startswith("-") else f"-{o}" for o in self.orden]
+
+    def pagina(self, cursor=None, params=None) -> PaginaKeyset:
+        # params: request.GET (QueryDict) o dict, para armar los enlaces
+        if hasattr(params, "lists"):
+            params = [(k, v) for k, vs in params.lists() for v in vs]
+        else:
+            params = list((params or {}).items())
+
+        decodificado = self._decodificar(cursor)
+        hacia_atras = bool(decodificado and decodificado[0] == "p")
+
+        qs = self.queryset
+        if decodificado:
+            qs = qs.filter(self._filtro_despues(decodificado[1], hacia_atras))
+        qs = qs.order_by(*(self._orden_invertido() if hacia_atras else self.orden))
+
+        filas = list(qs[: self.por_pagina + 1])
+        hay_mas = len(filas) > self.por_pagina
+        filas = filas[: self.por_pagina]
+        if hacia_atras:
+            filas.reverse()
+            has_next, has_previous = True, hay_mas
+        else:
+            has_next, has_previous = hay_mas, decodificado is not None
+
+        cursor_siguiente = cursor_anterior = None
+        if filas:
+            cursor_siguiente = self._codificar(self._clave(filas[-1]), "n")
+            cursor_anterior = self._codificar(self._clave(filas[0]), "p")
+        else:
+            has_next = has_previous = False
+
+        total = total_estimado(self.queryset) if self.estimar_total else None
+        return PaginaKeyset(
+            filas, has_next, has_previous, cursor_siguiente, cursor_anterior,
+            params, total,
+        )
+
+
+def total_estimado(queryset):
+    """
+    Total aproximado sin COUNT cuando el backend lo permite:
+      - djongo: estimated_document_count() (metadatos de la colección)
+      - PostgreSQL: pg_class.reltuples
+    Solo para querysets sin filtros; en otro caso devuelve None.
+    """
+    if queryset.query.where:
+        return None
+    conn = connections[queryset.db]
+    tabla = queryset.model._meta.db_table
+    try:
+        if conn.vendor == "djongo":
+            conn.ensure_connection()
+            return conn.connection[tabla].estimated_document_count()
+        if conn.vendor == "postgresql":
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [tabla],
+                )
+                fila = cur.fetchone()
+            return max(fila[0], 0) if fila else None
+    except Exception:
+        return None
+    return None
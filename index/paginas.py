@@ -0,0 +1,177 @@
+# index/paginas.py
+"""
+Caché de página completa para las páginas públicas del landing (solo
+visitantes anónimos).
+
+index, clases, clase_reformer/mat/grupal y contacto_exito son plantillas sin
+datos de la BD ni del usuario: se renderizan una vez y se sirven desde la
+caché (alias PAGINAS_CACHE) bajo ``pagina:<version>:<ruta>``. Cada entrada
+guarda el HTML con su ETag (hash del contenido) y su Last-Modified (cuándo
+se renderizó), así un navegador que ya la tiene recibe 304 sin cuerpo.
+
+  - Solo GET/HEAD de anónimos: sin cookie de sesión no se toca la sesión;
+    con cookie se revisa request.user. Los usuarios con sesión y las
+    peticiones con mensajes pendientes siempre renderizan.
+  - La respuesta lleva ``Vary: Cookie`` (la decisión depende de la sesión)
+    y Cache-Control max-age=PAGINAS_MAX_AGE.
+  - ``invalidar()`` cambia la versión global: todas las entradas quedan
+    obsoletas. ``python manage.py calentar_paginas`` lo hace en cada deploy
+    y vuelve a renderizarlas (con una caché compartida entre workers, como
+    FileBasedCache; locmem es por proceso).
+
+Se desactiva con ``PAGINAS_CACHE_ACTIVA = False``.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.urls import resolve, reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_response_headers,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+# Nombres de URL (index/urls.py) con caché de página completa
+PAGINAS = ("index", "clases", "clase_reformer", "clase_mat", "clase_grupal", "contacto_exito")
+TTL = 60 * 60
+MAX_AGE = 60
+CLAVE_VERSION = "pagina:v"
+# Cookie de django.contrib.messages (CookieStorage)
+COOKIE_MENSAJES = "messages"
+
+_lock = threading.Lock()
+_contadores = {"aciertos": 0, "fallos": 0, "no_modificadas": 0}
+
+
+def _cache():
+    return caches[getattr(settings, "PAGINAS_CACHE", "default")]
+
+
+def _contar(clave) -> None:
+    with _lock:
+        _contadores[clave] += 1
+
+
+def estadisticas() -> dict:
+    """Aciertos, fallos y respuestas 304 acumulados en este proceso."""
+    with _lock:
+        return dict(_contadores)
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _contadores.update(aciertos=0, fallos=0, no_modificadas=0)
+
+
+# ----------------------- Versionado -----------------------
+def _version() -> int:
+    cache = _cache()
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        # Basada en el reloj, como index.disponibilidad
+        version = time.time_ns()
+        cache.add(CLAVE_VERSION, version, None)
+        version = cache.get(CLAVE_VERSION, version)
+    return version
+
+
+def invalidar() -> None:
+    """Deja obsoletas todas las páginas guardadas (p. ej. tras un deploy)."""
+    cache = _cache()
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.set(CLAVE_VERSION, time.time_ns(), None)
+
+
+def _clave(ruta, version) -> str:
+    return f"pagina:{version}:{ruta}"
+
+
+# ----------------------- Petición -----------------------
+def _cacheable(request) -> bool:
+    if not getattr(settings, "PAGINAS_CACHE_ACTIVA", True):
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if COOKIE_MENSAJES in request.COOKIES:
+        return False
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return True
+    return not request.user.is_authenticated
+
+
+def _entrada(respuesta):
+    """(contenido, content_type, etag, last_modified) o None si no se guarda."""
+    if respuesta.status_code != 200 or respuesta.streaming or respuesta.cookies:
+        return None
+    contenido = respuesta.content
+    etag = quote_etag(hashlib.md5(contenido).hexdigest())
+    return contenido, respuesta["Content-Type"], etag, int(time.time())
+
+
+def _respuesta(request, entrada):
+    contenido, content_type, etag, modificada = entrada
+    respuesta = HttpResponse(contenido, content_type=content_type)
+    respuesta["ETag"] = etag
+    respuesta["Last-Modified"] = http_date(modificada)
+    patch_response_headers(respuesta, getattr(settings, "PAGINAS_MAX_AGE", MAX_AGE))
+    patch_vary_headers(respuesta, ("Cookie",))
+    condicional = get_conditional_response(
+        request, etag=etag, last_modified=modificada, response=respuesta)
+    if condicional.status_code == 304:
+        _contar("no_modificadas")
+    return condicional
+
+
+def pagina_publica(vista):
+    """Decorador de vistas sin contexto: caché de página completa para anónimos."""
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if not _cacheable(request):
+            return vista(request, *args, **kwargs)
+
+        cache = _cache()
+        clave = _clave(request.path, _version())
+        entrada = cache.get(clave)
+        if entrada is None:
+            _contar("fallos")
+            respuesta = vista(request, *args, **kwargs)
+            entrada = _entrada(respuesta)
+            if entrada is None:
+                return respuesta
+            cache.set(clave, entrada, getattr(settings, "PAGINAS_TTL", TTL))
+        else:
+            _contar("aciertos")
+        return _respuesta(request, entrada)
+
+    return envoltura
+
+
+# ----------------------- Calentamiento -----------------------
+def calentar() -> dict:
+    """
+    Invalida y vuelve a renderizar todas las PAGINAS como un visitante
+    anónimo. Devuelve {nombre: (estado HTTP, bytes)}.
+    """
+    from django.test import RequestFactory
+
+    invalidar()
+    fabrica = RequestFactory()
+    resultado = {}
+    for nombre in PAGINAS:
+        ruta = reverse(nombre)
+        request = fabrica.get(ruta)
+        request.user = AnonymousUser()
+        request.resolver_match = coincidencia = resolve(ruta)
+        respuesta = coincidencia.func(request, *coincidencia.args, **coincidencia.kwargs)
+        resultado[nombre] = (respuesta.status_code, len(respuesta.content))
+    return resultado
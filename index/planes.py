@@ -0,0 +1,78 @@
+# index/planes.py
+"""
+Planes de ejecución de las consultas calientes.
+
+Sirve para comprobar que un filtro usa un índice (Meta.indexes) y no
+recorre la tabla/colección completa:
+
+  - SQL:   ``escaneo_completo(qs)`` lee el EXPLAIN del backend. En
+           PostgreSQL se desactiva el seq scan para la consulta: con tablas
+           chicas el planificador lo preferiría aunque exista el índice.
+           Solo se interpreta el EXPLAIN de los backends en
+           EXPLAIN_SOPORTADO; con otro devuelve None (``explain_soportado()``
+           permite saltar el test antes).
+  - Mongo: ``escaneo_coleccion(coleccion, filtro, orden, limite)`` usa
+           ``explain`` de pymongo y busca una etapa COLLSCAN en el plan
+           ganador.
+
+Lo usan los tests de índices de administrador e index.
+"""
+from django.db import connection
+
+# Backends SQL cuyo EXPLAIN sabe leer escaneo_completo
+EXPLAIN_SOPORTADO = ("sqlite", "postgresql")
+
+
+def explain_soportado() -> bool:
+    return connection.vendor in EXPLAIN_SOPORTADO
+
+
+def plan(qs) -> str:
+    """Texto del EXPLAIN de `qs` en el backend SQL activo."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    return qs.explain()
+
+
+def escaneo_completo(qs):
+    """
+    True si el plan de `qs` recorre alguna tabla completa; None si el
+    backend no está en EXPLAIN_SOPORTADO (no se sabe leer su plan).
+    """
+    if not explain_soportado():
+        return None
+    texto = plan(qs)
+    if connection.vendor == "sqlite":
+        # "SCAN index_reserva" recorre la tabla; "SCAN ... USING INDEX" recorre
+        # el índice en orden (sin leer filas de más) y no cuenta
+        return any(
+            "SCAN" in linea and "USING" not in linea for linea in texto.splitlines()
+        )
+    return "Seq Scan" in texto
+
+
+def _etapas(nodo):
+    """Etapas (stage) del plan de Mongo, recorriendo inputStage(s)."""
+    if not isinstance(nodo, dict):
+        return
+    if "stage" in nodo:
+        yield nodo["stage"]
+    for hijo in [nodo.get("inputStage")] + list(nodo.get("inputStages", ())):
+        yield from _etapas(hijo)
+
+
+def plan_mongo(coleccion, filtro, orden=None, limite=None) -> dict:
+    """Plan ganador de `find(filtro).sort(orden).limit(limite)` sobre la base de djongo."""
+    connection.ensure_connection()
+    cursor = connection.connection[coleccion].find(filtro)
+    if orden:
+        cursor = cursor.sort(orden)
+    if limite:
+        cursor = cursor.limit(limite)
+    return cursor.explain()["queryPlanner"]["winningPlan"]
+
+
+def escaneo_coleccion(coleccion, filtro, orden=None, limite=None) -> bool:
+    """True si Mongo resolvería la consulta recorriendo la colección."""
+    return "COLLSCAN" in set(_etapas(plan_mongo(coleccion, filtro, orden, limite)))
@@ -0,0 +1,70 @@
+# index/resumen.py
+"""
+Resumen de reservas por usuario (próximas / historial / canceladas).
+
+Se calcula con UN aggregate con Count(filter=...) y se guarda en caché bajo
+``resumen:<user_id>``. Lo invalidan el motor de cupos (reservar/cancelar),
+los cambios masivos (index.transiciones) y las señales de Reserva.
+
+La entrada recuerda el día en que se calculó: al cambiar de día las reservas
+de ayer pasan a historial, así que una entrada de otro día no se usa.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Reserva
+
+TTL = 60 * 60 * 24
+ESTADOS_ACTIVOS = ("Confirmada", "Pendiente")
+
+
+def _cache():
+    return caches[getattr(settings, "DISPONIBILIDAD_CACHE", "default")]
+
+
+def _clave(user_id) -> str:
+    return f"resumen:{user_id}"
+
+
+def filtro_proximas(hoy) -> Q:
+    """Mismo criterio que es_proxima(), para consultas."""
+    return Q(fecha__gt=hoy) | Q(fecha=hoy, estado__in=ESTADOS_ACTIVOS)
+
+
+def es_proxima(reserva, hoy) -> bool:
+    return reserva.fecha > hoy or (
+        reserva.fecha == hoy and reserva.estado in ESTADOS_ACTIVOS
+    )
+
+
+def calcular(user_id, hoy=None) -> dict:
+    hoy = hoy or timezone.localdate()
+    totales = Reserva.objects.filter(user_id=user_id).aggregate(
+        total=Count("id"),
+        total_proximas=Count("id", filter=filtro_proximas(hoy)),
+        total_canceladas=Count("id", filter=Q(estado="Cancelada")),
+    )
+    return {
+        "total_proximas": totales["total_proximas"],
+        "total_historial": totales["total"] - totales["total_proximas"],
+        "total_canceladas": totales["total_canceladas"],
+    }
+
+
+def obtener(user_id) -> dict:
+    """Resumen desde caché (o calculado y guardado si no estaba)."""
+    hoy = timezone.localdate()
+    entrada = _cache().get(_clave(user_id))
+    if entrada and entrada.get("dia") == hoy.isoformat():
+        return entrada["resumen"]
+    resumen = calcular(user_id, hoy)
+    _cache().set(_clave(user_id), {"dia": hoy.isoformat(), "resumen": resumen}, TTL)
+    return resumen
+
+
+def invalidar(*user_ids) -> None:
+    claves = [_clave(u) for u in user_ids if u]
+    if claves:
+        _cache().delete_many(claves)
@@ -0,0 +1,31 @@
+# index/signals.py
+"""
+Invalidación de cachés (disponibilidad por clase y resumen por usuario) y
+cupo liberado al borrar una reserva activa.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from administrador.models import ClasePilates
+
+from . import cupos, disponibilidad, resumen
+from .models import Reserva
+
+
+@receiver([post_save, post_delete], sender=Reserva)
+def _reserva_cambio(sender, instance, **kwargs):
+    disponibilidad.invalidar(instance.clase_id)
+    resumen.invalidar(instance.user_id)
+
+
+@receiver(post_delete, sender=Reserva)
+def _reserva_borrada(sender, instance, **kwargs):
+    # Borrado fuera del motor (CASCADE del usuario, admin de Django, shell):
+    # una reserva no cancelada ocupaba un cupo
+    if instance.clase_id and instance.estado != cupos.ESTADO_CANCELADA:
+        cupos.liberar_cupo(instance.clase_id)
+
+
+@receiver([post_save, post_delete], sender=ClasePilates)
+def _clase_cambio(sender, instance, **kwargs):
+    disponibilidad.invalidar(instance.pk)
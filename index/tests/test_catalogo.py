@@ -0,0 +1,69 @@
+# index/tests/test_catalogo.py
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index.catalogo import contexto_catalogo
+from index.models import Reserva
+
+User = get_user_model()
+
+
+class CatalogoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        manana = timezone.localdate() + timedelta(days=1)
+        cls.clases = [
+            ClasePilates.objects.create(
+                nombre_clase=f"Clase {i}", fecha=manana, horario=time(7 + i, 0),
+                capacidad_maxima=3, nombre_instructor="Ana", descripcion=".",
+            )
+            for i in range(14)
+        ]
+        pasada = ClasePilates.objects.create(
+            nombre_clase="Pasada", fecha=date(2020, 1, 1), horario=time(9, 0),
+            capacidad_maxima=3, nombre_instructor="Ana", descripcion=".",
+        )
+        u1 = User.objects.create_user(username="u1", password="x")
+        u2 = User.objects.create_user(username="u2", password="x")
+        primera = cls.clases[0]
+        for u, estado in ((u1, "Confirmada"), (u2, "Cancelada")):
+            Reserva.objects.create(
+                user=u, clase=primera, tipo="mat", fecha=primera.fecha,
+                inicio=primera.horario, estado=estado,
+            )
+        # Contador como lo deja index.cupos: la cancelada no cuenta
+        ClasePilates.objects.filter(pk=primera.pk).update(cupos_ocupados=1)
+        Reserva.objects.create(
+            user=u1, clase=pasada, tipo="mat", fecha=pasada.fecha,
+            inicio=pasada.horario,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tarjetas_de_la_pagina_con_ocupacion(self):
+        request = RequestFactory().get("/catalogo/")
+        # solo las filas de la página (keyset, sin COUNT): traen el contador
+        with self.assertNumQueries(1):
+            ctx = contexto_catalogo(request, "usuarios:reservar_clase")
+            tarjetas = list(ctx["page_obj"].object_list)
+
+        self.assertEqual(len(tarjetas), 12)
+        self.assertEqual(tarjetas[0].obj, self.clases[0])
+        self.assertEqual(tarjetas[0].reservados, 1)
+        self.assertEqual(tarjetas[0].libres, 2)
+        self.assertEqual(tarjetas[1].libres, 3)
+
+    def test_grid_publico_renderiza(self):
+        primera = self.client.get(reverse("clases_grid"))
+        r = self.client.get(
+            reverse("clases_grid") + primera.context["page_obj"].url_siguiente)
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Clase 13")
+        self.assertNotContains(r, "Pasada")
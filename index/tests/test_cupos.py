@@ -0,0 +1,135 @@
+# index/tests/test_cupos.py
+from datetime import time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index import cupos
+from index.models import Reserva
+
+User = get_user_model()
+
+
+class MotorCuposTests(TestCase):
+    def setUp(self):
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Reformer",
+            fecha=timezone.localdate() + timedelta(days=2),
+            horario=time(10, 0),
+            capacidad_maxima=2,
+            nombre_instructor="Sofía",
+            descripcion=".",
+        )
+
+    def _reservar(self, username):
+        u = User.objects.create_user(username=username, password="x")
+        return cupos.reservar(
+            u, self.clase, tipo="reformer",
+            fecha=self.clase.fecha, inicio=self.clase.horario,
+        )
+
+    def test_no_sobrevende(self):
+        self.assertEqual(self._reservar("a")[0], cupos.RESERVA_CREADA)
+        self.assertEqual(self._reservar("b")[0], cupos.RESERVA_CREADA)
+        self.assertEqual(self._reservar("c")[0], cupos.SIN_CUPO)
+
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 2)
+        self.assertEqual(self.clase.cupos_libres, 0)
+        self.assertEqual(Reserva.objects.filter(clase=self.clase).count(), 2)
+
+    def test_cancelar_libera_una_sola_vez(self):
+        _, reserva = self._reservar("a")
+        self.assertTrue(cupos.cancelar(reserva))
+        self.assertFalse(cupos.cancelar(reserva))
+
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 0)
+
+    def test_borrar_reserva_activa_libera_el_cupo(self):
+        _, activa = self._reservar("a")
+        _, cancelada = self._reservar("b")
+        cupos.cancelar(cancelada)
+
+        cancelada.delete()
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 1)
+        # CASCADE al borrar el usuario
+        activa.user.delete()
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 0)
+
+    def test_reactiva_reserva_cancelada(self):
+        u = User.objects.create_user(username="a", password="x")
+        campos = {"tipo": "reformer", "fecha": self.clase.fecha,
+                  "inicio": self.clase.horario}
+        _, reserva = cupos.reservar(u, self.clase, **campos)
+        cupos.cancelar(reserva)
+
+        resultado, reactivada = cupos.reservar(u, self.clase, **campos)
+        self.assertEqual(resultado, cupos.RESERVA_CREADA)
+        self.assertEqual(reactivada.pk, reserva.pk)
+        self.assertEqual(
+            Reserva.objects.get(pk=reserva.pk).estado, "Confirmada")
+
+    def test_recalcular_desde_reservas(self):
+        u = User.objects.create_user(username="a", password="x")
+        Reserva.objects.create(
+            user=u, clase=self.clase, tipo="reformer",
+            fecha=self.clase.fecha, inicio=self.clase.horario,
+        )
+        ClasePilates.objects.filter(pk=self.clase.pk).update(cupos_ocupados=7)
+
+        call_command("recalcular_cupos", stdout=StringIO())
+
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 1)
+
+
+class ReservarClaseViewTests(TestCase):
+    def setUp(self):
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Mat",
+            fecha=timezone.localdate() + timedelta(days=1),
+            horario=time(9, 0),
+            capacidad_maxima=1,
+            nombre_instructor="Ana",
+            descripcion=".",
+        )
+        User.objects.create_user(username="u", password="x")
+        self.client.login(username="u", password="x")
+
+    def test_reservar_y_cancelar_actualiza_contador(self):
+        r = self.client.get(
+            reverse("usuarios:reservar_clase", args=[self.clase.id]))
+        self.assertRedirects(r, reverse("usuarios:mis_reservas"),
+                             fetch_redirect_response=False)
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 1)
+
+        reserva = Reserva.objects.get(clase=self.clase)
+        self.client.get(
+            reverse("usuarios:reserva_cancelar", args=[reserva.id]))
+        self.clase.refresh_from_db()
+        self.assertEqual(self.clase.cupos_ocupados, 0)
+
+    def test_clase_llena_no_crea_reserva(self):
+        ClasePilates.objects.filter(pk=self.clase.pk).update(cupos_ocupados=1)
+        r = self.client.get(
+            reverse("usuarios:reservar_clase", args=[self.clase.id]))
+        self.assertRedirects(r, reverse("usuarios:clases_disponibles"),
+                             fetch_redirect_response=False)
+        self.assertFalse(Reserva.objects.filter(clase=self.clase).exists())
+
+    def test_clase_llena_con_reserva_propia_avisa_repetida(self):
+        self.client.get(reverse("usuarios:reservar_clase", args=[self.clase.id]))
+        r = self.client.get(
+            reverse("usuarios:reservar_clase", args=[self.clase.id]))
+        self.assertRedirects(r, reverse("usuarios:mis_reservas"),
+                             fetch_redirect_response=False)
+        self.assertEqual(Reserva.objects.filter(clase=self.clase).count(), 1)
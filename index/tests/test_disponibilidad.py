@@ -0,0 +1,85 @@
+# index/tests/test_disponibilidad.py
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index import cupos, disponibilidad
+from index.models import Reserva
+
+User = get_user_model()
+
+
+class DisponibilidadCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        disponibilidad.reiniciar_estadisticas()
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Mat",
+            fecha=timezone.localdate() + timedelta(days=1),
+            horario=time(9, 0),
+            capacidad_maxima=4,
+            nombre_instructor="Ana",
+            descripcion=".",
+        )
+        self.user = User.objects.create_user(username="u", password="x")
+
+    def test_segunda_lectura_no_consulta_bd(self):
+        with self.assertNumQueries(1):
+            d = disponibilidad.obtener(self.clase)
+        self.assertEqual((d.capacidad, d.tomados, d.libres), (4, 0, 4))
+
+        with self.assertNumQueries(0):
+            disponibilidad.obtener(self.clase)
+        self.assertEqual(
+            disponibilidad.estadisticas(), {"aciertos": 1, "fallos": 1})
+
+    def test_reserva_nueva_invalida(self):
+        disponibilidad.obtener(self.clase)
+        cupos.reservar(
+            self.user, self.clase, tipo="mat",
+            fecha=self.clase.fecha, inicio=self.clase.horario,
+        )
+        self.assertEqual(disponibilidad.obtener(self.clase).tomados, 1)
+
+    def test_fallo_lee_el_contador_sin_contar_reservas(self):
+        # Una reserva insertada por fuera del motor no mueve el contador
+        Reserva.objects.create(
+            user=self.user, clase=self.clase, tipo="mat",
+            fecha=self.clase.fecha, inicio=self.clase.horario,
+        )
+        ClasePilates.objects.filter(pk=self.clase.pk).update(cupos_ocupados=3)
+        self.assertEqual(disponibilidad.obtener(self.clase).tomados, 3)
+
+    def test_clase_borrada_no_aparece(self):
+        otra = ClasePilates.objects.get(pk=self.clase.pk)
+        otra.pk = None
+        otra.save()
+        ClasePilates.objects.filter(pk=otra.pk).delete()
+        self.assertEqual(list(disponibilidad.obtener_muchas([self.clase, otra])), [self.clase.pk])
+
+    def test_frescas_sin_consultas(self):
+        self.clase.cupos_ocupados = 2
+        with self.assertNumQueries(0):
+            d = disponibilidad.obtener_muchas([self.clase], frescas=True)[self.clase.pk]
+        self.assertEqual((d.tomados, d.libres), (2, 2))
+        self.assertIsNotNone(d.version)
+
+    def test_cancelar_por_motor_invalida(self):
+        _, reserva = cupos.reservar(
+            self.user, self.clase, tipo="mat",
+            fecha=self.clase.fecha, inicio=self.clase.horario,
+        )
+        self.assertEqual(disponibilidad.obtener(self.clase).libres, 3)
+
+        cupos.cancelar(reserva)
+        self.assertEqual(disponibilidad.obtener(self.clase).libres, 4)
+
+    def test_cambio_de_capacidad_invalida(self):
+        disponibilidad.obtener(self.clase)
+        self.clase.capacidad_maxima = 10
+        self.clase.save()
+        self.assertEqual(disponibilidad.obtener(self.clase).capacidad, 10)
@@ -0,0 +1,94 @@
+# index/tests/test_indices.py
+"""
+Los filtros calientes de Reserva y Contacto deben resolverse con índice
+(Meta.indexes), no recorriendo la tabla (EXPLAIN) o la colección (explain
+de Mongo). Cada test corre solo en el tipo de backend que le corresponde.
+"""
+import datetime
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from index import planes
+from index.models import Contacto, Reserva
+
+User = get_user_model()
+
+es_mongo = connection.vendor == "djongo"
+solo_sql = unittest.skipUnless(planes.explain_soportado(), "EXPLAIN de SQL")
+solo_mongo = unittest.skipUnless(es_mongo, "explain de Mongo")
+
+
+class EtapasPlanMongoTests(SimpleTestCase):
+    def test_detecta_collscan_anidado(self):
+        plan = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+        self.assertIn("COLLSCAN", set(planes._etapas(plan)))
+
+    def test_ixscan_en_ramas(self):
+        plan = {"stage": "OR", "inputStages": [
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+            {"stage": "IXSCAN"},
+        ]}
+        self.assertEqual(set(planes._etapas(plan)), {"OR", "FETCH", "IXSCAN"})
+
+
+@solo_sql
+class PlanesSQLTests(TestCase):
+    def test_detecta_escaneo_sin_indice(self):
+        # `tipo` no tiene índice: el detector tiene que marcarlo
+        self.assertTrue(planes.escaneo_completo(Reserva.objects.filter(tipo="mat")))
+
+    def test_cupos_de_una_clase(self):
+        qs = Reserva.objects.filter(clase_id=1).exclude(estado="Cancelada")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+    def test_reservas_de_un_usuario(self):
+        qs = Reserva.objects.filter(user_id=1).order_by("fecha", "inicio")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+    def test_contactos_por_estado(self):
+        qs = Contacto.objects.filter(estado_mensaje="pendiente").order_by("-fecha_envio", "-id")
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+    def test_ultimos_contactos(self):
+        qs = Contacto.objects.order_by("-fecha_envio", "-id")[:5]
+        self.assertFalse(planes.escaneo_completo(qs), planes.plan(qs))
+
+
+@solo_mongo
+class PlanesMongoTests(TestCase):
+    def _sin_collscan(self, modelo, filtro, orden=None, limite=None):
+        tabla = modelo._meta.db_table
+        self.assertFalse(
+            planes.escaneo_coleccion(tabla, filtro, orden, limite),
+            planes.plan_mongo(tabla, filtro, orden, limite),
+        )
+
+    def test_cupos_de_una_clase(self):
+        self._sin_collscan(Reserva, {"clase_id": 1, "estado": {"$ne": "Cancelada"}})
+
+    def test_reservas_de_un_usuario(self):
+        self._sin_collscan(Reserva, {"user_id": 1}, [("fecha", 1), ("inicio", 1)])
+
+    # Contactos: mismas consultas que administrador.views (find de djongo)
+    ORDEN_CRM = [("fecha_envio", -1), ("id", -1)]
+
+    def test_contactos_por_estado(self):
+        # admin_contactos?estado=pendiente, primera página (10 + 1 filas)
+        self._sin_collscan(Contacto, {"estado_mensaje": "pendiente"}, self.ORDEN_CRM, 11)
+
+    def test_contactos_pagina_siguiente(self):
+        # PaginadorKeyset: (fecha_envio, id) < (los de la última fila)
+        fecha = datetime.datetime(2026, 1, 5, 10, 0)
+        self._sin_collscan(
+            Contacto,
+            {"$or": [{"fecha_envio": {"$lt": fecha}},
+                     {"fecha_envio": fecha, "id": {"$lt": 40}}]},
+            self.ORDEN_CRM, 11,
+        )
+
+    def test_ultimos_contactos(self):
+        # Dashboard: Contacto.objects.order_by("-fecha_envio", "-id")[:5]
+        self._sin_collscan(Contacto, {}, self.ORDEN_CRM, 5)
@@ -0,0 +1,61 @@
+# index/tests/test_limites.py
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from index.models import Contacto
+from login import limites
+
+DATOS = {"nombre": "Ana", "correo": "ana@example.com", "telefono": "1", "mensaje": "Hola"}
+
+
+@override_settings(LIMITES_INTENTOS={"contacto_ip": (2, 1)})
+class LimiteContactoTests(TestCase):
+    def setUp(self):
+        limites.vaciar_memoria()
+        limites.reiniciar_estadisticas()
+        self.addCleanup(limites.vaciar_memoria)
+
+    def _enviar(self, ip):
+        return self.client.post(reverse("contacto_publico"), DATOS, REMOTE_ADDR=ip)
+
+    def test_rechaza_por_ip_sin_guardar(self):
+        for _ in range(2):
+            self.assertEqual(self._enviar("10.0.0.1").status_code, 302)
+        self.assertEqual(self._enviar("10.0.0.1").status_code, 429)
+        self.assertEqual(self._enviar("10.0.0.2").status_code, 302)
+        self.assertEqual(Contacto.objects.count(), 3)
+        self.assertEqual(limites.estadisticas()["rechazados_contacto"], 1)
+
+    @override_settings(LIMITE_IP_CABECERA="HTTP_X_FORWARDED_FOR")
+    def test_ip_detras_del_proxy(self):
+        # El proxy agrega la IP real al final; lo de la izquierda lo pone el cliente
+        for ip in ("1.1.1.1", "2.2.2.2", "3.3.3.3"):
+            resp = self.client.post(reverse("contacto_publico"), DATOS,
+                                    REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"6.6.6.6, {ip}")
+            self.assertEqual(resp.status_code, 302)
+
+    @override_settings(LIMITE_IP_CABECERA="HTTP_X_FORWARDED_FOR")
+    def test_entradas_falsas_del_cliente_no_cambian_la_ip(self):
+        estados = [
+            self.client.post(reverse("contacto_publico"), DATOS, REMOTE_ADDR="10.0.0.1",
+                             HTTP_X_FORWARDED_FOR=f"{falsa}, 5.5.5.5").status_code
+            for falsa in ("1.1.1.1", "2.2.2.2", "3.3.3.3")
+        ]
+        self.assertEqual(estados, [302, 302, 429])
+
+
+class IpClienteTests(SimpleTestCase):
+    def _ip(self, **meta):
+        return limites.ip_cliente(RequestFactory().get("/", **meta))
+
+    @override_settings(LIMITE_IP_CABECERA="HTTP_X_FORWARDED_FOR", LIMITE_PROXIES=2)
+    def test_cuenta_proxies_desde_la_derecha(self):
+        xff = "9.9.9.9, 1.2.3.4, 172.16.0.1"
+        self.assertEqual(self._ip(REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=xff), "1.2.3.4")
+        # Menos entradas que proxies: no vino de ellos
+        self.assertEqual(self._ip(REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4"),
+                         "10.0.0.1")
+
+    def test_sin_cabecera_configurada(self):
+        self.assertEqual(
+            self._ip(REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4"), "10.0.0.1")
@@ -0,0 +1,106 @@
+# index/tests/test_nativo.py
+"""
+Paridad entre las lecturas nativas (index.nativo) y el ORM.
+
+Los datos se crean con el ORM y se copian a mongomock con el mismo formato
+que usa djongo; luego se compara lo que devuelve cada camino.
+"""
+import datetime
+import unittest
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from administrador import kpis
+from administrador.models import ClasePilates, IndicadorKPI
+from index import nativo
+from index.models import Reserva
+
+try:
+    import mongomock
+except ImportError:  # pragma: no cover
+    mongomock = None
+
+User = get_user_model()
+
+
+def _a_documento(obj) -> dict:
+    """Instancia -> documento tal como lo guarda djongo."""
+    doc = {}
+    for campo in obj._meta.concrete_fields:
+        valor = getattr(obj, campo.attname)
+        if isinstance(campo, models.DateTimeField):
+            valor = valor.replace(tzinfo=None) if valor else valor
+        elif isinstance(campo, models.DateField) and valor is not None:
+            valor = datetime.datetime(valor.year, valor.month, valor.day)
+        elif isinstance(campo, models.TimeField) and valor is not None:
+            valor = datetime.datetime(1900, 1, 1, valor.hour, valor.minute, valor.second)
+        doc[campo.column] = valor
+    return doc
+
+
+class FilaReservaTests(SimpleTestCase):
+    def test_convierte_tipos_de_djongo(self):
+        fila = nativo.FilaReserva({
+            "id": 3, "fecha": datetime.datetime(2030, 1, 7),
+            "inicio": datetime.datetime(1900, 1, 1, 9, 30), "fin": None,
+            "estado": "Confirmada",
+        })
+        self.assertEqual((fila.pk, fila.fecha, fila.inicio, fila.fin),
+                         (3, date(2030, 1, 7), time(9, 30), None))
+
+    def test_inactivo_fuera_de_djongo(self):
+        with override_settings(LECTURAS_NATIVAS=True):
+            self.assertFalse(nativo.activo())
+
+
+@unittest.skipIf(mongomock is None, "mongomock no está instalado (pip install -r requirements-dev.txt)")
+class ParidadNativoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hoy = date(2030, 1, 7)
+        cls.clases = [
+            ClasePilates.objects.create(
+                nombre_clase=f"C{i}", fecha=hoy + timedelta(days=i),
+                horario=time(9, 0), capacidad_maxima=5,
+                nombre_instructor="Ana", descripcion=".",
+            )
+            for i in range(3)
+        ]
+        cls.usuarios = [
+            User.objects.create_user(username=f"u{i}", password="x") for i in range(3)
+        ]
+        estados = ["Confirmada", "Cancelada", "Pendiente"]
+        for i, u in enumerate(cls.usuarios):
+            for j, clase in enumerate(cls.clases[: i + 1]):
+                Reserva.objects.create(
+                    user=u, clase=clase, tipo="mat", fecha=clase.fecha,
+                    inicio=time(8 + j, 0), estado=estados[(i + j) % 3],
+                )
+        kpis.recalcular()
+
+    def setUp(self):
+        self.db = mongomock.MongoClient().db
+        for modelo in (Reserva, IndicadorKPI):
+            self.db[modelo._meta.db_table].insert_many(
+                [_a_documento(o) for o in modelo.objects.all()])
+
+    def test_indicadores(self):
+        claves = list(IndicadorKPI.objects.values_list("clave", flat=True)) + ["no:existe"]
+        esperado = dict(
+            IndicadorKPI.objects.filter(clave__in=claves).values_list("clave", "valor"))
+        self.assertEqual(nativo.indicadores(claves, db=self.db), esperado)
+
+    def test_reservas_de_usuario(self):
+        for u in self.usuarios:
+            orm = [
+                (r.id, r.clase_id, r.tipo, r.fecha, r.inicio, r.fin, r.estado)
+                for r in Reserva.objects.filter(user=u).order_by("fecha", "inicio", "id")
+            ]
+            filas = [
+                (f.id, f.clase_id, f.tipo, f.fecha, f.inicio, f.fin, f.estado)
+                for f in nativo.reservas_de_usuario(u.pk, db=self.db)
+            ]
+            self.assertEqual(filas, orm)
@@ -0,0 +1,68 @@
+# index/tests/test_paginacion.py
+from datetime import date, time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from administrador.models import ClasePilates
+from index.paginacion import PaginadorKeyset
+
+User = get_user_model()
+
+
+class PaginadorKeysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Fechas/horas repetidas para ejercitar el desempate por id
+        for i in range(25):
+            ClasePilates.objects.create(
+                nombre_clase=f"C{i}", fecha=date(2030, 1, 1 + i % 3),
+                horario=time(8 + i % 2, 0), capacidad_maxima=5,
+                nombre_instructor="Ana", descripcion=".",
+            )
+
+    def _recorrer(self, paginador):
+        ids, pagina = [], paginador.pagina()
+        while True:
+            ids.extend(c.id for c in pagina)
+            if not pagina.has_next:
+                return ids, pagina
+            pagina = paginador.pagina(pagina.cursor_siguiente)
+
+    def test_recorre_todo_en_orden_sin_repetir(self):
+        orden = ["fecha", "horario", "id"]
+        esperado = list(
+            ClasePilates.objects.order_by(*orden).values_list("id", flat=True))
+
+        ids, ultima = self._recorrer(
+            PaginadorKeyset(ClasePilates.objects.all(), orden, 10))
+        self.assertEqual(ids, esperado)
+        self.assertEqual(len(ultima), 5)
+
+        anterior = PaginadorKeyset(ClasePilates.objects.all(), orden, 10).pagina(
+            ultima.cursor_anterior)
+        self.assertEqual([c.id for c in anterior], esperado[10:20])
+        self.assertTrue(anterior.has_previous)
+        self.assertTrue(anterior.has_next)
+
+    def test_direcciones_mixtas(self):
+        for i in range(7):
+            User.objects.create_user(username=f"u{i}", first_name="AB"[i % 2])
+        orden = ["-first_name", "id"]
+        esperado = list(
+            User.objects.order_by(*orden).values_list("id", flat=True))
+
+        ids, _ = self._recorrer(PaginadorKeyset(User.objects.all(), orden, 3))
+        self.assertEqual(ids, esperado)
+
+    def test_cursor_invalido_vuelve_al_inicio(self):
+        paginador = PaginadorKeyset(ClasePilates.objects.all(), ["-id"], 10)
+        pagina = paginador.pagina("no-es-un-cursor")
+        self.assertFalse(pagina.has_previous)
+        self.assertEqual(len(pagina), 10)
+
+    def test_urls_conservan_filtros(self):
+        paginador = PaginadorKeyset(ClasePilates.objects.all(), ["-id"], 10)
+        pagina = paginador.pagina(None, {"q": "mat", "cursor": "viejo"})
+        self.assertIn("q=mat", pagina.url_siguiente)
+        self.assertNotIn("viejo", pagina.url_siguiente)
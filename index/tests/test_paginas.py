@@ -0,0 +1,89 @@
+# index/tests/test_paginas.py
+from datetime import time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index import paginas
+
+User = get_user_model()
+
+
+class PaginaPublicaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        paginas.reiniciar_estadisticas()
+
+    def test_anonimo_sale_de_cache_con_validadores(self):
+        primera = self.client.get(reverse("index"))
+        segunda = self.client.get(reverse("index"))
+        self.assertEqual(paginas.estadisticas(), {"aciertos": 1, "fallos": 1, "no_modificadas": 0})
+        self.assertEqual(primera.content, segunda.content)
+        self.assertEqual(primera["ETag"], segunda["ETag"])
+        self.assertIn("Last-Modified", segunda)
+        self.assertIn("Cookie", segunda["Vary"])
+        self.assertIn("max-age=60", segunda["Cache-Control"])
+
+    def test_condicionales_responden_304(self):
+        r = self.client.get(reverse("clases"))
+        por_etag = self.client.get(reverse("clases"), HTTP_IF_NONE_MATCH=r["ETag"])
+        por_fecha = self.client.get(reverse("clases"), HTTP_IF_MODIFIED_SINCE=r["Last-Modified"])
+        self.assertEqual((por_etag.status_code, por_fecha.status_code), (304, 304))
+        self.assertEqual(por_etag.content, b"")
+        otra = self.client.get(reverse("clases"), HTTP_IF_NONE_MATCH='"otra"')
+        self.assertEqual(otra.status_code, 200)
+        self.assertEqual(paginas.estadisticas()["no_modificadas"], 2)
+
+    def test_con_sesion_siempre_renderiza(self):
+        User.objects.create_user("ana", password="x")
+        self.client.login(username="ana", password="x")
+        r = self.client.get(reverse("clase_mat"))
+        self.assertEqual(r.status_code, 200)
+        self.assertNotIn("ETag", r)
+        self.assertEqual(paginas.estadisticas()["fallos"], 0)
+
+    def test_invalidar_y_calentar(self):
+        self.client.get(reverse("index"))
+        paginas.invalidar()
+        self.client.get(reverse("index"))
+        self.assertEqual(paginas.estadisticas()["fallos"], 2)
+
+        salida = StringIO()
+        call_command("calentar_paginas", stdout=salida)
+        self.assertIn(f"{len(paginas.PAGINAS)} páginas renderizadas", salida.getvalue())
+        paginas.reiniciar_estadisticas()
+        for nombre in paginas.PAGINAS:
+            self.assertEqual(self.client.get(reverse(nombre)).status_code, 200)
+        self.assertEqual(paginas.estadisticas()["aciertos"], len(paginas.PAGINAS))
+
+    def test_pagina_con_estado_activo_segun_ruta(self):
+        # La barra marca la sección actual: cada ruta tiene su propia entrada
+        self.client.get(reverse("index"))
+        r = self.client.get(reverse("clase_grupal"))
+        self.assertEqual(paginas.estadisticas()["fallos"], 2)
+        self.assertTemplateUsed(r, "clase_grupal.html")
+
+
+class TarjetaFragmentoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Mat suave", fecha=timezone.localdate() + timedelta(days=1),
+            horario=time(9, 0), capacidad_maxima=4, nombre_instructor="Ana", descripcion=".",
+        )
+
+    def test_tarjeta_cacheada_hasta_que_cambia_la_version(self):
+        self.assertContains(self.client.get(reverse("clases_grid")), "Mat suave")
+        # update() no dispara señales: la tarjeta sigue saliendo del fragmento
+        ClasePilates.objects.filter(pk=self.clase.pk).update(nombre_clase="Mat intenso")
+        self.assertContains(self.client.get(reverse("clases_grid")), "Mat suave")
+        # save() invalida la versión de la clase (index.signals)
+        self.clase.nombre_clase = "Mat intenso"
+        self.clase.save()
+        self.assertContains(self.client.get(reverse("clases_grid")), "Mat intenso")
@@ -0,0 +1,24 @@
+# index/tests/test_presupuesto_consultas.py
+"""
+Consultas por página del sitio público, con 10 y con 1000 filas
+(ver administrador/tests/presupuesto.py).
+"""
+from django.test import TestCase
+from django.urls import reverse
+
+from administrador.tests.presupuesto import PresupuestoConsultasMixin
+
+
+class PresupuestoIndexTests(PresupuestoConsultasMixin, TestCase):
+    paginas = [
+        ("index", "anonimo", reverse("index"), 0),
+        ("clases", "anonimo", reverse("clases"), 0),
+        ("contacto_publico", "anonimo", reverse("contacto_publico"), 0),
+        ("contacto_exito", "anonimo", reverse("contacto_exito"), 0),
+        ("clase_reformer", "anonimo", reverse("clase_reformer"), 0),
+        ("clase_mat", "anonimo", reverse("clase_mat"), 0),
+        ("clase_grupal", "anonimo", reverse("clase_grupal"), 0),
+        # página de clases (trae cupos_ocupados: la ocupación no consulta)
+        ("clases_disponibles", "anonimo", reverse("clases_disponibles"), 1),
+        ("clases_grid", "anonimo", reverse("clases_grid"), 1),
+    ]
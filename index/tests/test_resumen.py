@@ -0,0 +1,64 @@
+# index/tests/test_resumen.py
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index import cupos, resumen
+from index.models import Reserva
+
+User = get_user_model()
+
+
+class ResumenReservasTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="u1", password="x")
+        self.hoy = timezone.localdate()
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Mat", fecha=self.hoy + timedelta(days=2),
+            horario=time(9, 0), capacidad_maxima=5, nombre_instructor="Ana",
+            descripcion=".",
+        )
+        for fecha, estado in (
+            (self.hoy + timedelta(days=1), "Confirmada"),
+            (self.hoy, "Cancelada"),
+            (date(2020, 1, 1), "Completada"),
+        ):
+            Reserva.objects.create(
+                user=self.user, tipo="mat", fecha=fecha, inicio=time(9, 0),
+                estado=estado,
+            )
+
+    def test_aggregate_condicional(self):
+        self.assertEqual(resumen.calcular(self.user.pk), {
+            "total_proximas": 1, "total_historial": 2, "total_canceladas": 1,
+        })
+
+    def test_reservar_y_cancelar_invalidan(self):
+        self.assertEqual(resumen.obtener(self.user.pk)["total_proximas"], 1)
+        _, reserva = cupos.reservar(
+            self.user, self.clase, tipo="mat", fecha=self.clase.fecha,
+            inicio=self.clase.horario)
+        self.assertEqual(resumen.obtener(self.user.pk)["total_proximas"], 2)
+        cupos.cancelar(reserva)
+        self.assertEqual(resumen.obtener(self.user.pk)["total_canceladas"], 2)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+                       USUARIO_CACHE="default")
+    def test_mis_reservas_en_dos_consultas(self):
+        self.client.login(username="u1", password="x")
+        url = reverse("usuarios:mis_reservas")
+        # usuario + filas + aggregate (fallo de caché; la sesión ya está en caché)
+        with self.assertNumQueries(3):
+            r = self.client.get(url)
+        # con el resumen y el usuario en caché: solo las filas
+        with self.assertNumQueries(1):
+            r = self.client.get(url)
+        self.assertEqual(len(r.context["reservas_proximas"]), 1)
+        self.assertEqual(len(r.context["reservas_historial"]), 2)
+        self.assertEqual(r.context["total_historial"], 2)
@@ -0,0 +1,45 @@
+# index/tests/test_traduccion.py
+from io import StringIO
+
+import sqlparse
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from index import traduccion
+
+
+class CacheLRUTests(SimpleTestCase):
+    def test_reutiliza_el_parseo_por_forma(self):
+        llamadas = []
+
+        def parse(sql, encoding=None):
+            llamadas.append(sql)
+            return sqlparse.parse(sql, encoding)
+
+        cacheado = traduccion.envolver(parse, traduccion.CacheLRU(2))
+        sql = 'SELECT "id" FROM "t" WHERE "x" = %(0)s'
+        primero = cacheado(sql)
+        self.assertIs(cacheado(sql), primero)
+        self.assertEqual(llamadas, [sql])
+        stats = cacheado.cache.estadisticas()
+        self.assertEqual((stats["aciertos"], stats["fallos"]), (1, 1))
+        self.assertEqual(stats["tasa_aciertos"], 0.5)
+
+    def test_expulsa_la_menos_usada(self):
+        cache = traduccion.CacheLRU(2)
+        cache.obtener("a", lambda: 1)
+        cache.obtener("b", lambda: 2)
+        cache.obtener("a", lambda: 1)   # "b" queda como la menos usada
+        cache.obtener("c", lambda: 3)
+        self.assertEqual(cache.obtener("b", lambda: "nuevo"), "nuevo")
+        self.assertEqual(cache.estadisticas()["entradas"], 2)
+
+    def test_desactivada_con_tamano_cero(self):
+        self.assertFalse(traduccion.instalar(0))
+
+
+class BenchmarkTraduccionTests(TestCase):
+    def test_comando(self):
+        salida = StringIO()
+        call_command("benchmark_traduccion", "--repeticiones=2", stdout=salida)
+        self.assertIn("Ahorro:", salida.getvalue())
@@ -0,0 +1,95 @@
+# index/tests/test_transiciones.py
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from administrador.models import ClasePilates
+from index import cupos, transiciones
+from index.models import Reserva
+
+User = get_user_model()
+
+
+class TransicionesTests(TestCase):
+    def setUp(self):
+        self.clase = ClasePilates.objects.create(
+            nombre_clase="Mat", fecha=timezone.localdate() + timedelta(days=1),
+            horario=time(9, 0), capacidad_maxima=5, nombre_instructor="Ana",
+            descripcion=".",
+        )
+        self.reservas = []
+        for i in range(3):
+            u = User.objects.create_user(username=f"u{i}", password="x")
+            self.reservas.append(cupos.reservar(
+                u, self.clase, tipo="mat", fecha=self.clase.fecha,
+                inicio=self.clase.horario)[1])
+
+    def _ocupados(self):
+        self.clase.refresh_from_db()
+        return self.clase.cupos_ocupados
+
+    def test_cancelar_y_reactivar_ajusta_cupos(self):
+        ids = [r.pk for r in self.reservas[:2]]
+        self.assertEqual(transiciones.cambiar_estado(ids, "Cancelada").cambiadas, 2)
+        self.assertEqual(self._ocupados(), 1)
+        # Repetir no cambia nada
+        self.assertEqual(transiciones.cambiar_estado(ids, "Cancelada").cambiadas, 0)
+        self.assertEqual(transiciones.cambiar_estado(ids, "Confirmada").cambiadas, 2)
+        self.assertEqual(self._ocupados(), 3)
+
+    def test_cancelar_aplica_delta_sin_recontar(self):
+        # Un cupo tomado por otra petición cuya reserva aún no existe
+        cupos.tomar_cupo(self.clase.pk)
+        transiciones.cambiar_estado([self.reservas[0].pk], "Cancelada")
+        self.assertEqual(self._ocupados(), 3)
+
+    def test_reactivar_respeta_la_capacidad(self):
+        ids = [r.pk for r in self.reservas]
+        transiciones.cambiar_estado(ids, "Cancelada")
+        ClasePilates.objects.filter(pk=self.clase.pk).update(capacidad_maxima=1)
+        resultado = transiciones.cambiar_estado(ids, "Confirmada")
+        self.assertEqual(resultado.cambiadas, 1)
+        self.assertEqual(len(resultado.sin_cupo), 2)
+        self.assertEqual(self._ocupados(), 1)
+        self.assertEqual(
+            Reserva.objects.filter(pk__in=resultado.sin_cupo, estado="Cancelada").count(), 2)
+
+    def test_estado_invalido(self):
+        with self.assertRaises(ValueError):
+            transiciones.cambiar_estado([self.reservas[0].pk], "Perdida")
+
+    def test_completar_vencidas_por_lotes(self):
+        Reserva.objects.update(fecha=date(2020, 1, 1))
+        Reserva.objects.filter(pk=self.reservas[0].pk).update(estado="Cancelada")
+        lotes = []
+        total = transiciones.completar_vencidas(tamano_lote=1, al_avanzar=lotes.append)
+        self.assertEqual(total, 2)
+        self.assertEqual(lotes, [1, 2])
+        self.assertEqual(Reserva.objects.filter(estado="Completada").count(), 2)
+
+    def test_comando(self):
+        Reserva.objects.update(fecha=date(2020, 1, 1))
+        salida = StringIO()
+        call_command("completar_reservas", "--dry-run", stdout=salida)
+        self.assertIn("3", salida.getvalue())
+        call_command("completar_reservas", stdout=StringIO())
+        self.assertFalse(transiciones.vencidas().exists())
+
+    @patch("administrador.views._solo_admin", return_value=True)
+    def test_vista_estado_masivo(self, _mock):
+        User.objects.create_user(username="admin", password="x")
+        self.client.login(username="admin", password="x")
+        r = self.client.post(reverse("administrador:reservas_estado_masivo"), {
+            "ids": [self.reservas[0].pk, self.reservas[1].pk],
+            "nuevo_estado": "Cancelada",
+            "volver": "f=confirmada",
+        })
+        self.assertRedirects(r, reverse("administrador:reservas_list") + "?f=confirmada")
+        self.assertEqual(Reserva.objects.filter(estado="Cancelada").count(), 2)
+        self.assertEqual(self._ocupados(), 1)
@@ -0,0 +1,124 @@
+# index/traduccion.py
+"""
+Caché LRU de consultas parseadas para djongo.
+
+djongo recibe SQL con marcadores (``... WHERE "clase_id" = %(0)s``), lo
+tokeniza con ``sqlparse.parse`` y recién después lo traduce a Mongo. El
+parseo es lo más caro de la traducción y solo depende del texto de la
+consulta, no de los parámetros: las mismas pocas formas (filtros del
+catálogo, conteos de cupos, login) se repiten miles de veces.
+
+``instalar()`` reemplaza la referencia ``sqlparse`` que usan los módulos de
+``djongo.sql2mongo`` por una versión con caché acotada, indexada por el SQL
+con marcadores. El árbol de tokens se comparte en modo solo lectura. La
+traducción final no se cachea porque incorpora los valores de los
+parámetros.
+
+Se instala desde IndexConfig.ready() con djongo; el tamaño se controla con
+``DJONGO_CACHE_CONSULTAS`` (0 la desactiva).
+"""
+import importlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+TAMANO_POR_DEFECTO = 512
+
+# Módulos de djongo que hacen ``from sqlparse import parse as sqlparse``
+_MODULOS_DJONGO = (
+    "djongo.sql2mongo.query",
+    "djongo.sql2mongo.converters",
+    "djongo.sql2mongo.sql_tokens",
+)
+
+
+class CacheLRU:
+    """LRU acotada y segura entre hilos, con contadores de aciertos."""
+
+    def __init__(self, tamano: int = TAMANO_POR_DEFECTO):
+        self.tamano = max(1, tamano)
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, calcular):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+        # Se calcula fuera del lock: dos hilos pueden parsear la misma
+        # consulta a la vez, pero ninguno espera al otro.
+        valor = calcular()
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.tamano:
+                self._datos.popitem(last=False)
+        return valor
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self.aciertos = self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+                "entradas": len(self._datos),
+                "tamano": self.tamano,
+            }
+
+
+def envolver(parse, cache: CacheLRU):
+    """Versión de `parse(sql, encoding=None)` que reutiliza el resultado."""
+
+    def parse_cacheado(sql, encoding=None):
+        return cache.obtener((sql, encoding), lambda: parse(sql, encoding))
+
+    parse_cacheado.cache = cache
+    parse_cacheado.original = parse
+    return parse_cacheado
+
+
+_cache = None
+
+
+def instalar(tamano=None) -> bool:
+    """
+    Activa la caché en djongo. Devuelve False si djongo no está instalado o
+    si el tamaño configurado es 0.
+    """
+    global _cache
+    if tamano is None:
+        tamano = getattr(settings, "DJONGO_CACHE_CONSULTAS", TAMANO_POR_DEFECTO)
+    if not tamano:
+        return False
+    try:
+        modulos = [importlib.import_module(m) for m in _MODULOS_DJONGO]
+    except ImportError:
+        return False
+
+    if _cache is None:
+        _cache = CacheLRU(tamano)
+    for modulo in modulos:
+        actual = getattr(modulo, "sqlparse", None)
+        if actual is None or getattr(actual, "cache", None) is _cache:
+            continue
+        modulo.sqlparse = envolver(actual, _cache)
+    return True
+
+
+def estadisticas() -> dict:
+    """Métricas de la caché instalada (vacías si no está activa)."""
+    if _cache is None:
+        return {"aciertos": 0, "fallos": 0, "tasa_aciertos": 0.0,
+                "entradas": 0, "tamano": 0}
+    return _cache.estadisticas()
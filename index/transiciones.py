@@ -0,0 +1,133 @@
+# index/transiciones.py
+"""
+Cambios de estado masivos sobre Reserva.
+
+  - cambiar_estado(): UPDATE filtrado para las reservas elegidas en el
+    panel. Si el cambio cruza la frontera "Cancelada" los contadores de
+    cupos (index.cupos) se ajustan con deltas según las filas que de verdad
+    cambiaron: al cancelar, un UPDATE por clase y ``F - n``; al reactivar,
+    cada reserva pasa por el incremento condicionado a la capacidad y las
+    que ya no caben se informan en vez de sobrevender la clase.
+  - completar_vencidas(): pasa a "Completada" las reservas confirmadas de
+    días anteriores, por lotes. Así las consultas de historial pueden filtrar
+    por estado en vez de comparar fechas (comando ``completar_reservas``).
+"""
+from collections import defaultdict
+
+from django.utils import timezone
+
+from . import cupos, disponibilidad, resumen
+from .models import Reserva
+
+ESTADOS = {valor for valor, _etiqueta in Reserva.ESTADOS}
+TAMANO_LOTE = 1000
+
+
+class CambioEstado:
+    """Resultado de cambiar_estado(): cuántas cambiaron y cuáles no cupieron."""
+
+    __slots__ = ("cambiadas", "sin_cupo")
+
+    def __init__(self, cambiadas: int = 0, sin_cupo=None):
+        self.cambiadas = cambiadas
+        self.sin_cupo = sin_cupo or []
+
+
+def cambiar_estado(ids, nuevo_estado: str) -> CambioEstado:
+    """
+    Aplica `nuevo_estado` a las reservas `ids`. Las reservas canceladas que
+    no se pueden reactivar porque su clase está llena quedan en
+    ``sin_cupo`` (ids) y siguen canceladas.
+    """
+    if nuevo_estado not in ESTADOS:
+        raise ValueError(f"Estado desconocido: {nuevo_estado}")
+    qs = Reserva.objects.filter(pk__in=list(ids)).exclude(estado=nuevo_estado)
+    usuarios = set(qs.order_by().values_list("user_id", flat=True).distinct())
+
+    if nuevo_estado == cupos.ESTADO_CANCELADA:
+        resultado = _cancelar(qs)
+    else:
+        resultado = _cambiar_sin_cancelar(qs, nuevo_estado)
+    if resultado.cambiadas:
+        resumen.invalidar(*usuarios)
+    return resultado
+
+
+def _por_clase(filas) -> dict:
+    """{clase_id: [reserva_id, ...]} (clase_id None para reservas sin clase)."""
+    grupos = defaultdict(list)
+    for reserva_id, clase_id in filas:
+        grupos[clase_id].append(reserva_id)
+    return grupos
+
+
+def _cancelar(qs) -> CambioEstado:
+    resultado = CambioEstado()
+    for clase_id, reservas in _por_clase(qs.values_list("id", "clase_id")).items():
+        # El filtro de estado se repite en el UPDATE: solo cuenta lo que cambió
+        n = (
+            Reserva.objects.filter(pk__in=reservas)
+            .exclude(estado=cupos.ESTADO_CANCELADA)
+            .update(estado=cupos.ESTADO_CANCELADA)
+        )
+        resultado.cambiadas += n
+        if n and clase_id:
+            cupos.liberar_cupo(clase_id, n)
+            disponibilidad.invalidar(clase_id)
+    return resultado
+
+
+def _cambiar_sin_cancelar(qs, nuevo_estado) -> CambioEstado:
+    resultado = CambioEstado()
+    # Entre estados activos (p. ej. Confirmada -> Completada) los cupos no cambian
+    resultado.cambiadas += qs.exclude(estado=cupos.ESTADO_CANCELADA).update(estado=nuevo_estado)
+
+    canceladas = qs.filter(estado=cupos.ESTADO_CANCELADA).values_list("id", "clase_id")
+    for clase_id, reservas in _por_clase(canceladas).items():
+        reactivadas = 0
+        for reserva_id in reservas:
+            if clase_id and not cupos.tomar_cupo(clase_id):
+                resultado.sin_cupo.append(reserva_id)
+                continue
+            cambio = Reserva.objects.filter(
+                pk=reserva_id, estado=cupos.ESTADO_CANCELADA
+            ).update(estado=nuevo_estado)
+            if not cambio and clase_id:
+                # Otra petición la cambió entre medio: se devuelve el cupo
+                cupos.liberar_cupo(clase_id)
+            reactivadas += cambio
+        resultado.cambiadas += reactivadas
+        if reactivadas and clase_id:
+            disponibilidad.invalidar(clase_id)
+    return resultado
+
+
+def vencidas(hoy=None):
+    """Reservas confirmadas de días anteriores a `hoy`."""
+    hoy = hoy or timezone.localdate()
+    return Reserva.objects.filter(estado="Confirmada", fecha__lt=hoy)
+
+
+def completar_vencidas(hoy=None, tamano_lote: int = TAMANO_LOTE, al_avanzar=None) -> int:
+    """
+    Marca como "Completada" las reservas vencidas, `tamano_lote` por UPDATE
+    (transacciones y bloqueos cortos). `al_avanzar(hechas)` tras cada lote.
+    Devuelve el total de reservas completadas.
+    """
+    pendientes = vencidas(hoy)
+    hechas = 0
+    while True:
+        ids = list(
+            pendientes.order_by("id").values_list("id", flat=True)[:tamano_lote]
+        )
+        if not ids:
+            break
+        # Se repite el filtro de estado: otra petición pudo cancelar entre medio
+        hechas += Reserva.objects.filter(pk__in=ids, estado="Confirmada").update(
+            estado="Completada"
+        )
+        if al_avanzar:
+            al_avanzar(hechas)
+        if len(ids) < tamano_lote:
+            break
+    return hechas
@@ -1,26 +1,37 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 
+from . import limites
+from .credenciales import normalizar
+
 UserModel = get_user_model()
 
 
 class EmailOrUsernameModelBackend(ModelBackend):
     """
     Permite autenticarse con username O con email (case-insensitive).
+
+    Una sola búsqueda exacta sobre username_norm/email_norm (índices únicos)
+    y una sola verificación de la contraseña por intento. Es el único backend
+    de AUTHENTICATION_BACKENDS: ModelBackend repetiría búsqueda y hash en
+    cada intento fallido.
     """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None:
             username = kwargs.get(UserModel.USERNAME_FIELD)
+        identificador = normalizar(username)
+        if not identificador or password is None:
+            return None
 
+        campo = "email_norm" if "@" in identificador else "username_norm"
         try:
-            if "@" in (username or ""):
-                user = UserModel.objects.get(email__iexact=username)
-            else:
-                user = UserModel.objects.get(username__iexact=username)
+            user = UserModel._default_manager.get(**{campo: identificador})
         except UserModel.DoesNotExist:
             return None
 
-        if user.check_password(password) and self.user_can_authenticate(user):
+        with limites.medir_hash():
+            valida = user.check_password(password)
+        if valida and self.user_can_authenticate(user):
             return user
         return None
@@ -0,0 +1,117 @@
+# login/credenciales.py
+"""
+Credenciales normalizadas para iniciar sesión con UNA búsqueda exacta.
+
+``User.username_norm`` y ``User.email_norm`` guardan usuario y correo en
+minúsculas, con índice único. El backend (login.backends) busca por
+igualdad sobre uno de ellos en lugar de ``__iexact``, que en djongo se
+traduce a una expresión regular que recorre toda la colección.
+
+Mongo (djongo) no tiene índices únicos parciales: varios usuarios sin
+correo chocarían con ``email_norm = null``. A esos se les guarda
+``SIN_CORREO + username_norm``, que empieza con un espacio y por eso nunca
+coincide con lo que escribe alguien al entrar (se recorta con strip()).
+
+``User.save()`` las mantiene al día (sin pisar los marcadores de conflicto,
+ver ``conservar_marcadores``); quien inserte con ``bulk_create`` debe llamar
+antes a ``user.normalizar_credenciales()``. ``rellenar()`` las
+recalcula para usuarios existentes (migración 0004 y comando
+``normalizar_credenciales``). ``en_uso()`` revisa de una vez si varios
+usuarios/correos ya están tomados (registro e importación masiva).
+"""
+from django.db.models import Q
+
+SIN_CORREO = " "
+# Reemplazo de username_norm cuando dos usuarios solo difieren en mayúsculas
+USUARIO_REPETIDO = " id:"
+
+
+def normalizar(valor) -> str:
+    return (valor or "").strip().lower()
+
+
+def normalizadas(username, email):
+    """(username_norm, email_norm) de un usuario."""
+    username_norm = normalizar(username)
+    return username_norm, normalizar(email) or SIN_CORREO + username_norm
+
+
+def conservar_marcadores(modelo, pk, actuales, nuevas):
+    """
+    (username_norm, email_norm) a guardar para el usuario `pk`. Un marcador
+    que puso ``rellenar()`` se mantiene mientras el valor real siga tomado
+    por otro usuario: si no, el siguiente save() (cambio de clave, edición
+    en el panel) chocaría con el índice único. Solo consulta si hay marcador.
+    """
+    username_actual, email_actual = actuales
+    username_norm, email_norm = nuevas
+    marcado_u = (username_actual or "").startswith(USUARIO_REPETIDO)
+    marcado_e = (
+        (email_actual or "").startswith(SIN_CORREO) and not email_norm.startswith(SIN_CORREO)
+    )
+    if pk is None or not (marcado_u or marcado_e):
+        return nuevas
+
+    otros = modelo._default_manager.exclude(pk=pk)
+    if marcado_u and otros.filter(username_norm=username_norm).exists():
+        username_norm = username_actual
+        if email_norm.startswith(SIN_CORREO):
+            email_norm = SIN_CORREO + username_norm
+    if marcado_e and otros.filter(email_norm=email_norm).exists():
+        email_norm = SIN_CORREO + username_norm
+    return username_norm, email_norm
+
+
+def en_uso(modelo, usuarios, correos):
+    """
+    (usuarios, correos) normalizados que ya existen entre los dados, con UNA
+    consulta sobre los campos únicos (índice) en vez de una por valor.
+    """
+    usuarios, correos = set(usuarios), set(correos)
+    if not usuarios and not correos:
+        return set(), set()
+    filas = modelo._default_manager.filter(
+        Q(username_norm__in=usuarios) | Q(email_norm__in=correos)
+    ).values_list("username_norm", "email_norm")
+    tomados_u, tomados_e = set(), set()
+    for username_norm, email_norm in filas:
+        if username_norm in usuarios:
+            tomados_u.add(username_norm)
+        if email_norm in correos:
+            tomados_e.add(email_norm)
+    return tomados_u, tomados_e
+
+
+def rellenar(modelo, lote: int = 1000) -> dict:
+    """
+    Recalcula username_norm/email_norm de todos los usuarios de `modelo` y
+    guarda solo los que cambian. Si dos usuarios comparten usuario o correo
+    (sin distinguir mayúsculas), el de menor id se queda con el valor y el
+    otro recibe un marcador que no sirve para entrar; se informan en
+    "conflictos" como (id, campo, valor) para resolverlos a mano.
+    """
+    usuarios, correos = set(), set()
+    revisados, actualizados, conflictos = 0, 0, []
+    filas = (
+        modelo._default_manager.order_by("pk")
+        .values_list("pk", "username", "email", "username_norm", "email_norm")
+        .iterator(chunk_size=lote)
+    )
+    for pk, username, email, username_actual, email_actual in filas:
+        revisados += 1
+        username_norm, email_norm = normalizadas(username, email)
+        if username_norm in usuarios:
+            conflictos.append((pk, "username", username))
+            username_norm = f"{USUARIO_REPETIDO}{pk}"
+            email_norm = normalizadas(username_norm, email)[1]
+        if email_norm in correos:
+            conflictos.append((pk, "email", email))
+            email_norm = SIN_CORREO + username_norm
+        usuarios.add(username_norm)
+        correos.add(email_norm)
+
+        if (username_norm, email_norm) != (username_actual, email_actual):
+            modelo._default_manager.filter(pk=pk).update(
+                username_norm=username_norm, email_norm=email_norm)
+            actualizados += 1
+    return {"revisados": revisados, "actualizados": actualizados, "conflictos": conflictos}
@@ -3,6 +3,8 @@ from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import get_user_model
 
+from .credenciales import en_uso, normalizar
+
 User = get_user_model()
 
 
@@ -65,23 +67,32 @@ class RegistroClienteForm(UserCreationForm):
         model = User
         fields = ['email', 'username', 'password1', 'password2']
 
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email__iexact=email).exists():
-            raise forms.ValidationError('El correo ya está registrado.')
-        return email
+    def clean(self):
+        cleaned = super().clean()
+        email, username = cleaned.get('email'), cleaned.get('username')
+        # Correo y usuario se revisan juntos: una sola consulta indexada
+        usuario_norm, email_norm = normalizar(username), normalizar(email)
+        tomados_u, tomados_e = en_uso(
+            User,
+            [usuario_norm] if username else [],
+            [email_norm] if email else [],
+        )
+        if email_norm in tomados_e:
+            self.add_error('email', 'El correo ya está registrado.')
+        if usuario_norm in tomados_u:
+            self.add_error('username', 'El nombre de usuario ya está registrado.')
+        return cleaned
 
-    def clean_username(self):
-        username = self.cleaned_data.get('username')
-        if User.objects.filter(username__iexact=username).exists():
-            raise forms.ValidationError(
-                'El nombre de usuario ya está registrado.')
-        return username
+    def validate_unique(self):
+        # clean() ya cubre username (username_norm es único y más estricto);
+        # así no se repite la consulta de unicidad del modelo.
+        pass
 
     def save(self, commit=True):
         user = super().save(commit=False)
         if hasattr(user, "rol") and not user.rol:
             user.rol = "cliente"
+        user.normalizar_credenciales()
         if commit:
             user.save()
         return user
@@ -0,0 +1,212 @@
+# login/limites.py
+"""
+Límite de intentos (token bucket) para el login y el formulario de contacto.
+
+Cada clave (ámbito + IP o usuario normalizado) tiene un balde de
+``capacidad`` fichas que se recarga a ``por_minuto`` fichas por minuto; cada
+intento gasta una y sin fichas se rechaza con 429 ANTES de validar el
+formulario, así un ataque de credenciales no gasta CPU en hashes:
+
+  - login_ip:       intentos de login por IP;
+  - login_usuario:  intentos de login contra un mismo usuario desde una
+                    misma IP; un login correcto lo vuelve a llenar. Va por
+                    (usuario, IP) para que nadie pueda bloquear a otro
+                    fallando su clave: el dueño entra desde su propia IP;
+  - contacto_ip:    envíos de contacto_publico por IP.
+
+Backends (LIMITE_BACKEND):
+  - "memoria": dict del proceso (por worker), acotado a MAX_CLAVES;
+  - "cache":   alias LIMITE_CACHE de CACHES; con FileBasedCache o
+               DatabaseCache el límite se comparte entre workers. La
+               lectura-escritura no es atómica: con carreras puede dejar pasar
+               algún intento de más, nunca bloquear de más.
+
+También cuenta rechazos y el tiempo de CPU gastado en verificar
+contraseñas; se exportan en /administrador/metrics.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .credenciales import normalizar
+
+# ámbito: (capacidad, fichas que se recargan por minuto)
+LIMITES = {
+    "login_ip": (20, 10),
+    "login_usuario": (10, 5),
+    "contacto_ip": (5, 2),
+}
+MAX_CLAVES = 10000
+
+_lock = threading.Lock()
+_contadores = {
+    "rechazados_login": 0,
+    "rechazados_contacto": 0,
+    "hash_verificaciones": 0,
+    "hash_segundos": 0.0,
+}
+
+
+# ----------------------- Baldes -----------------------
+def _recargar(fichas, desde, capacidad, por_segundo, ahora):
+    return min(capacidad, fichas + (ahora - desde) * por_segundo)
+
+
+class _Memoria:
+    """Baldes en un OrderedDict; al pasar MAX_CLAVES se olvida el más viejo."""
+
+    def __init__(self):
+        self._baldes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def tomar(self, clave, capacidad, por_segundo, ahora) -> bool:
+        with self._lock:
+            fichas, desde = self._baldes.pop(clave, (capacidad, ahora))
+            fichas = _recargar(fichas, desde, capacidad, por_segundo, ahora)
+            permitido = fichas >= 1
+            self._baldes[clave] = (fichas - 1 if permitido else fichas, ahora)
+            while len(self._baldes) > MAX_CLAVES:
+                self._baldes.popitem(last=False)
+            return permitido
+
+    def llenar(self, clave) -> None:
+        with self._lock:
+            self._baldes.pop(clave, None)
+
+    def vaciar(self) -> None:
+        with self._lock:
+            self._baldes.clear()
+
+
+class _Cache:
+    def __init__(self, alias):
+        self._cache = caches[alias]
+
+    def tomar(self, clave, capacidad, por_segundo, ahora) -> bool:
+        clave = f"limite:{clave}"
+        fichas, desde = self._cache.get(clave) or (capacidad, ahora)
+        fichas = _recargar(fichas, desde, capacidad, por_segundo, ahora)
+        permitido = fichas >= 1
+        # Expira cuando el balde ya estaría lleno otra vez
+        self._cache.set(clave, (fichas - 1 if permitido else fichas, ahora),
+                        int(capacidad / por_segundo) + 1)
+        return permitido
+
+    def llenar(self, clave) -> None:
+        self._cache.delete(f"limite:{clave}")
+
+
+_memoria = _Memoria()
+
+
+def _backend():
+    if getattr(settings, "LIMITE_BACKEND", "memoria") == "cache":
+        return _Cache(getattr(settings, "LIMITE_CACHE", "default"))
+    return _memoria
+
+
+def _limite(ambito):
+    capacidad, por_minuto = {**LIMITES, **getattr(settings, "LIMITES_INTENTOS", {})}[ambito]
+    return capacidad, por_minuto / 60
+
+
+def permitir(ambito: str, identificador: str) -> bool:
+    """Gasta una ficha del balde (ámbito, identificador); False si no quedan."""
+    capacidad, por_segundo = _limite(ambito)
+    return _backend().tomar(f"{ambito}:{identificador}", capacidad, por_segundo, time.time())
+
+
+def llenar(ambito: str, identificador: str) -> None:
+    _backend().llenar(f"{ambito}:{identificador}")
+
+
+def vaciar_memoria() -> None:
+    """Olvida los baldes del backend en memoria (tests)."""
+    _memoria.vaciar()
+
+
+# ----------------------- Peticiones -----------------------
+def ip_cliente(request) -> str:
+    """
+    IP del cliente. Detrás de un proxy (Render) REMOTE_ADDR es el proxy:
+    LIMITE_IP_CABECERA (p. ej. "HTTP_X_FORWARDED_FOR") indica dónde está la
+    IP real. Cada proxy AGREGA al final la IP de quien le habló, así que las
+    entradas de la izquierda las escribe el cliente y no sirven: se toma la
+    LIMITE_PROXIES-ésima desde la derecha (1 = la que puso el último proxy).
+    """
+    cabecera = getattr(settings, "LIMITE_IP_CABECERA", None)
+    remota = request.META.get("REMOTE_ADDR", "")
+    if not cabecera or not request.META.get(cabecera):
+        return remota
+    saltos = max(1, getattr(settings, "LIMITE_PROXIES", 1))
+    entradas = [ip.strip() for ip in request.META[cabecera].split(",") if ip.strip()]
+    if len(entradas) < saltos:
+        # Menos entradas que proxies confiables: la cabecera no es de ellos
+        return remota
+    return entradas[-saltos]
+
+
+def _clave_usuario(usuario: str, ip: str) -> str:
+    return f"{usuario}|{ip}"
+
+
+def permitir_login(request) -> bool:
+    """Balde por IP y por (usuario normalizado, IP) del POST de login."""
+    usuario = normalizar(request.POST.get("username"))
+    ip = ip_cliente(request)
+    permitido = permitir("login_ip", ip)
+    if permitido and usuario:
+        permitido = permitir("login_usuario", _clave_usuario(usuario, ip))
+    if not permitido:
+        _contar("rechazados_login")
+    return permitido
+
+
+def login_correcto(request, user) -> None:
+    """Tras un login válido el usuario recupera sus intentos desde esa IP."""
+    ip = ip_cliente(request)
+    llenar("login_usuario", _clave_usuario(user.username_norm, ip))
+    if user.email_norm:
+        llenar("login_usuario", _clave_usuario(user.email_norm, ip))
+
+
+def permitir_contacto(request) -> bool:
+    permitido = permitir("contacto_ip", ip_cliente(request))
+    if not permitido:
+        _contar("rechazados_contacto")
+    return permitido
+
+
+# ----------------------- Contadores -----------------------
+def _contar(clave, valor=1) -> None:
+    with _lock:
+        _contadores[clave] += valor
+
+
+@contextmanager
+def medir_hash():
+    """Suma el CPU del hilo (no el tiempo de reloj) gastado en el bloque."""
+    inicio = time.thread_time()
+    try:
+        yield
+    finally:
+        segundos = time.thread_time() - inicio
+        with _lock:
+            _contadores["hash_verificaciones"] += 1
+            _contadores["hash_segundos"] += segundos
+
+
+def estadisticas() -> dict:
+    """Rechazos y CPU de hashing acumulados en este proceso."""
+    with _lock:
+        return dict(_contadores)
+
+
+def reiniciar_estadisticas() -> None:
+    with _lock:
+        _contadores.update(rechazados_login=0, rechazados_contacto=0,
+                           hash_verificaciones=0, hash_segundos=0.0)
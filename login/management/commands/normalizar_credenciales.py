@@ -0,0 +1,26 @@
+# login/management/commands/normalizar_credenciales.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from login.credenciales import rellenar
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula username_norm/email_norm de todos los usuarios (login por "
+        "búsqueda exacta). Necesario tras cargas con bulk_create o cambios "
+        "hechos con update(). Informa usuarios o correos repetidos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000,
+                            help="Filas leídas por consulta.")
+
+    def handle(self, *args, **options):
+        r = rellenar(get_user_model(), lote=options["lote"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Usuarios revisados: {r['revisados']}, actualizados: {r['actualizados']}."))
+        for pk, campo, valor in r["conflictos"]:
+            self.stdout.write(self.style.WARNING(
+                f"  Usuario {pk}: {campo} {valor!r} repetido (sin mayúsculas); "
+                f"no podrá entrar con ese {campo} hasta corregirlo."))
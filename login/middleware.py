@@ -0,0 +1,19 @@
+# login/middleware.py
+from django.utils.functional import SimpleLazyObject
+
+from . import sesion
+
+
+class UsuarioEnCacheMiddleware:
+    """
+    Reemplaza el request.user de AuthenticationMiddleware (va justo
+    después) por el usuario memorizado en caché (login.sesion): una página
+    autenticada no consulta la BD antes de llegar a la vista.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: sesion.usuario(request))
+        return self.get_response(request)
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+from login.credenciales import rellenar
+
+
+def rellenar_credenciales(apps, schema_editor):
+    rellenar(apps.get_model("login", "User"))
+
+
+class Migration(migrations.Migration):
+    # Primero los campos sin unicidad, después se rellenan y recién entonces
+    # el índice único (en Mongo, con todos en null chocaría)
+
+    dependencies = [
+        ('login', '0003_auto_20250901_2338'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_norm',
+            field=models.CharField(editable=False, max_length=150, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_norm',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(rellenar_credenciales, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='username_norm',
+            field=models.CharField(editable=False, max_length=150, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email_norm',
+            field=models.CharField(editable=False, max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from .credenciales import conservar_marcadores, normalizadas
+
 
 class User(AbstractUser):
     ROLES = [
@@ -9,3 +11,22 @@ class User(AbstractUser):
     ]
     # Default evita errores al crear usuarios/superusuarios sin definir rol explícito
     rol = models.CharField(max_length=20, choices=ROLES, default="cliente")
+
+    # Usuario y correo en minúsculas para el login con una sola búsqueda
+    # exacta e indexada (ver login/credenciales.py). Se calculan en save().
+    username_norm = models.CharField(max_length=150, unique=True, null=True, editable=False)
+    email_norm = models.CharField(max_length=255, unique=True, null=True, editable=False)
+
+    def normalizar_credenciales(self):
+        self.username_norm, self.email_norm = conservar_marcadores(
+            type(self), self.pk,
+            (self.username_norm, self.email_norm),
+            normalizadas(self.username, self.email),
+        )
+
+    def save(self, *args, **kwargs):
+        self.normalizar_credenciales()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"username", "email"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "username_norm", "email_norm"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,118 @@
+# login/sesion.py
+"""
+Usuario de la sesión memorizado en caché (login.middleware).
+
+Con sesiones ``cached_db`` o ``signed_cookies`` (PILATES_SESIONES) la sesión
+ya no va a la BD; lo que queda es cargar ``login.User`` en cada petición.
+Aquí se guardan, bajo la clave de la sesión, los campos que usan las vistas
+y plantillas (id, usuario, nombre, correo, rol y banderas; nunca la
+contraseña) y ``request.user`` se arma con ``User.from_db`` sin consultar.
+Un campo no memorizado (last_login, password...) se carga al usarlo, como
+con ``.only()``.
+
+Invalidación por versión, como index.disponibilidad: cada usuario tiene una
+clave de versión que la señal post_save/post_delete de User incrementa
+(admin_usuario_editar, admin_usuario_toggle_activo, cambio de contraseña,
+last_login...); la entrada guarda la versión con la que se creó y deja de
+servir cuando no coincide. También guarda el hash de autenticación de la
+sesión, así que un cambio de contraseña cierra las demás sesiones igual que
+en Django.
+
+La caché es USUARIO_CACHE y tiene que ser compartida entre workers
+(FileBasedCache, DatabaseCache): con locmem cada worker tendría la suya y no
+vería las invalidaciones de los demás. settings.py solo la fija en ese caso;
+con USUARIO_CACHE = None no se memoriza nada y request.user es el de Django.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import router
+
+CAMPOS = (
+    "id", "username", "first_name", "last_name", "email", "rol",
+    "is_active", "is_staff", "is_superuser",
+)
+TTL = 60
+
+
+def _alias():
+    return getattr(settings, "USUARIO_CACHE", None)
+
+
+def _cache():
+    return caches[_alias()]
+
+
+def _clave_version(user_id) -> str:
+    return f"usr:v:{user_id}"
+
+
+def _clave_sesion(session_key) -> str:
+    # Con signed_cookies la "clave" es la cookie completa: se resume
+    return "usr:s:" + hashlib.sha256(session_key.encode()).hexdigest()[:40]
+
+
+def _nueva_version() -> int:
+    return time.time_ns()
+
+
+def invalidar(user_id) -> None:
+    """Las sesiones memorizadas de `user_id` dejan de servir."""
+    if not user_id or not _alias():
+        return
+    cache = _cache()
+    try:
+        cache.incr(_clave_version(user_id))
+    except ValueError:
+        cache.set(_clave_version(user_id), _nueva_version(), None)
+
+
+def _instancia(valores: dict):
+    User = auth.get_user_model()
+    nombres = [f.attname for f in User._meta.concrete_fields if f.attname in valores]
+    return User.from_db(router.db_for_read(User), nombres, [valores[n] for n in nombres])
+
+
+def usuario(request):
+    """request.user desde la caché o, si no está, con auth.get_user()."""
+    if not _alias():
+        return auth.get_user(request)
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    if user_id is None or not session.session_key:
+        return AnonymousUser()
+
+    cache = _cache()
+    clave = _clave_sesion(session.session_key)
+    clave_version = _clave_version(user_id)
+    encontradas = cache.get_many([clave, clave_version])
+    entrada = encontradas.get(clave)
+    version = encontradas.get(clave_version)
+    if (
+        entrada is not None
+        and version is not None
+        and entrada["version"] == version
+        and entrada["hash"] == session.get(HASH_SESSION_KEY)
+        and str(entrada["valores"]["id"]) == str(user_id)
+    ):
+        return _instancia(entrada["valores"])
+
+    # La versión se fija ANTES de leer el usuario: si cambia mientras tanto,
+    # la entrada nace obsoleta
+    if version is None:
+        version = _nueva_version()
+        if not cache.add(clave_version, version, None):
+            version = cache.get(clave_version)
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(clave, {
+            "version": version,
+            "hash": session.get(HASH_SESSION_KEY),
+            "valores": {c: getattr(user, c) for c in CAMPOS},
+        }, getattr(settings, "USUARIO_CACHE_TTL", TTL))
+    return user
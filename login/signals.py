@@ -0,0 +1,12 @@
+# login/signals.py
+"""Invalidación del usuario memorizado por sesión (login.sesion)."""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import sesion
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def _usuario_cambio(sender, instance, **kwargs):
+    sesion.invalidar(instance.pk)
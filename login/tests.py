@@ -1,3 +1,266 @@
-from django.test import TestCase
+# login/tests.py
+"""
+Consultas por página de ingreso y registro, con 10 y con 1000 filas
+(ver administrador/tests/presupuesto.py), y login con credenciales
+normalizadas.
+"""
+import os
+import subprocess
+import sys
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from administrador.tests.presupuesto import PresupuestoConsultasMixin
+
+from . import limites
+from .credenciales import rellenar
+from .forms import RegistroClienteForm
+
+User = get_user_model()
+
+
+class PresupuestoLoginTests(PresupuestoConsultasMixin, TestCase):
+    paginas = [
+        ("login", "anonimo", reverse("login:login"), 0),
+        ("registro_cliente", "anonimo", reverse("login:registro_cliente"), 0),
+    ]
+
+
+class CredencialesNormalizadasTests(TestCase):
+    def test_save_normaliza_y_sin_correo_no_choca(self):
+        ana = User.objects.create_user("Ana.Soto", email=" Ana@Example.COM ", password="x")
+        self.assertEqual((ana.username_norm, ana.email_norm), ("ana.soto", "ana@example.com"))
+        # Varios usuarios sin correo no chocan en el índice único
+        a = User.objects.create_user("sin1", password="x")
+        b = User.objects.create_user("sin2", password="x")
+        self.assertNotEqual(a.email_norm, b.email_norm)
+
+        ana.email = "otra@example.com"
+        ana.save(update_fields=["email"])
+        ana.refresh_from_db()
+        self.assertEqual(ana.email_norm, "otra@example.com")
+
+    def test_login_una_consulta_por_usuario_o_correo(self):
+        User.objects.create_user("Ana", email="ana@example.com", password="clave-segura")
+        for identificador in ("ANA", "Ana@Example.com"):
+            with self.subTest(identificador=identificador):
+                with self.assertNumQueries(1):
+                    user = authenticate(username=identificador, password="clave-segura")
+                self.assertEqual(user.username, "Ana")
+        with self.assertNumQueries(1):
+            self.assertIsNone(authenticate(username="nadie", password="x"))
+
+    def test_un_solo_hash_por_intento_fallido(self):
+        User.objects.create_user("ana", password="clave-segura")
+        with mock.patch("django.contrib.auth.base_user.check_password",
+                        return_value=False) as verificar:
+            self.assertIsNone(authenticate(username="ana", password="mala"))
+        self.assertEqual(verificar.call_count, 1)
+
+    def test_registro_rechaza_repetidos_sin_mayusculas(self):
+        User.objects.create_user("ana", email="ana@example.com", password="x")
+        form = RegistroClienteForm(data={
+            "email": "ANA@example.com", "username": "ANA",
+            "password1": "Clave-Segura-123", "password2": "Clave-Segura-123",
+        })
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {"email", "username"})
+
+    def test_registro_revisa_usuario_y_correo_en_una_consulta(self):
+        form = RegistroClienteForm(data={
+            "email": "nueva@example.com", "username": "nueva",
+            "password1": "Clave-Segura-123", "password2": "Clave-Segura-123",
+        })
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().email_norm, "nueva@example.com")
+
+    def test_rellenar_resuelve_conflictos(self):
+        User.objects.create_user("ana", email="a@example.com", password="x")
+        segundo = User.objects.create_user("otra", email="b@example.com", password="x")
+        # Simula datos previos a los campos normalizados (update() no pasa por save)
+        User.objects.update(username_norm=None, email_norm=None)
+        User.objects.filter(pk=segundo.pk).update(username="ANA", email="A@example.com")
+
+        salida = StringIO()
+        call_command("normalizar_credenciales", stdout=salida)
+        self.assertIn("revisados: 2, actualizados: 2", salida.getvalue())
+        self.assertEqual(
+            set(rellenar(User)["conflictos"]),
+            {(segundo.pk, "username", "ANA"), (segundo.pk, "email", "A@example.com")},
+        )
+        self.assertEqual(authenticate(username="ANA", password="x").pk,
+                         User.objects.get(username="ana").pk)
+
+    def test_guardar_un_usuario_en_conflicto_conserva_el_marcador(self):
+        User.objects.create_user("ana", email="a@example.com", password="x")
+        segundo = User.objects.create_user("otra", email="b@example.com", password="x")
+        User.objects.filter(pk=segundo.pk).update(username="ANA", email="A@example.com")
+        rellenar(User)
+
+        segundo = User.objects.get(pk=segundo.pk)
+        marcadores = (segundo.username_norm, segundo.email_norm)
+        segundo.set_password("nueva")
+        segundo.save()   # antes: IntegrityError en el índice único
+        segundo.refresh_from_db()
+        self.assertEqual((segundo.username_norm, segundo.email_norm), marcadores)
+
+        # Resuelto a mano: vuelve a tener valores reales
+        segundo.username, segundo.email = "Ana2", "ana2@example.com"
+        segundo.save()
+        segundo.refresh_from_db()
+        self.assertEqual((segundo.username_norm, segundo.email_norm),
+                         ("ana2", "ana2@example.com"))
+
+
+class BaldeTests(SimpleTestCase):
+    def test_capacidad_y_recarga(self):
+        balde = limites._Memoria()
+        # 3 fichas, 1 por segundo
+        self.assertEqual([balde.tomar("k", 3, 1, 0) for _ in range(4)], [True, True, True, False])
+        self.assertFalse(balde.tomar("k", 3, 1, 0.5))
+        self.assertTrue(balde.tomar("k", 3, 1, 1.6))
+        # Nunca acumula más que la capacidad
+        self.assertEqual(sum(balde.tomar("k", 3, 1, 100) for _ in range(5)), 3)
+
+    def test_memoria_acotada(self):
+        balde = limites._Memoria()
+        with mock.patch.object(limites, "MAX_CLAVES", 2):
+            for clave in "abc":
+                balde.tomar(clave, 1, 1, 0)
+        self.assertEqual(list(balde._baldes), ["b", "c"])
+
+
+@override_settings(LIMITES_INTENTOS={"login_ip": (3, 1), "login_usuario": (2, 1)})
+class LimiteLoginTests(TestCase):
+    def setUp(self):
+        limites.vaciar_memoria()
+        limites.reiniciar_estadisticas()
+        self.addCleanup(limites.vaciar_memoria)
+        User.objects.create_user("ana", email="ana@example.com", password="clave-segura")
+
+    def _entrar(self, username, password, ip="10.0.0.1"):
+        return self.client.post(reverse("login:login"),
+                                {"username": username, "password": password}, REMOTE_ADDR=ip)
+
+    def test_rechaza_sin_verificar_la_clave(self):
+        self.assertEqual(self._entrar("ANA", "mala").status_code, 200)
+        self.assertEqual(self._entrar(" ana", "mala").status_code, 200)
+        # Tercer intento contra "ana" desde la misma IP (el balde tenía 2)
+        self.assertEqual(self._entrar("ana", "mala").status_code, 429)
+        stats = limites.estadisticas()
+        self.assertEqual(stats["rechazados_login"], 1)
+        self.assertEqual(stats["hash_verificaciones"], 2)
+        self.assertGreater(stats["hash_segundos"], 0)
+
+    def test_fallar_la_clave_de_otro_no_lo_bloquea(self):
+        for ip in ("10.6.6.1", "10.6.6.2"):
+            for _ in range(2):
+                self._entrar("ana", "mala", ip=ip)
+            self.assertEqual(self._entrar("ana", "mala", ip=ip).status_code, 429)
+        # La dueña entra desde su IP aunque su usuario esté bajo ataque
+        self.assertEqual(self._entrar("ana", "clave-segura", ip="10.0.0.9").status_code, 302)
+
+    def test_atacante_por_ip_no_bloquea_a_otros(self):
+        for i in range(3):
+            self._entrar(f"nadie{i}", "x", ip="10.6.6.6")
+        self.assertEqual(self._entrar("otro", "x", ip="10.6.6.6").status_code, 429)
+        self.assertEqual(self._entrar("ana", "clave-segura", ip="10.0.0.9").status_code, 302)
+
+    @override_settings(LIMITE_BACKEND="cache")
+    def test_backend_cache_y_login_correcto_llena_el_balde(self):
+        caches["default"].clear()
+        self.assertEqual(self._entrar("ana", "mala", ip="10.0.0.3").status_code, 200)
+        self.assertEqual(self._entrar("ana", "clave-segura", ip="10.0.0.4").status_code, 302)
+        self.assertEqual(self._entrar("ana", "clave-segura", ip="10.0.0.5").status_code, 302)
+        self.assertIsNotNone(caches["default"].get("limite:login_ip:10.0.0.3"))
+
+
+class PerfilSesionesTests(SimpleTestCase):
+    def _settings(self, **entorno):
+        # settings.py se evalúa al importarse: se prueba en un proceso aparte
+        env = {k: v for k, v in os.environ.items()
+               if k not in ("PILATES_SESIONES", "PILATES_CACHE_DIR", "PILATES_CACHE_SESIONES")}
+        env.update(entorno)
+        return subprocess.run(
+            [sys.executable, "-c",
+             "from Pilatesreserva import settings as s; "
+             "print(s.SESSION_ENGINE.rsplit('.', 1)[1], s.USUARIO_CACHE)"],
+            env=env, capture_output=True, text=True)
+
+    def test_por_defecto_bd_y_sin_usuario_memorizado(self):
+        r = self._settings()
+        self.assertEqual(r.stdout.split(), ["db", "None"])
+
+    def test_cached_db_con_locmem_se_rechaza(self):
+        r = self._settings(PILATES_SESIONES="cached_db")
+        self.assertNotEqual(r.returncode, 0)
+        self.assertIn("caché compartida", r.stderr)
+
+    def test_cached_db_con_cache_en_archivos(self):
+        r = self._settings(PILATES_SESIONES="cached_db", PILATES_CACHE_DIR="/tmp/pilates-cache")
+        self.assertEqual(r.stdout.split(), ["cached_db", "compartida"])
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+                   USUARIO_CACHE="default")
+class UsuarioEnCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.cliente = User.objects.create_user("cliente", password="x")
+        self.admin = User.objects.create_user("admin", password="x", rol="administrador")
+        self.client.force_login(self.cliente)
+        self.url = reverse("usuarios:home_cliente")
+
+    def test_pagina_autenticada_sin_consultas(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.wsgi_request.user.pk, self.cliente.pk)
+        self.assertEqual(r.wsgi_request.user.rol, "cliente")
+        # Lo que no se memoriza se carga al usarlo
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(r.wsgi_request.user.date_joined)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_sesion_en_cookie_firmada(self):
+        self.client.force_login(self.cliente)
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def _como_admin(self, url, datos):
+        admin = Client()
+        admin.force_login(self.admin)
+        admin.post(url, datos)
+
+    def test_desactivar_invalida_la_sesion_memorizada(self):
+        self.client.get(self.url)
+        self._como_admin(
+            reverse("administrador:usuario_toggle_activo", args=[self.cliente.pk]), {})
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 302)
+        self.assertIn(reverse("login:login"), r["Location"])
+
+    def test_editar_rol_se_ve_en_la_siguiente_peticion(self):
+        self.client.get(self.url)
+        self._como_admin(
+            reverse("administrador:usuario_editar", args=[self.cliente.pk]),
+            {"first_name": "Ana", "last_name": "", "email": "", "is_active": "on",
+             "rol": "administrador"})
+        r = self.client.get(self.url)
+        self.assertEqual((r.wsgi_request.user.rol, r.wsgi_request.user.first_name),
+                         ("administrador", "Ana"))
+
+    def test_cambio_de_clave_cierra_otras_sesiones(self):
+        self.client.get(self.url)
+        self.cliente.set_password("nueva")
+        self.cliente.save()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
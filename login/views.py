@@ -4,6 +4,7 @@ from django.contrib.auth import login, logout as auth_logout
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
 
+from . import limites
 from .forms import LoginForm, RegistroClienteForm
 
 
@@ -14,11 +15,18 @@ def login_view(request):
       - cliente/otros  -> usuarios:home_cliente
     """
     if request.method == "POST":
+        # Antes de validar: un intento rechazado no gasta CPU en el hash
+        if not limites.permitir_login(request):
+            messages.error(
+                request, "Demasiados intentos. Espera un momento y vuelve a intentarlo.")
+            return render(request, "login/login.html", {"form": LoginForm()}, status=429)
+
         # ⛔️ No pases 'request' como primer parámetro a tu LoginForm personalizado
         form = LoginForm(data=request.POST)
         if form.is_valid():
             user = form.get_user()
             login(request, user)
+            limites.login_correcto(request, user)
 
             # Detección de rol robusta
             rol = (getattr(user, "rol", "") or "").lower()
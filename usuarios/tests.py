@@ -1,3 +1,24 @@
+# usuarios/tests.py
+"""
+Consultas por página del área de clientes, con 10 y con 1000 filas
+(ver administrador/tests/presupuesto.py).
+"""
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from administrador.tests.presupuesto import PresupuestoConsultasMixin
+
+
+class PresupuestoUsuariosTests(PresupuestoConsultasMixin, TestCase):
+    # Base de cada página: sesión + usuario
+    paginas = [
+        ("home_cliente", "cliente", reverse("usuarios:home_cliente"), 2),
+        # filas del usuario + resumen (caché vacía)
+        ("mis_reservas", "cliente", reverse("usuarios:mis_reservas"), 4),
+        ("reserva_detalle", "cliente",
+         lambda o: reverse("usuarios:reserva_detalle", args=[o["reserva"].pk]), 3),
+        ("nueva_reserva", "cliente", reverse("usuarios:nueva_reserva"), 2),
+        ("reservar_manual", "cliente", reverse("usuarios:reservar_manual"), 2),
+        # página de clases (trae cupos_ocupados: la ocupación no consulta)
+        ("clases_disponibles", "cliente", reverse("usuarios:clases_disponibles"), 3),
+    ]
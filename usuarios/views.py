@@ -3,21 +3,14 @@ from datetime import datetime, date, time, timedelta
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Count
-from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.utils.timezone import now
 
 from administrador.models import ClasePilates
+from index import cupos, nativo, resumen
+from index.catalogo import contexto_catalogo
 from index.models import Reserva  # tu modelo de reservas público
 
-# Alias opcional para agregaciones (si en algún entorno no existiera index.Reserva)
-try:
-    from index.models import Reserva as ReservaAgg
-except Exception:
-    from administrador.models import ReservaClase as ReservaAgg
-
 
 # ----------------------- Helpers internos -----------------------
 ALLOWED_MORNING = ["07:00", "08:00", "09:00", "10:00", "11:00", "12:30"]
@@ -40,31 +33,6 @@ def _is_mon_to_sat(d: date) -> bool:
     return d.weekday() <= 5
 
 
-def _first_existing_field(model, candidates):
-    """Devuelve el primer nombre de campo que exista en el modelo."""
-    names = {f.name for f in model._meta.get_fields()}
-    for c in candidates:
-        if c in names:
-            return c
-    return None
-
-
-def _exclude_canceladas(qs):
-    """
-    Excluye reservas canceladas si el modelo tiene un campo de estado
-    común como 'estado' / 'status' / 'state'.
-    """
-    estado_field = _first_existing_field(
-        qs.model, ["estado", "status", "state"])
-    if estado_field:
-        try:
-            return qs.exclude(**{f"{estado_field}__iexact": "cancelada"})
-        except Exception:
-            # Si hay valores distintos (p. ej. 'cancelled'), ajusta aquí si lo necesitas.
-            pass
-    return qs
-
-
 # ----------------------- Vistas originales (se mantienen) -----------------------
 @login_required
 def home_cliente(request):
@@ -73,21 +41,22 @@ def home_cliente(request):
 
 @login_required
 def mis_reservas(request):
-    qs = Reserva.objects.filter(user=request.user).order_by("fecha", "inicio")
     hoy = timezone.localdate()
 
-    proximas = qs.filter(
-        Q(fecha__gt=hoy) |
-        Q(fecha=hoy, estado__in=["Confirmada", "Pendiente"])
-    )
-    historial = qs.exclude(id__in=proximas.values("id"))
+    # Una sola consulta; se separa en próximas / historial en Python
+    if nativo.activo():
+        filas = nativo.reservas_de_usuario(request.user.pk)
+    else:
+        filas = Reserva.objects.filter(user=request.user).order_by("fecha", "inicio")
+    proximas, historial = [], []
+    for r in filas:
+        (proximas if resumen.es_proxima(r, hoy) else historial).append(r)
 
     contexto = {
         "reservas_proximas": proximas,
         "reservas_historial": historial,
-        "total_proximas": proximas.count(),
-        "total_historial": historial.count(),
-        "total_canceladas": qs.filter(estado="Cancelada").count(),
+        # Totales: aggregate condicional cacheado por usuario (index.resumen)
+        **resumen.obtener(request.user.pk),
     }
     return render(request, "usuarios/mis_reservas.html", contexto)
 
@@ -174,12 +143,11 @@ def reserva_detalle(request, pk: int):
 @login_required
 def reserva_cancelar(request, pk: int):
     r = get_object_or_404(Reserva, pk=pk, user=request.user)
-    if r.estado == "Cancelada":
-        messages.info(request, "Esta reserva ya estaba cancelada.")
-    else:
-        r.estado = "Cancelada"
-        r.save(update_fields=["estado"])
+    # Cambio de estado condicionado + liberación atómica del cupo
+    if cupos.cancelar(r):
         messages.success(request, "Tu reserva fue cancelada.")
+    else:
+        messages.info(request, "Esta reserva ya estaba cancelada.")
     return redirect("usuarios:mis_reservas")
 
 
@@ -190,48 +158,8 @@ def clases_disponibles(request):
     Lista de clases (formato tarjetas) con filtros y paginación.
     Renderiza: templates/index/clases_grid.html
     """
-    q = (request.GET.get("q") or "").strip()
-    desde = request.GET.get("desde") or ""
-    hasta = request.GET.get("hasta") or ""
-
-    # Base: clases futuras (>= hoy) por defecto
-    qs = ClasePilates.objects.all().order_by("fecha", "horario")
-    if desde:
-        qs = qs.filter(fecha__gte=desde)
-    else:
-        qs = qs.filter(fecha__gte=now().date())
-
-    if hasta:
-        qs = qs.filter(fecha__lte=hasta)
-
-    if q:
-        qs = qs.filter(
-            Q(nombre_clase__icontains=q)
-            | Q(descripcion__icontains=q)
-            | Q(nombre_instructor__icontains=q)
-        )
-
-    # Conteo de reservas por clase (excluyendo canceladas si el modelo tiene campo de estado)
-    reservas_qs = ReservaAgg.objects.all()
-    reservas_qs = _exclude_canceladas(reservas_qs)
-
-    reservas = reservas_qs.values("clase_id").annotate(cnt=Count("id"))
-    reservas_por_clase = {r["clase_id"]: r["cnt"] for r in reservas}
-
-    # Paginación (12 por página)
-    paginator = Paginator(qs, 12)
-    page = request.GET.get("page") or 1
-    page_obj = paginator.get_page(page)  # tolerante a out-of-range
-
-    context = {
-        "page_obj": page_obj,
-        "paginator": paginator,
-        "q": q,
-        "desde": desde,
-        "hasta": hasta,
-        "reservas_por_clase": reservas_por_clase,
-        "reserve_url_name": "usuarios:reservar_clase",  # nombre namespaced
-    }
+    # Filtros + ocupación calculada solo para las 12 clases de la página
+    context = contexto_catalogo(request, "usuarios:reservar_clase")
     return render(request, "index/clases_grid.html", context)
 
 
@@ -239,6 +167,7 @@ def clases_disponibles(request):
 def reservar_clase(request, clase_id: int):
     """
     Crea una Reserva enlazada a una ClasePilates del admin, si hay cupo.
+    El cupo se toma con index.cupos (sin contar reservas ni sobreventa).
     También rellena tipo/fecha/inicio para mantener compatibilidad.
     """
     c = get_object_or_404(ClasePilates, pk=clase_id)
@@ -249,38 +178,26 @@ def reservar_clase(request, clase_id: int):
             request, "No es posible reservar una clase en el pasado.")
         return redirect("usuarios:clases_disponibles")
 
-    # Verificación de cupo (excluyendo canceladas si corresponde)
-    try:
-        # si definiste un helper en tu modelo de reservas
-        hay_cupo = Reserva.hay_cupo(c)
-    except Exception:
-        # Fallback: contar reservas no canceladas
-        user_res_qs = Reserva.objects.filter(clase=c)
-        user_res_qs = _exclude_canceladas(user_res_qs)
-        reservados = user_res_qs.count()
-        hay_cupo = reservados < (c.capacidad_maxima or 0)
-
-    if not hay_cupo:
+    # Toma del cupo con un único update atómico condicionado a la capacidad.
+    # No se mira antes la caché de disponibilidad: puede estar atrasada y
+    # ocultaría el aviso de reserva repetida.
+    resultado, _ = cupos.reservar(
+        request.user,
+        c,
+        tipo=_infer_tipo_desde_nombre(c.nombre_clase),
+        fecha=c.fecha,
+        inicio=c.horario,
+        fin=None,  # si quieres +1h, calcula y guarda
+    )
+
+    if resultado == cupos.SIN_CUPO:
         messages.warning(request, "La clase ya no tiene cupos disponibles.")
         return redirect("usuarios:clases_disponibles")
 
-    # Evitar duplicado por unique constraint (usuario + clase)
-    ya_tiene_qs = Reserva.objects.filter(user=request.user, clase=c)
-    ya_tiene_qs = _exclude_canceladas(ya_tiene_qs)
-    if ya_tiene_qs.exists():
+    if resultado == cupos.YA_RESERVADA:
         messages.info(request, "Ya reservaste esta clase.")
         return redirect("usuarios:mis_reservas")
 
-    # Crear la reserva
-    Reserva.objects.create(
-        user=request.user,
-        clase=c,
-        tipo=_infer_tipo_desde_nombre(c.nombre_clase),
-        fecha=c.fecha,
-        inicio=c.horario,
-        fin=None,  # si quieres +1h, calcula y guarda
-        estado="Confirmada",
-    )
     messages.success(request, "¡Reserva creada con éxito!")
     return redirect("usuarios:mis_reservas")
 